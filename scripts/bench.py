@@ -0,0 +1,1244 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 성능/안정성 점검 스크립트
+임시 HOME에서 Hook과 스크립트를 실행해 측정 (실제 기록에는 영향 없음)
+
+사용법:
+    python3 bench.py stress --count 300    # 동시 Hook 실행 시 기록 유실 확인
+    python3 bench.py hook --count 200      # Hook 지연 시간 (직접 실행 vs 상주 로거)
+    python3 bench.py prompt                # 프롬프트 크기별 format_prompt 비용
+    python3 bench.py range --days 365      # 합성 기록 1년치 기간 보고서 생성 시간
+    python3 bench.py archive --days 730    # 월별 압축 보관 전후 기간 보고서/파일 수 비교
+    python3 bench.py shard --days 1825     # 평면 구조 vs 연/월 구조 날짜 목록/Hook 기록 비용
+    python3 bench.py rollup --days 730     # 원본 로그 재계산 vs 집계 파일로 주간/월간 보고서
+    python3 bench.py activity --days 365   # 활동 시간 계산: 전체 재계산 vs 날짜별 캐시 + carry
+    python3 bench.py watch --bursts 5      # --watch: 몰려 들어온 기록당 저장 횟수/지연 vs 매번 --save
+    python3 bench.py end-of-day            # 형식별 4번 실행 vs --format all 한 번 (단계별 소요 시간)
+    python3 bench.py classify              # 작업 분류기 vs 기존 키워드 순차 검사
+    python3 bench.py sync-state --years 10 # 동기화 기록: sync_history 목록 vs 연도별 비트맵
+    python3 bench.py notion                # Notion 제한을 흉내 낸 로컬 서버로 나눠 올리기 확인
+    python3 bench.py notion --fail-rate 0.3 --latency-ms 50   # 429/지연 주입 시 재시도
+    python3 bench.py notion-throughput     # 요청마다 새 연결 vs keep-alive
+    python3 bench.py notion-delta          # 같은 날 재동기화 시 새 작업만 전송
+    python3 bench.py notion-backfill       # 미동기화 날짜 일괄 동기화, 중단 후 이어서
+    python3 bench.py notion-outbox         # 동기화 실패 → 대기열 → Hook이 띄운 drain으로 전송
+"""
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_script(filename):
+    """scripts/ 아래 스크립트를 모듈로 로드 (파일명에 '-'가 있어 import 대신 경로로 로드)"""
+    spec = importlib.util.spec_from_file_location(filename.replace('-', '_')[:-3], os.path.join(SCRIPTS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_home():
+    """측정용 임시 HOME 생성"""
+    home = tempfile.mkdtemp(prefix='daily-work-bench-')
+    os.makedirs(os.path.join(home, '.claude', 'daily-work-tracker'), exist_ok=True)
+    return home
+
+
+def hook_env(home):
+    """임시 HOME을 사용하는 환경 변수"""
+    env = dict(os.environ)
+    env['HOME'] = home
+    return env
+
+
+def count_journal_records(home, date_str):
+    """저널 기록 수 (깨진 줄 제외)"""
+    path = os.path.join(home, '.claude', 'daily-work', f'{date_str}.jsonl')
+    if not os.path.exists(path):
+        return 0, 0
+
+    valid = broken = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                json.loads(line)
+                valid += 1
+            except ValueError:
+                broken += 1
+    return valid, broken
+
+
+def percentile(values, pct):
+    """정렬 후 백분위 값 (nearest-rank)"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def latency_stats(samples_ms):
+    """지연 시간 통계 (ms)"""
+    return {
+        "count": len(samples_ms),
+        "p50_ms": round(percentile(samples_ms, 50), 2),
+        "p99_ms": round(percentile(samples_ms, 99), 2),
+        "max_ms": round(max(samples_ms), 2) if samples_ms else 0
+    }
+
+
+def time_hook(command, env, payload, count):
+    """Hook 명령을 count번 순차 실행하며 지연 시간 측정"""
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        subprocess.run(command, input=payload, env=env, check=False)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def wait_for_socket(path, timeout=5.0):
+    """데몬 소켓이 생길 때까지 대기"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(path):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def run_hook(args):
+    """Hook 지연 시간 비교: log-daily.py 직접 실행 / 클라이언트(데몬 없음) / 클라이언트 + 상주 로거"""
+    home = make_home()
+    env = hook_env(home)
+    project = os.path.join(home, 'project')
+    os.makedirs(project, exist_ok=True)
+    payload = json.dumps({'prompt': '로그인 화면 만들어줘', 'cwd': project}).encode('utf-8')
+
+    hook = [sys.executable, os.path.join(SCRIPTS_DIR, 'log-daily.py')]
+    client = [sys.executable, '-S', os.path.join(SCRIPTS_DIR, 'log-client.py')]
+
+    results = {
+        "direct": latency_stats(time_hook(hook, env, payload, args.count)),
+        "client_fallback": latency_stats(time_hook(client, env, payload, args.count))
+    }
+
+    socket_path = os.path.join(home, '.claude', 'daily-work-tracker', 'logger.sock')
+    daemon = subprocess.Popen([sys.executable, os.path.join(SCRIPTS_DIR, 'log-daemon.py')], env=env)
+    try:
+        if not wait_for_socket(socket_path):
+            print(json.dumps({"error": "상주 로거가 시작되지 않았습니다."}, ensure_ascii=False))
+            return 1
+        results["client_daemon"] = latency_stats(time_hook(client, env, payload, args.count))
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    valid, _ = count_journal_records(home, today)
+    results["scenario"] = "hook"
+    results["records"] = valid
+    results["expected_records"] = args.count * 3
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0 if valid == args.count * 3 else 1
+
+
+def synthetic_prompt(size):
+    """붙여넣은 로그/코드가 섞인 size 바이트 내외의 프롬프트"""
+    chunk = (
+        "이 에러 좀 봐줘\n```python\n" + "value = compute(x)\n" * 20 + "```\n"
+        "Traceback (most recent call last):\n  File \"app.py\", line 3\n    main()\nValueError: bad\n"
+        + "2026-01-05 10:00:00 INFO request handled in 12ms\n" * 20
+    )
+    return (chunk * (size // len(chunk) + 1))[:size]
+
+
+def run_prompt(args):
+    """프롬프트 크기가 커져도 format_prompt 비용이 일정한지 확인"""
+    hook = load_script('log-daily.py')
+    results = []
+
+    for size in (1_000, 10_000, 100_000, 1_000_000, 10_000_000):
+        prompt = synthetic_prompt(size)
+        samples = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            hook.format_prompt(prompt)
+            samples.append((time.perf_counter() - started) * 1000)
+        results.append({"bytes": size, **latency_stats(samples)})
+
+    print(json.dumps({"scenario": "prompt", "results": results}, indent=2, ensure_ascii=False))
+    return 0
+
+
+SAMPLE_PROMPTS = [
+    '로그인 화면 추가해줘',
+    '결제 버그 수정해줘',
+    'README 문서 정리',
+    '테스트 코드 확인해줘',
+    'CI 설정 변경',
+    '사용자 목록 API 연결 → 목록 API 연동 완료',
+    '이 에러 왜 나는 거야?'
+]
+
+
+def write_synthetic_history(home, days, prompts_per_day, projects=6):
+    """days일치 합성 저널 생성 (오늘까지)"""
+    sys.path.insert(0, SCRIPTS_DIR)
+    import daily_store
+
+    log_dir = os.path.join(home, '.claude', 'daily-work')
+    today = datetime.now()
+    for offset in range(days):
+        date_str = (today - timedelta(days=offset)).strftime('%Y-%m-%d')
+        for i in range(prompts_per_day):
+            daily_store.append_record(log_dir, date_str, {
+                'time': f'{9 + i * 10 // prompts_per_day:02d}:{i % 60:02d}',
+                'project': f'project-{(offset + i) % projects}',
+                'path': f'/work/project-{(offset + i) % projects}',
+                'prompt': SAMPLE_PROMPTS[(offset * 7 + i) % len(SAMPLE_PROMPTS)]
+            })
+    return log_dir
+
+
+def run_range(args):
+    """합성 기록으로 기간 보고서(generate-summary.py --from/--to) 생성 시간 측정"""
+    home = make_home()
+    env = hook_env(home)
+    write_synthetic_history(home, args.days, args.prompts)
+
+    start = (datetime.now() - timedelta(days=args.days - 1)).strftime('%Y-%m-%d')
+    command = [sys.executable, os.path.join(SCRIPTS_DIR, 'generate-summary.py'),
+               '--from', start, '--format', 'json']
+    if args.workers:
+        command += ['--workers', str(args.workers)]
+
+    results = {}
+    for label in ('cold_cache', 'warm_cache'):
+        started = time.perf_counter()
+        proc = subprocess.run(command, env=env, capture_output=True, check=False)
+        elapsed = (time.perf_counter() - started) * 1000
+        report = json.loads(proc.stdout or b'{}')
+        results[label] = {"ms": round(elapsed, 1), "days": report.get('days_count'), "tasks": report.get('total_tasks')}
+
+    print(json.dumps({
+        "scenario": "range",
+        "days": args.days,
+        "prompts_per_day": args.prompts,
+        "cpus": os.cpu_count(),
+        **results
+    }, indent=2, ensure_ascii=False))
+    return 0
+
+
+def run_archive(args):
+    """합성 기록을 월별로 압축 보관한 뒤 기간 보고서/하루 요약이 같은지, 파일 수/크기와 시간 비교"""
+    home = make_home()
+    env = hook_env(home)
+    # 프로젝트 요약의 카테고리 순서(set)가 실행마다 달라지지 않도록 고정
+    env['PYTHONHASHSEED'] = '0'
+    log_dir = write_synthetic_history(home, args.days, args.prompts)
+
+    start = (datetime.now() - timedelta(days=args.days - 1)).strftime('%Y-%m-%d')
+    old_day = (datetime.now() - timedelta(days=args.days - 1)).strftime('%Y-%m-%d')
+    summary = os.path.join(SCRIPTS_DIR, 'generate-summary.py')
+    range_command = [sys.executable, summary, '--from', start, '--format', 'json']
+    day_command = [sys.executable, summary, '--date', old_day, '--format', 'json']
+
+    def usage():
+        files = [os.path.join(root, name) for root, _, names in os.walk(log_dir) for name in names
+                 if not root.endswith('.cache')]
+        return {"files": len(files), "bytes": sum(os.path.getsize(f) for f in files)}
+
+    def run(command):
+        started = time.perf_counter()
+        proc = subprocess.run(command, env=env, capture_output=True, check=False)
+        report = json.loads(proc.stdout or b'{}')
+        report.pop('generated_at', None)
+        return round((time.perf_counter() - started) * 1000, 1), report
+
+    results = {}
+    reports = {}
+    for label in ('flat', 'archived'):
+        if label == 'archived':
+            started = time.perf_counter()
+            subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, 'compact-logs.py'), '--all'],
+                           env=env, capture_output=True, check=True)
+            compact_ms = round((time.perf_counter() - started) * 1000, 1)
+        # 파싱/요약 캐시 없이 원본을 읽는 시간
+        for root, _, names in os.walk(os.path.join(log_dir, '.cache')):
+            for name in names:
+                os.remove(os.path.join(root, name))
+        range_ms, reports[label] = run(range_command)
+        day_ms, reports[label + '_day'] = run(day_command)
+        results[label] = {**usage(), "range_cold_ms": range_ms, "old_day_ms": day_ms}
+
+    results['archived']['compact_ms'] = compact_ms
+    same = reports['flat'] == reports['archived'] and reports['flat_day'] == reports['archived_day']
+    print(json.dumps({
+        "scenario": "archive",
+        "days": args.days,
+        "prompts_per_day": args.prompts,
+        **results,
+        "same_output": same
+    }, indent=2, ensure_ascii=False))
+    return 0 if same else 1
+
+
+def run_shard(args):
+    """평면 구조 vs 연/월 구조: 날짜 목록/한 달 범위 선택 시간과 Hook 기록 비용"""
+    home = make_home()
+    os.environ['HOME'] = home
+    sys.path.insert(0, SCRIPTS_DIR)
+    import daily_store
+    log_dir = write_synthetic_history(home, args.days, 2)
+
+    month_start = (datetime.now() - timedelta(days=args.days // 2)).strftime('%Y-%m-01')
+    month_end = month_start[:8] + '31'
+
+    def measure():
+        timings = {}
+        for label, call in (('list_all', lambda: daily_store.list_log_dates(log_dir)),
+                            ('list_one_month', lambda: daily_store.list_log_dates(log_dir, start=month_start, end=month_end))):
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                dates = call()
+            timings[label + '_ms'] = round((time.perf_counter() - started) * 1000 / args.repeat, 3)
+            timings[label + '_days'] = len(dates)
+
+        record = {'time': '10:00', 'project': 'bench', 'path': '/bench', 'prompt': '기록 비용 측정'}
+        today = datetime.now().strftime('%Y-%m-%d')
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            daily_store.append_record(log_dir, today, record)
+        timings['append_ms'] = round((time.perf_counter() - started) * 1000 / args.repeat, 3)
+        timings['top_level_entries'] = len(os.listdir(log_dir))
+        return timings
+
+    results = {"flat": measure()}
+    started = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, 'shard-logs.py')], env=hook_env(home),
+                   capture_output=True, check=True)
+    migrate_ms = round((time.perf_counter() - started) * 1000, 1)
+    results["sharded"] = {**measure(), "migrate_ms": migrate_ms}
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    manifest = daily_store.load_manifest(log_dir, today[:7])
+    tasks = manifest['days'][today]['tasks']
+    expected = 2 + args.repeat * 2
+    print(json.dumps({
+        "scenario": "shard",
+        "days": args.days,
+        **results,
+        "manifest_tasks_today": tasks,
+        "manifest_matches": tasks == expected
+    }, indent=2, ensure_ascii=False))
+    return 0 if tasks == expected else 1
+
+
+def run_rollup(args):
+    """주간/월간 보고서: 원본 로그 재계산(generate-summary.py) vs 집계 파일(rollup-report.py), Hook 집계 비용"""
+    home = make_home()
+    env = hook_env(home)
+    os.environ['HOME'] = home
+    sys.path.insert(0, SCRIPTS_DIR)
+    import daily_rollup
+    log_dir = write_synthetic_history(home, args.days, args.prompts)
+
+    def timed(script, *options):
+        started = time.perf_counter()
+        proc = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script), *options],
+                              env=env, capture_output=True, check=False)
+        return round((time.perf_counter() - started) * 1000, 1), json.loads(proc.stdout or b'{}')
+
+    month = datetime.now().strftime('%Y-%m')
+    results = {}
+    for label, options in (('week', ('--week',)), ('month', ('--month', month))):
+        # 캐시가 채워진 상태(두 번째 실행)로 비교
+        timed('generate-summary.py', *options, '--format', 'json')
+        raw_ms, raw = timed('generate-summary.py', *options, '--format', 'json')
+        results[label] = {"raw_ms": raw_ms, "raw_tasks": raw.get('total_tasks')}
+
+    rebuild_ms, _ = timed('rollup-report.py', '--rebuild')
+    for label, options in (('week', ('--week',)), ('month', ('--month', month))):
+        rollup_ms, view = timed('rollup-report.py', *options, '--format', 'json')
+        results[label].update(rollup_ms=rollup_ms, rollup_prompts=view.get('total', {}).get('prompts'))
+
+    month_view = daily_rollup.month_view(log_dir, month)
+    record = {'time': '10:00', 'project': 'bench', 'path': '/bench', 'prompt': '집계 비용 측정'}
+    today = datetime.now().strftime('%Y-%m-%d')
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        daily_rollup.record_prompt(log_dir, today, record, '테스트')
+    record_ms = round((time.perf_counter() - started) * 1000 / args.repeat, 3)
+    after = daily_rollup.month_view(log_dir, month)['total']['prompts']
+
+    matches = (results['month']['raw_tasks'] == results['month']['rollup_prompts']
+               and after == month_view['total']['prompts'] + args.repeat)
+    print(json.dumps({
+        "scenario": "rollup",
+        "days": args.days,
+        "prompts_per_day": args.prompts,
+        **results,
+        "rebuild_ms": rebuild_ms,
+        "record_prompt_ms": record_ms,
+        "rollup_file_bytes": os.path.getsize(daily_rollup.rollup_path(log_dir, month)),
+        "counts_match": matches
+    }, indent=2, ensure_ascii=False))
+    return 0 if matches else 1
+
+
+def run_activity(args):
+    """활동 시간 계산: 캐시 없이 전체 계산 vs 날짜별 캐시 재사용 vs 오늘만 바뀐 경우"""
+    home = make_home()
+    os.environ['HOME'] = home
+    sys.path.insert(0, SCRIPTS_DIR)
+    import daily_activity
+    import daily_store
+    log_dir = write_synthetic_history(home, args.days, args.prompts)
+    dates = daily_store.list_log_dates(log_dir)
+
+    def timed():
+        started = time.perf_counter()
+        results = daily_activity.load_activity(log_dir, dates)
+        return round((time.perf_counter() - started) * 1000, 1), results
+
+    cold_ms, cold = timed()
+    warm_ms, warm = timed()
+    record = {'time': '23:59', 'project': 'bench', 'path': '/bench', 'prompt': '활동 시간 측정'}
+    daily_store.append_record(log_dir, dates[-1], record)
+    append_ms, appended = timed()
+
+    summary = daily_activity.summarize_activity(appended)
+    matches = cold == warm and appended[dates[-1]]['prompts'] == cold[dates[-1]]['prompts'] + 1
+    print(json.dumps({
+        "scenario": "activity",
+        "days": len(dates),
+        "prompts_per_day": args.prompts,
+        "cold_ms": cold_ms,
+        "warm_ms": warm_ms,
+        "after_append_ms": append_ms,
+        "active_hours": round(summary['active_seconds'] / 3600, 1),
+        "sessions": summary['sessions'],
+        "weeks": len(summary['weeks']),
+        "cache_matches": matches
+    }, indent=2, ensure_ascii=False))
+    return 0 if matches else 1
+
+
+def run_watch(args):
+    """generate-summary.py --watch에 기록을 몰아서 추가하고 저장 횟수/지연, --save 결과와 같은지 확인"""
+    import queue
+    import signal
+    import threading
+    home = make_home()
+    env = hook_env(home)
+    # 카테고리 순서(set)가 실행마다 달라지지 않게 고정해서 --save 결과와 비교
+    env['PYTHONHASHSEED'] = '0'
+    os.environ['HOME'] = home
+    sys.path.insert(0, SCRIPTS_DIR)
+    import daily_store
+    log_dir = write_synthetic_history(home, 1, args.prompts)
+    today = datetime.now().strftime('%Y-%m-%d')
+    script = os.path.join(SCRIPTS_DIR, 'generate-summary.py')
+
+    command = [sys.executable, script, '--watch', '--debounce', str(args.debounce)]
+    if args.poll:
+        command.append('--poll')
+    watcher = subprocess.Popen(command, env=env, stdout=subprocess.PIPE, text=True)
+    events = queue.Queue()
+    threading.Thread(target=lambda: [events.put(json.loads(line)) for line in watcher.stdout], daemon=True).start()
+
+    def next_event(name):
+        while True:
+            event = events.get(timeout=30)
+            if event['event'] == name:
+                return event
+
+    started = next_event('watching')
+    if args.prompts:
+        next_event('saved')
+
+    latencies = []
+    renders = []
+    for burst in range(args.bursts):
+        for i in range(args.burst_size):
+            daily_store.append_record(log_dir, today, {
+                'time': f'{18 + burst % 6:02d}:{i % 60:02d}', 'project': f'project-{i % 4}',
+                'path': f'/work/project-{i % 4}', 'prompt': SAMPLE_PROMPTS[(burst * 7 + i) % len(SAMPLE_PROMPTS)]
+            })
+        appended = time.perf_counter()
+        saved = next_event('saved')
+        latencies.append((time.perf_counter() - appended) * 1000 - args.debounce)
+        renders.append(saved['render_ms'])
+
+    watcher.send_signal(signal.SIGTERM)
+    watcher.wait(timeout=30)
+    summary_path = saved['saved_path']
+    with open(summary_path, 'r', encoding='utf-8') as f:
+        watched = [line for line in f if not line.startswith('생성 시간')]
+
+    # 비교: 기록이 추가될 때마다 --save로 전체를 다시 만드는 경우
+    save_ms = []
+    for _ in range(3):
+        begin = time.perf_counter()
+        subprocess.run([sys.executable, script, '--save'], env=env, capture_output=True, check=True)
+        save_ms.append((time.perf_counter() - begin) * 1000)
+    with open(summary_path, 'r', encoding='utf-8') as f:
+        regenerated = [line for line in f if not line.startswith('생성 시간')]
+
+    matches = watched == regenerated
+    print(json.dumps({
+        "scenario": "watch",
+        "watcher": started['watcher'],
+        "prompts": args.prompts + args.bursts * args.burst_size,
+        "appended": args.bursts * args.burst_size,
+        "saves": len(renders),
+        "debounce_ms": args.debounce,
+        "render_ms_median": round(sorted(renders)[len(renders) // 2], 2),
+        "latency_after_debounce_ms_median": round(sorted(latencies)[len(latencies) // 2], 1),
+        "full_save_ms_median": round(sorted(save_ms)[1], 1),
+        "matches_full_save": matches
+    }, indent=2, ensure_ascii=False))
+    return 0 if matches else 1
+
+
+def legacy_categorize(content):
+    """비교용: 이전 categorize_task (카테고리마다 any()로 부분 문자열 검사)"""
+    if any(k in content for k in ['설정', '설치', 'setup', 'config', 'install']):
+        return '설정'
+    if any(k in content for k in ['노션', 'notion', 'mcp', 'api', '연동', '동기화', 'sync']):
+        return 'Notion 연동'
+    if any(k in content for k in ['테스트', 'test', '확인', '검증']):
+        return '테스트'
+    if any(k in content for k in ['문서', 'readme', 'docs', '매뉴얼', 'manual']):
+        return '문서 작성'
+    if any(k in content for k in ['수정', '변경', '개선', 'fix', 'update', '버그']):
+        return '수정/개선'
+    if any(k in content for k in ['추가', '생성', '만들', 'add', 'create', 'new']):
+        return '기능 추가'
+    if any(k in content for k in ['삭제', '제거', 'delete', 'remove']):
+        return '삭제'
+    return None
+
+
+def run_classify(args):
+    """합성 작업 목록으로 분류기와 기존 분류 방식의 속도/결과 비교"""
+    import random
+    sys.path.insert(0, SCRIPTS_DIR)
+    import daily_classifier
+
+    classifier = daily_classifier.load_classifier()
+    keywords = [k for c in daily_classifier.DEFAULT_CATEGORIES for k in c['keywords']]
+    words = ('로그인 화면 결제 모듈 사용자 목록 페이지 리팩터링 좀 해줘 왜 이런 에러가 나지 '
+             'the quick brown fox payment server handler README Setup API').split()
+
+    rng = random.Random(1)
+    corpus = []
+    for _ in range(args.tasks):
+        task = rng.choices(words, k=rng.randint(3, 12))
+        if rng.random() < 0.5:
+            task.insert(rng.randrange(len(task) + 1), rng.choice(keywords))
+        corpus.append(' '.join(task))
+
+    results = {}
+    for label, func in (('legacy', legacy_categorize),
+                        ('classifier', lambda c: daily_classifier.classify(c, classifier))):
+        started = time.perf_counter()
+        for content in corpus:
+            func(content)
+        results[label] = {"ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    # 대소문자만 다른 경우를 빼면 결과가 같아야 함
+    mismatches = sum(
+        1 for content in corpus
+        if legacy_categorize(content.lower()) != daily_classifier.classify(content, classifier)
+    )
+    print(json.dumps({
+        "scenario": "classify",
+        "tasks": args.tasks,
+        **results,
+        "speedup": round(results['legacy']['ms'] / max(results['classifier']['ms'], 0.001), 2),
+        "mismatches": mismatches
+    }, indent=2, ensure_ascii=False))
+    return 0 if mismatches == 0 else 1
+
+
+def run_sync_state(args):
+    """여러 해 동기화 기록에서 기존 sync_history 목록 방식 vs 연도별 비트맵 (추가/미동기화 조회)"""
+    home = make_home()
+    os.environ['HOME'] = home
+    sys.path.insert(0, SCRIPTS_DIR)
+    import daily_sync_state
+
+    start = datetime(2026, 1, 1) - timedelta(days=args.years * 365)
+    dates = [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(args.years * 365)]
+    history, recent = dates[:-args.mark], dates[-args.mark:]
+    config_path = os.path.join(home, '.claude', 'daily-work-tracker', 'config.json')
+    base_config = {"notion_mcp": {"enabled": True, "page_id": "page"}}
+
+    # 기존 방식: config.json의 목록에 추가 → 정렬 → 설정 전체 다시 쓰기, 조회는 목록 선형 검색
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump({**base_config, "sync_history": list(history)}, f)
+    started = time.perf_counter()
+    for date_str in recent:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        if date_str not in config['sync_history']:
+            config['sync_history'].append(date_str)
+            config['sync_history'].sort()
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2, ensure_ascii=False)
+    legacy_mark_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    legacy_unsynced = [d for d in dates if d not in config['sync_history']]
+    legacy_query_ms = (time.perf_counter() - started) * 1000
+    legacy_bytes = os.path.getsize(config_path)
+
+    # 비트맵: 처음 기록할 때 sync_history를 옮긴 뒤 날짜마다 비트 하나
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump({**base_config, "sync_history": list(history)}, f)
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    started = time.perf_counter()
+    daily_sync_state.migrate_state(config)
+    migrate_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    for date_str in recent:
+        daily_sync_state.mark_synced(date_str)
+    bitmap_mark_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    bitmap_unsynced = daily_sync_state.unsynced_dates(dates, daily_sync_state.load_state())
+    bitmap_query_ms = (time.perf_counter() - started) * 1000
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        migrated = 'sync_history' not in json.load(f)
+    print(json.dumps({
+        "scenario": "sync-state",
+        "synced_dates": len(dates),
+        "legacy": {"mark_ms_each": round(legacy_mark_ms / args.mark, 3), "unsynced_query_ms": round(legacy_query_ms, 2),
+                   "config_bytes": legacy_bytes},
+        "bitmap": {"migrate_ms": round(migrate_ms, 2), "mark_ms_each": round(bitmap_mark_ms / args.mark, 3),
+                   "unsynced_query_ms": round(bitmap_query_ms, 2),
+                   "state_bytes": os.path.getsize(daily_sync_state.get_state_path()),
+                   "config_bytes": os.path.getsize(config_path)},
+        "config_migrated": migrated,
+        "same_result": legacy_unsynced == bitmap_unsynced
+    }, indent=2, ensure_ascii=False))
+    return 0 if migrated and legacy_unsynced == bitmap_unsynced else 1
+
+
+def start_notion_mock(fail_rate=0.0, latency_ms=0, retry_after=0.2):
+    """Notion 블록 추가 API의 제한(children 100개, 텍스트 2000자, 본문 500KB)을 검사하는 로컬 서버
+    fail_rate 비율로 429(Retry-After)를 돌려주고, 요청마다 latency_ms만큼 지연"""
+    import random
+    import socket
+    import threading
+    import uuid
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    sys.path.insert(0, SCRIPTS_DIR)
+    import daily_notion
+
+    state = {"tree": {}, "requests": 0, "rejected": 0, "throttled": 0, "connections": 0}
+    lock = threading.Lock()
+    rng = random.Random(7)
+
+    def validate(children, depth):
+        if len(children) > daily_notion.MAX_CHILDREN:
+            return f'children length {len(children)} > {daily_notion.MAX_CHILDREN}'
+        for block in children:
+            body = block.get(block.get('type'), {})
+            rich_text = body.get('rich_text', [])
+            if len(rich_text) > daily_notion.MAX_RICH_TEXT:
+                return f'rich_text length {len(rich_text)} > {daily_notion.MAX_RICH_TEXT}'
+            for item in rich_text:
+                if daily_notion.text_length(item['text']['content']) > daily_notion.MAX_TEXT_LENGTH:
+                    return 'text.content length > 2000'
+            if body.get('children'):
+                if depth >= 2:
+                    return 'too many levels of nesting'
+                error = validate(body['children'], depth + 1)
+                if error:
+                    return error
+        return None
+
+    def store(parent_id, children, after=None):
+        siblings = state['tree'].setdefault(parent_id, [])
+        position = len(siblings)
+        if after:
+            position = [block_id for block_id, _ in siblings].index(after) + 1
+        results = []
+        for block in children:
+            block_id = str(uuid.uuid4())
+            body = block.get(block.get('type'), {})
+            siblings.insert(position, (block_id, block))
+            position += 1
+            store(block_id, body.get('children') or [])
+            results.append({"object": "block", "id": block_id, "type": block.get('type')})
+        return results
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            super().setup()
+            # 헤더와 본문을 따로 쓰므로 Nagle 지연이 keep-alive 측정에 섞이지 않게 함
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with lock:
+                state['connections'] += 1
+
+        def reply(self, status, payload, headers=None):
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_PATCH(self):
+            length = int(self.headers.get('Content-Length', 0))
+            body = self.rfile.read(length)
+            parent_id = self.path.split('/')[-2]
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            with lock:
+                state['requests'] += 1
+                if state.get('fail_after') is not None and state['requests'] > state['fail_after']:
+                    self.reply(503, {"object": "error", "status": 503, "code": "service_unavailable"})
+                    return
+                if fail_rate and rng.random() < fail_rate:
+                    state['throttled'] += 1
+                    self.reply(429, {"object": "error", "status": 429, "code": "rate_limited"},
+                               {"Retry-After": str(retry_after)})
+                    return
+                error = None
+                if length > daily_notion.MAX_PAYLOAD_BYTES:
+                    error = f'body {length} bytes > {daily_notion.MAX_PAYLOAD_BYTES}'
+                else:
+                    payload = json.loads(body)
+                    children = payload['children']
+                    error = validate(children, 1)
+                if error:
+                    state['rejected'] += 1
+                    self.reply(400, {"object": "error", "status": 400, "code": "validation_error", "message": error})
+                    return
+                self.reply(200, {"object": "list", "results": store(parent_id, children, payload.get('after'))})
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def block_texts(blocks, tree=None):
+    """블록 목록을 (종류, 텍스트) 순서 목록으로 펼침 (나눈 rich_text는 다시 이어 붙임)"""
+    flat = []
+    for item in blocks:
+        block_id, block = item if tree is not None else (None, item)
+        body = block.get(block.get('type'), {})
+        flat.append((block.get('type'), ''.join(t['text']['content'] for t in body.get('rich_text', []))))
+        if tree is not None:
+            flat.extend(block_texts(tree.get(block_id, []), tree))
+        else:
+            flat.extend(block_texts(body.get('children') or []))
+    return flat
+
+
+def run_notion(args):
+    """바쁜 날의 블록을 로컬 서버로 올려 제한 위반 없이 순서대로 들어가는지, 429에서 재시도하는지 확인"""
+    import urllib.error
+    import urllib.request
+    sys.path.insert(0, SCRIPTS_DIR)
+    import daily_notion
+    sync = load_script('sync-notion.py')
+
+    projects = []
+    for p in range(args.projects):
+        tasks = [{'time': f'{9 + i % 10:02d}:{i % 60:02d}', 'content': f'task {p}-{i} ' + SAMPLE_PROMPTS[i % len(SAMPLE_PROMPTS)]}
+                 for i in range(args.tasks)]
+        # 긴 붙여넣기 (한글 + 이모지, 2000자 제한 여러 번 넘김)
+        tasks.append({'time': '18:00', 'content': ('에러 로그 😀 ' * 800).strip()})
+        projects.append({'name': f'project-{p}', 'path': f'/work/project-{p}', 'tasks': tasks})
+    blocks = sync.format_for_notion(projects, '2026-01-05')
+
+    # 하위 블록이 100개를 넘는 toggle
+    blocks.append({"object": "block", "type": "toggle", "toggle": {
+        "rich_text": [{"type": "text", "text": {"content": "toggle"}}],
+        "children": [{"object": "block", "type": "paragraph", "paragraph": {
+            "rich_text": [{"type": "text", "text": {"content": f'child {i}'}}]}} for i in range(250)]
+    }})
+
+    server, state = start_notion_mock(args.fail_rate, args.latency_ms)
+    api_base = f'http://127.0.0.1:{server.server_port}/v1'
+    try:
+        # 이전 방식: 하루치를 한 번에 전송
+        try:
+            urllib.request.urlopen(urllib.request.Request(
+                f'{api_base}/blocks/legacy-page/children',
+                data=json.dumps({"children": blocks}).encode('utf-8'),
+                headers={"Content-Type": "application/json"}, method='PATCH'))
+            legacy = "accepted"
+        except urllib.error.HTTPError as e:
+            legacy = f'HTTP {e.code}'
+        baseline = dict(state)
+
+        client = daily_notion.NotionClient('test', api_base, daily_notion.TokenBucket(args.rate, daily_notion.BURST))
+        started = time.perf_counter()
+        result = daily_notion.append_blocks(client, 'page', blocks)
+        elapsed = (time.perf_counter() - started) * 1000
+        client.close()
+    finally:
+        server.shutdown()
+
+    ordered = block_texts(state['tree'].get('page', []), state['tree']) == block_texts(blocks)
+    # 한 번에 보낸 요청이 거절되지 않으면 서버가 제한을 검사하지 않는 것이므로 결과를 믿을 수 없음
+    limits_enforced = legacy != 'accepted'
+    success = bool(result.get('success')) and ordered and limits_enforced and state['rejected'] == baseline['rejected']
+    print(json.dumps({
+        "scenario": "notion",
+        "blocks": len(blocks),
+        "legacy_single_request": legacy,
+        **result,
+        "ms": round(elapsed, 1),
+        "server_requests": state['requests'] - baseline['requests'],
+        "server_throttled": state['throttled'] - baseline['throttled'],
+        "server_connections": state['connections'] - baseline['connections'],
+        "rejected_requests": state['rejected'] - baseline['rejected'],
+        "order_preserved": ordered,
+        "limits_enforced": limits_enforced,
+        "success": success
+    }, indent=2, ensure_ascii=False))
+    return 0 if success else 1
+
+
+def run_notion_throughput(args):
+    """작은 요청 여러 번: 요청마다 새 연결(urllib) vs keep-alive 클라이언트"""
+    import urllib.request
+    sys.path.insert(0, SCRIPTS_DIR)
+    import daily_notion
+
+    block = {"object": "block", "type": "paragraph",
+             "paragraph": {"rich_text": [{"type": "text", "text": {"content": "작업 기록"}}]}}
+    body = json.dumps({"children": [block]}).encode('utf-8')
+    server, state = start_notion_mock(latency_ms=args.latency_ms)
+    api_base = f'http://127.0.0.1:{server.server_port}/v1'
+    results = {}
+    try:
+        started = time.perf_counter()
+        for _ in range(args.count):
+            request = urllib.request.Request(f'{api_base}/blocks/page/children', data=body,
+                                             headers={"Content-Type": "application/json"}, method='PATCH')
+            with urllib.request.urlopen(request) as response:
+                response.read()
+        results['urllib_per_request'] = {"ms": round((time.perf_counter() - started) * 1000, 1),
+                                         "connections": state['connections']}
+
+        before = state['connections']
+        client = daily_notion.NotionClient('test', api_base, daily_notion.TokenBucket(0))
+        started = time.perf_counter()
+        for _ in range(args.count):
+            client.request('PATCH', '/blocks/page/children', body)
+        results['keep_alive'] = {"ms": round((time.perf_counter() - started) * 1000, 1),
+                                 "connections": state['connections'] - before}
+        client.close()
+    finally:
+        server.shutdown()
+
+    # 두 방식 모두 요청마다 블록 하나씩, 보낸 순서대로 들어가야 하고 keep-alive는 연결 하나를 재사용
+    stored = len(state['tree'].get('page', []))
+    success = stored == args.count * 2 and results['keep_alive']['connections'] == 1
+    print(json.dumps({"scenario": "notion-throughput", "requests": args.count, **results,
+                      "stored_blocks": stored, "success": success}, indent=2, ensure_ascii=False))
+    return 0 if success else 1
+
+
+def run_notion_delta(args):
+    """같은 날을 작업을 추가해 가며 세 번 동기화: 새 작업만 전송, 변화 없으면 요청 0회"""
+    home = make_home()
+    os.environ['HOME'] = home
+    os.environ['NOTION_API_KEY'] = 'test'
+    sync = load_script('sync-notion.py')
+
+    server, state = start_notion_mock()
+    config = {"notion": {"enabled": True, "page_id": "page", "api_base": f'http://127.0.0.1:{server.server_port}/v1'}}
+
+    def day(tasks_per_project, projects):
+        return [{'name': f'project-{p}', 'path': f'/work/project-{p}',
+                 'tasks': [{'time': '10:00', 'content': f'task {p}-{i}'} for i in range(tasks_per_project)]}
+                for p in range(projects)]
+
+    runs = []
+    try:
+        for label, projects in (('first', day(args.tasks, 3)),
+                                ('added_tasks_and_project', day(args.tasks + 5, 4)),
+                                ('unchanged', day(args.tasks + 5, 4))):
+            before = state['requests']
+            result = sync.sync_to_notion(projects, '2026-01-05', config)
+            runs.append({"run": label, "success": result.get('success'),
+                         "requests": state['requests'] - before, "blocks_sent": result.get('blocks_sent', 0)})
+    finally:
+        server.shutdown()
+
+    # 페이지 내용이 최종 기록을 한 번에 올린 것과 같아야 함
+    expected = block_texts(sync.format_for_notion(day(args.tasks + 5, 4), '2026-01-05'))
+    matches = block_texts(state['tree'].get('page', []), state['tree']) == expected
+    print(json.dumps({"scenario": "notion-delta", "runs": runs, "page_matches_full_render": matches},
+                     indent=2, ensure_ascii=False))
+    return 0 if matches and runs[-1]['requests'] == 0 else 1
+
+
+def run_end_of_day(args):
+    """하루 마무리: markdown 저장/notion/json/sync-notion.py를 따로 실행 vs --format all 한 번"""
+    server, state = start_notion_mock()
+    script = os.path.join(SCRIPTS_DIR, 'generate-summary.py')
+    sync_script = os.path.join(SCRIPTS_DIR, 'sync-notion.py')
+
+    def prepare(page_id):
+        # 같은 기록을 가진 HOME을 따로 만들어 캐시 없는 상태에서 비교
+        home = make_home()
+        env = hook_env(home)
+        env['NOTION_API_KEY'] = 'test'
+        # 카테고리 순서(set)가 실행마다 달라지지 않게 고정해서 저장된 요약 비교
+        env['PYTHONHASHSEED'] = '0'
+        write_synthetic_history(home, 1, args.prompts)
+        config = {"notion": {"enabled": True, "page_id": page_id,
+                             "api_base": f'http://127.0.0.1:{server.server_port}/v1'}}
+        with open(os.path.join(home, '.claude', 'daily-work-tracker', 'config.json'), 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+        return home, env
+
+    def run(command, env):
+        started = time.perf_counter()
+        proc = subprocess.run(command, env=env, capture_output=True, check=True)
+        return round((time.perf_counter() - started) * 1000, 1), proc.stdout
+
+    def saved_summary(home):
+        path = os.path.join(home, '.claude', 'daily-summaries', f"{datetime.now().strftime('%Y-%m-%d')}-summary.md")
+        with open(path, 'r', encoding='utf-8') as f:
+            return [line for line in f if not line.startswith('생성 시간')]
+
+    try:
+        separate_home, env = prepare('page-separate')
+        separate = {}
+        for label, command in (('markdown', [script, '--save']), ('notion', [script, '--format', 'notion']),
+                               ('json', [script, '--format', 'json']), ('sync', [sync_script])):
+            separate[label], _ = run([sys.executable] + command, env)
+
+        combined_home, env = prepare('page-combined')
+        combined_ms, stdout = run([sys.executable, script, '--format', 'all'], env)
+        report = json.loads(stdout)
+    finally:
+        server.shutdown()
+
+    tree = state['tree']
+    matches = (
+        report['success']
+        and saved_summary(separate_home) == saved_summary(combined_home)
+        and block_texts(tree.get('page-separate', []), tree) == block_texts(tree.get('page-combined', []), tree)
+    )
+    print(json.dumps({
+        "scenario": "end-of-day",
+        "prompts": args.prompts,
+        "separate_ms": separate,
+        "separate_total_ms": round(sum(separate.values()), 1),
+        "combined_ms": combined_ms,
+        "combined_timings_ms": report['timings_ms'],
+        "outputs_match": matches
+    }, indent=2, ensure_ascii=False))
+    return 0 if matches else 1
+
+
+def run_notion_backfill(args):
+    """합성 기록 여러 날을 --all-unsynced로 일괄 동기화 (중간에 서버가 멈췄다가 다시 실행해도 이어서)"""
+    sys.path.insert(0, SCRIPTS_DIR)
+    import daily_parser
+    sync = load_script('sync-notion.py')
+
+    home = make_home()
+    env = hook_env(home)
+    env['NOTION_API_KEY'] = 'test'
+    log_dir = write_synthetic_history(home, args.days, args.prompts)
+
+    server, state = start_notion_mock(latency_ms=args.latency_ms)
+    config = {"notion": {"enabled": True, "page_id": "page", "max_retries": 0, "rate_per_sec": args.rate,
+                         "api_base": f'http://127.0.0.1:{server.server_port}/v1'}}
+    with open(os.path.join(home, '.claude', 'daily-work-tracker', 'config.json'), 'w', encoding='utf-8') as f:
+        json.dump(config, f)
+
+    command = [sys.executable, os.path.join(SCRIPTS_DIR, 'sync-notion.py'), '--all-unsynced', '--workers', str(args.workers)]
+    runs = []
+    try:
+        # 첫 실행은 중간에 서버가 멈춤
+        state['fail_after'] = args.interrupt_after
+        for label in ('interrupted', 'resumed', 'again'):
+            before = state['requests']
+            started = time.perf_counter()
+            proc = subprocess.run(command, env=env, capture_output=True, check=False)
+            report = json.loads(proc.stdout or b'{}')
+            runs.append({"run": label, "ms": round((time.perf_counter() - started) * 1000, 1),
+                         "requests": state['requests'] - before, "days": report.get('days'),
+                         "synced": len(report.get('synced', [])), "failed": len(report.get('failed', {}))})
+            state['fail_after'] = None
+    finally:
+        server.shutdown()
+
+    # 페이지 = 날짜순으로 하루씩 전체 렌더링한 것과 같아야 함 (중복/뒤섞임 없음)
+    expected = []
+    for date_str in sorted(d for d in os.listdir(log_dir) if d.endswith('.jsonl')):
+        date_str = date_str[:-6]
+        expected.extend(block_texts(sync.format_for_notion(daily_parser.load_day_projects(log_dir, date_str), date_str)))
+    matches = block_texts(state['tree'].get('page', []), state['tree']) == expected
+    print(json.dumps({"scenario": "notion-backfill", "days": args.days, "workers": args.workers,
+                      "runs": runs, "page_matches_full_render": matches}, indent=2, ensure_ascii=False))
+    return 0 if matches and runs[-1]['days'] == 0 else 1
+
+
+def run_notion_outbox(args):
+    """서버가 멈춘 동안 실패한 동기화가 대기열에 남고, 서버가 돌아온 뒤 Hook이 띄운 drain으로 전송되는지 확인"""
+    home = make_home()
+    env = hook_env(home)
+    env['NOTION_API_KEY'] = 'test'
+    project = os.path.join(home, 'project')
+    os.makedirs(project, exist_ok=True)
+
+    server, state = start_notion_mock()
+    config = {"notion": {"enabled": True, "page_id": "page", "max_retries": 0,
+                         "api_base": f'http://127.0.0.1:{server.server_port}/v1'}}
+    with open(os.path.join(home, '.claude', 'daily-work-tracker', 'config.json'), 'w', encoding='utf-8') as f:
+        json.dump(config, f)
+
+    hook = [sys.executable, os.path.join(SCRIPTS_DIR, 'log-daily.py')]
+    sync = [sys.executable, os.path.join(SCRIPTS_DIR, 'sync-notion.py')]
+    outbox = os.path.join(home, '.claude', 'daily-work-tracker', 'outbox')
+
+    def pending():
+        return len([n for n in os.listdir(outbox) if n.endswith('.json')]) if os.path.isdir(outbox) else 0
+
+    try:
+        for i in range(5):
+            subprocess.run(hook, input=json.dumps({'prompt': f'작업 {i}', 'cwd': project}).encode('utf-8'), env=env, check=False)
+
+        # 서버 장애 중 동기화 → 대기열
+        state['fail_after'] = 0
+        report = json.loads(subprocess.run(sync, env=env, capture_output=True, check=False).stdout or b'{}')
+        queued = pending()
+        state['fail_after'] = None
+
+        # 서버 복구 후 프롬프트 한 번: Hook은 drain을 띄우기만 하고 바로 끝남
+        payload = json.dumps({'prompt': '복구 후 작업', 'cwd': project}).encode('utf-8')
+        hook_ms = latency_stats(time_hook(hook, env, payload, 1))['max_ms']
+        deadline = time.monotonic() + 15
+        while pending() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        drained = pending() == 0
+    finally:
+        server.shutdown()
+
+    synced = [text for kind, text in block_texts(state['tree'].get('page', []), state['tree']) if kind == 'bulleted_list_item']
+    print(json.dumps({
+        "scenario": "notion-outbox",
+        "sync_while_down": report.get('error'),
+        "queued": queued,
+        "hook_ms_with_pending_outbox": hook_ms,
+        "drained_in_background": drained,
+        "tasks_on_page": len(synced)
+    }, indent=2, ensure_ascii=False))
+    return 0 if queued == 1 and drained and len(synced) >= 5 else 1
+
+
+def check_stress_records(home, date_str, count, projects):
+    """stress 기록을 하나씩 확인: 빠진 번호, 두 번 들어간 번호, 내용이 섞인 기록 수"""
+    path = os.path.join(home, '.claude', 'daily-work', f'{date_str}.jsonl')
+    seen = {}
+    torn = 0
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                first, _, rest = record.get('prompt', '').partition('\n')
+                index = first[len('stress prompt '):]
+                if not first.startswith('stress prompt ') or not index.isdigit() or int(index) >= count:
+                    torn += 1
+                    continue
+                index = int(index)
+                # 다른 Hook의 내용이 섞이면 프로젝트나 두 번째 줄 길이가 번호와 맞지 않음
+                body = rest.strip().rstrip('.')
+                if record.get('project') != f'project-{index % projects}' or len(body) != min(index % 7 * 200, 150) \
+                        or body.strip('x'):
+                    torn += 1
+                seen[index] = seen.get(index, 0) + 1
+    missing = [i for i in range(count) if i not in seen]
+    duplicated = [i for i, n in seen.items() if n > 1]
+    return missing, duplicated, torn
+
+
+def run_stress(args):
+    """여러 Hook을 동시에 실행하고 유실된 기록이 없는지 확인"""
+    home = make_home()
+    env = hook_env(home)
+    hook = os.path.join(SCRIPTS_DIR, 'log-daily.py')
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    procs = []
+    for i in range(args.count):
+        payload = json.dumps({
+            'prompt': f'stress prompt {i}\n' + 'x' * (i % 7) * 200,
+            'cwd': os.path.join(home, f'project-{i % args.projects}')
+        })
+        proc = subprocess.Popen([sys.executable, hook], stdin=subprocess.PIPE, env=env)
+        proc.stdin.write(payload.encode('utf-8'))
+        proc.stdin.close()
+        procs.append(proc)
+
+    for proc in procs:
+        proc.wait()
+
+    valid, broken = count_journal_records(home, today)
+    missing, duplicated, torn = check_stress_records(home, today, args.count, args.projects)
+    result = {
+        "scenario": "stress",
+        "invocations": args.count,
+        "records": valid,
+        "broken_lines": broken,
+        "lost": len(missing),
+        "duplicated": len(duplicated),
+        "torn_records": torn,
+        "success": valid == args.count and broken == 0 and not missing and not duplicated and torn == 0
+    }
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0 if result['success'] else 1
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='성능/안정성 점검')
+    sub = parser.add_subparsers(dest='scenario', required=True)
+
+    stress = sub.add_parser('stress', help='동시 Hook 실행 시 기록 유실 확인')
+    stress.add_argument('--count', type=int, default=300, help='동시 실행할 Hook 수')
+    stress.add_argument('--projects', type=int, default=5, help='프로젝트 수')
+
+    hook = sub.add_parser('hook', help='Hook 지연 시간 (직접 실행 vs 상주 로거)')
+    hook.add_argument('--count', type=int, default=200, help='모드별 실행 횟수')
+
+    prompt = sub.add_parser('prompt', help='프롬프트 크기별 format_prompt 비용')
+    prompt.add_argument('--repeat', type=int, default=50, help='크기별 반복 횟수')
+
+    range_parser = sub.add_parser('range', help='합성 기록으로 기간 보고서 생성 시간 측정')
+    range_parser.add_argument('--days', type=int, default=365, help='기록 일수')
+    range_parser.add_argument('--prompts', type=int, default=60, help='하루 프롬프트 수')
+    range_parser.add_argument('--workers', type=int, help='병렬 파싱 프로세스 수')
+
+    archive = sub.add_parser('archive', help='월별 압축 보관 전후 기간 보고서 비교')
+    archive.add_argument('--days', type=int, default=730, help='기록 일수')
+    archive.add_argument('--prompts', type=int, default=30, help='하루 프롬프트 수')
+
+    shard = sub.add_parser('shard', help='평면 구조 vs 연/월 구조 날짜 목록/기록 비용')
+    shard.add_argument('--days', type=int, default=1825, help='기록 일수')
+    shard.add_argument('--repeat', type=int, default=200, help='측정 반복 횟수')
+
+    rollup = sub.add_parser('rollup', help='원본 로그 재계산 vs 집계 파일로 주간/월간 보고서')
+    rollup.add_argument('--days', type=int, default=730, help='기록 일수')
+    rollup.add_argument('--prompts', type=int, default=40, help='하루 프롬프트 수')
+    rollup.add_argument('--repeat', type=int, default=200, help='Hook 집계 추가 반복 횟수')
+
+    activity = sub.add_parser('activity', help='활동 시간 계산: 전체 재계산 vs 날짜별 캐시 + carry')
+    activity.add_argument('--days', type=int, default=365, help='기록 일수')
+    activity.add_argument('--prompts', type=int, default=40, help='하루 프롬프트 수')
+
+    watch = sub.add_parser('watch', help='--watch: 몰려 들어온 기록당 저장 횟수/지연 vs 매번 --save')
+    watch.add_argument('--prompts', type=int, default=300, help='감시 시작 전 오늘 기록 수')
+    watch.add_argument('--bursts', type=int, default=5)
+    watch.add_argument('--burst-size', type=int, default=20)
+    watch.add_argument('--debounce', type=int, default=300, help='ms')
+    watch.add_argument('--poll', action='store_true', help='inotify 대신 주기적 확인')
+
+    end_of_day = sub.add_parser('end-of-day', help='형식별 4번 실행 vs --format all 한 번')
+    end_of_day.add_argument('--prompts', type=int, default=300, help='오늘 기록 수')
+
+    classify_parser = sub.add_parser('classify', help='작업 분류기 vs 기존 키워드 순차 검사')
+    classify_parser.add_argument('--tasks', type=int, default=200000, help='합성 작업 수')
+
+    notion = sub.add_parser('notion', help='Notion 제한을 흉내 낸 로컬 서버로 나눠 올리기 확인')
+    notion.add_argument('--projects', type=int, default=4, help='프로젝트 수')
+    notion.add_argument('--tasks', type=int, default=150, help='프로젝트별 작업 수')
+    notion.add_argument('--fail-rate', type=float, default=0.0, help='429로 거절할 요청 비율')
+    notion.add_argument('--latency-ms', type=int, default=0, help='요청마다 추가할 서버 지연')
+    notion.add_argument('--rate', type=float, default=3, help='초당 요청 수 제한 (0이면 제한 없음)')
+
+    throughput = sub.add_parser('notion-throughput', help='요청마다 새 연결 vs keep-alive 연결')
+    throughput.add_argument('--count', type=int, default=300, help='요청 수')
+    throughput.add_argument('--latency-ms', type=int, default=0, help='요청마다 추가할 서버 지연')
+
+    delta = sub.add_parser('notion-delta', help='같은 날 반복 동기화 시 새 작업만 전송되는지 확인')
+    delta.add_argument('--tasks', type=int, default=40, help='프로젝트별 처음 작업 수')
+
+    backfill = sub.add_parser('notion-backfill', help='미동기화 날짜 일괄 동기화 (중단 후 이어서)')
+    backfill.add_argument('--days', type=int, default=30, help='기록 일수')
+    backfill.add_argument('--prompts', type=int, default=40, help='하루 프롬프트 수')
+    backfill.add_argument('--workers', type=int, default=3, help='동시에 올리는 날짜 수')
+    backfill.add_argument('--latency-ms', type=int, default=300, help='요청마다 추가할 서버 지연')
+    backfill.add_argument('--rate', type=float, default=3, help='초당 요청 수 제한')
+    backfill.add_argument('--interrupt-after', type=int, default=12, help='첫 실행에서 서버가 멈추기 전 요청 수')
+
+    sync_state = sub.add_parser('sync-state', help='sync_history 목록 vs 연도별 비트맵')
+    sync_state.add_argument('--years', type=int, default=10, help='동기화 기록 연수')
+    sync_state.add_argument('--mark', type=int, default=200, help='새로 기록할 날짜 수')
+
+    sub.add_parser('notion-outbox', help='동기화 실패 → 대기열 → Hook이 띄운 drain으로 전송')
+
+    args = parser.parse_args()
+
+    if args.scenario == 'stress':
+        sys.exit(run_stress(args))
+    elif args.scenario == 'hook':
+        sys.exit(run_hook(args))
+    elif args.scenario == 'prompt':
+        sys.exit(run_prompt(args))
+    elif args.scenario == 'range':
+        sys.exit(run_range(args))
+    elif args.scenario == 'archive':
+        sys.exit(run_archive(args))
+    elif args.scenario == 'shard':
+        sys.exit(run_shard(args))
+    elif args.scenario == 'rollup':
+        sys.exit(run_rollup(args))
+    elif args.scenario == 'activity':
+        sys.exit(run_activity(args))
+    elif args.scenario == 'watch':
+        sys.exit(run_watch(args))
+    elif args.scenario == 'end-of-day':
+        sys.exit(run_end_of_day(args))
+    elif args.scenario == 'classify':
+        sys.exit(run_classify(args))
+    elif args.scenario == 'sync-state':
+        sys.exit(run_sync_state(args))
+    elif args.scenario == 'notion':
+        sys.exit(run_notion(args))
+    elif args.scenario == 'notion-throughput':
+        sys.exit(run_notion_throughput(args))
+    elif args.scenario == 'notion-delta':
+        sys.exit(run_notion_delta(args))
+    elif args.scenario == 'notion-backfill':
+        sys.exit(run_notion_backfill(args))
+    elif args.scenario == 'notion-outbox':
+        sys.exit(run_notion_outbox(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 지난 로그 압축 보관/정리
+config.json의 retention 기준으로 끝난 달을 archive/YYYY-MM.gz로 묶고, 삭제 기준이 지난 달은 삭제
+
+사용법:
+    python3 compact-logs.py                       # 설정된 기준으로 보관/삭제
+    python3 compact-logs.py --dry-run             # 대상만 확인
+    python3 compact-logs.py --all                 # 끝난 달은 기준과 관계없이 모두 보관
+"""
+import json
+import sys
+
+import daily_archive
+from daily_config import get_log_dir, load_config, normalize
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='지난 로그 압축 보관/정리')
+    parser.add_argument('--dry-run', action='store_true', help='실제로 바꾸지 않고 대상만 출력')
+    parser.add_argument('--all', action='store_true', help='끝난 달은 보관 기준과 관계없이 모두 보관')
+    parser.add_argument('--archive-after', type=int, help='달이 끝나고 이 일수가 지나면 보관 (이번 실행만)')
+    parser.add_argument('--delete-after', type=int, help='달이 끝나고 이 일수가 지나면 삭제 (이번 실행만, 0이면 삭제 안 함)')
+    args = parser.parse_args()
+
+    config = load_config() or normalize({})
+    if config['storage']['backend'] == 'sqlite':
+        print(json.dumps({"error": "SQLite 저장소는 압축 보관을 지원하지 않습니다."}, ensure_ascii=False))
+        sys.exit(1)
+
+    retention = dict(config.get('retention', {}))
+    if args.archive_after is not None:
+        retention['archive_after_days'] = args.archive_after
+    if args.delete_after is not None:
+        retention['delete_after_days'] = args.delete_after
+    config['retention'] = retention
+
+    result = daily_archive.compact(get_log_dir(config), config, dry_run=args.dry_run, archive_all=args.all)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 활동 시간 추정
+프롬프트 시각(ts, 없으면 HH:MM)을 프로젝트별로 이어 보고 간격이 idle_minutes 이하이면 같은 작업 세션으로 묶어
+세션마다 (마지막 - 처음 + lead_minutes)를 활동 시간으로 계산 (lead는 첫 프롬프트를 쓰기까지 걸린 시간)
+하루 전체 활동 시간은 프로젝트별 구간의 합집합이라 여러 프로젝트를 동시에 진행해도 두 번 세지 않음
+날짜별 결과와 자정을 넘겨 이어지는 세션 정보(carry)를 {log_path}/.cache/activity-YYYY-MM.json에 저장해서
+기록이 바뀌지 않은 날짜는 다시 계산하지 않음
+config.json의 "settings": {"activity": {"idle_minutes": 30, "lead_minutes": 5}}로 기준 변경
+"""
+import json
+import os
+from datetime import date, datetime, timedelta
+
+from daily_store import CACHE_DIRNAME, DAY_EXTENSIONS, atomic_write_text, day_path, iter_day_records, week_start
+
+CACHE_VERSION = 1
+
+IDLE_MINUTES = 30
+LEAD_MINUTES = 5
+
+
+def get_params(config=None):
+    """세션 구분 기준 (초)"""
+    activity = (config or {}).get('settings', {}).get('activity', {})
+    return {
+        "idle": int(activity.get('idle_minutes', IDLE_MINUTES)) * 60,
+        "lead": int(activity.get('lead_minutes', LEAD_MINUTES)) * 60
+    }
+
+
+def format_duration(seconds):
+    """초 → 'N시간 M분'"""
+    minutes = int(round(seconds / 60))
+    if minutes < 60:
+        return f'{minutes}분'
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}시간 {minutes}분' if minutes else f'{hours}시간'
+
+
+def record_epoch(record, date_str):
+    """기록 시각 (ts가 있으면 초 단위, 없으면 날짜 + HH:MM)"""
+    ts = record.get('ts')
+    if ts:
+        try:
+            return datetime.fromisoformat(ts).timestamp()
+        except (TypeError, ValueError):
+            pass
+    try:
+        return datetime.strptime(f"{date_str} {record.get('time', '')}", '%Y-%m-%d %H:%M').timestamp()
+    except ValueError:
+        return None
+
+
+def _clock(epoch):
+    """epoch → HH:MM"""
+    return datetime.fromtimestamp(epoch).strftime('%H:%M')
+
+
+def _union_seconds(intervals):
+    """구간 합집합 길이"""
+    total = 0.0
+    end = None
+    for start, stop in sorted(intervals):
+        if end is None or start > end:
+            total += stop - start
+            end = stop
+        elif stop > end:
+            total += stop - end
+            end = stop
+    return total
+
+
+def compute_day(records, date_str, carry_in, params):
+    """하루치 기록(입력 순서)으로 활동 결과와 다음 날로 넘길 carry 계산
+    carry: {프로젝트: 마지막 프롬프트 epoch} (자정 전 idle 안에 끝나 다음 날 이어질 수 있는 것만)"""
+    prompts = []
+    for record in records:
+        epoch = record_epoch(record, date_str)
+        if epoch is not None:
+            prompts.append((epoch, record))
+    prompts.sort(key=lambda item: item[0])
+
+    idle, lead = params['idle'], params['lead']
+    last = dict(carry_in)
+    projects = {}
+    spans = []
+    open_spans = {}
+    intervals = []
+
+    for epoch, record in prompts:
+        name = record.get('project') or 'unknown'
+        stats = projects.setdefault(name, {"active_seconds": 0.0, "sessions": 0, "prompts": 0, "conversations": set()})
+        previous = last.get(name)
+
+        if previous is not None and 0 <= epoch - previous <= idle:
+            interval = (previous, epoch)
+        elif previous is not None and epoch < previous:
+            interval = (epoch, epoch)
+        else:
+            interval = (epoch - lead, epoch)
+            stats['sessions'] += 1
+            open_spans.pop(name, None)
+
+        stats['active_seconds'] += interval[1] - interval[0]
+        stats['prompts'] += 1
+        if record.get('session'):
+            stats['conversations'].add(record['session'])
+        intervals.append(interval)
+        last[name] = max(epoch, previous or epoch)
+
+        span = open_spans.get(name)
+        if span is None:
+            span = open_spans[name] = {"project": name, "start": interval[0], "end": epoch, "prompts": 0,
+                                       "active_seconds": 0.0}
+            spans.append(span)
+        span['end'] = max(span['end'], epoch)
+        span['prompts'] += 1
+        span['active_seconds'] += interval[1] - interval[0]
+
+    day_end = (datetime.strptime(date_str, '%Y-%m-%d') + timedelta(days=1)).timestamp()
+    carry_out = {
+        name: epoch for name, epoch in last.items()
+        if name in projects and epoch >= day_end - idle
+    }
+
+    result = {
+        "active_seconds": round(_union_seconds(intervals)),
+        "sessions": sum(s['sessions'] for s in projects.values()),
+        "prompts": len(prompts),
+        "first": _clock(prompts[0][0]) if prompts else None,
+        "last": _clock(prompts[-1][0]) if prompts else None,
+        "projects": {
+            name: {
+                "active_seconds": round(s['active_seconds']),
+                "sessions": s['sessions'],
+                "prompts": s['prompts'],
+                "conversations": len(s['conversations'])
+            }
+            for name, s in projects.items()
+        },
+        "spans": [
+            {"project": s['project'], "start": _clock(s['start']), "end": _clock(s['end']),
+             "prompts": s['prompts'], "active_seconds": round(s['active_seconds'])}
+            for s in spans
+        ]
+    }
+    return result, carry_out
+
+
+def _cache_path(log_dir, month):
+    """월별 활동 캐시 경로"""
+    return os.path.join(log_dir, CACHE_DIRNAME, f'activity-{month}.json')
+
+
+def _load_cache(log_dir, month, params):
+    """월별 활동 캐시 (없거나 버전/기준이 다르면 빈 캐시)"""
+    try:
+        with open(_cache_path(log_dir, month), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == CACHE_VERSION and cache.get('params') == params:
+            return cache
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {"version": CACHE_VERSION, "params": params, "days": {}}
+
+
+def source_fingerprint(log_dir, date_str, backend='files'):
+    """날짜별 원본이 바뀌었는지 확인할 값 (파일 크기/수정 시각, 보관분 해시, SQLite 행 수/마지막 ID)"""
+    if backend == 'sqlite':
+        import daily_db
+        return daily_db.day_fingerprint(log_dir, date_str)
+
+    import daily_archive
+    parts = []
+    members = daily_archive.load_index(log_dir, date_str[:7])['days'].get(date_str)
+    if members:
+        parts.append(sorted(m[2] for kind in members.values() for m in kind))
+    for ext in DAY_EXTENSIONS:
+        try:
+            stat = os.stat(day_path(log_dir, date_str, ext))
+        except FileNotFoundError:
+            continue
+        parts.append([ext, stat.st_size, stat.st_mtime_ns])
+    return parts
+
+
+def _previous(date_str):
+    """전날"""
+    return (date.fromisoformat(date_str) - timedelta(days=1)).isoformat()
+
+
+def _carry_out(log_dir, date_str, backend, params, cache):
+    """날짜 하나가 다음 날로 넘기는 carry (캐시가 맞으면 재사용)
+    carry는 그날 기록만으로 정해지므로 (idle < 하루) 전날의 전날까지 거슬러 갈 필요 없음"""
+    entry = cache['days'].get(date_str)
+    fingerprint = source_fingerprint(log_dir, date_str, backend)
+    if entry and entry['source'] == fingerprint:
+        return entry['carry_out']
+    if not fingerprint:
+        return {}
+    return compute_day(iter_day_records(log_dir, date_str, backend), date_str, {}, params)[1]
+
+
+def carry_into(log_dir, date_str, backend='files', config=None):
+    """date_str로 이어지는 전날의 세션 carry (기록을 직접 모아 compute_day를 부를 때 사용)"""
+    previous = _previous(date_str)
+    params = get_params(config)
+    return _carry_out(log_dir, previous, backend, params, _load_cache(log_dir, previous[:7], params))
+
+
+def load_activity(log_dir, dates, backend='files', config=None):
+    """날짜들의 활동 결과 {날짜: 결과} (기록이 그대로이고 전날에서 넘어온 carry도 같으면 캐시 재사용)"""
+    params = get_params(config)
+    caches = {}
+    dirty = set()
+    carries = {}
+    results = {}
+
+    def cache_for(date_str):
+        month = date_str[:7]
+        if month not in caches:
+            caches[month] = _load_cache(log_dir, month, params)
+        return caches[month]
+
+    def carry_of(date_str):
+        if date_str not in carries:
+            carries[date_str] = _carry_out(log_dir, date_str, backend, params, cache_for(date_str))
+        return carries[date_str]
+
+    for date_str in sorted(dates):
+        carry_in = carry_of(_previous(date_str))
+        fingerprint = source_fingerprint(log_dir, date_str, backend)
+        cache = cache_for(date_str)
+        entry = cache['days'].get(date_str)
+
+        if not (entry and entry['source'] == fingerprint and entry['carry_in'] == carry_in):
+            result, carry_out = compute_day(iter_day_records(log_dir, date_str, backend), date_str, carry_in, params)
+            entry = cache['days'][date_str] = {
+                "source": fingerprint, "carry_in": carry_in, "carry_out": carry_out, "result": result
+            }
+            dirty.add(date_str[:7])
+
+        carries[date_str] = entry['carry_out']
+        results[date_str] = entry['result']
+
+    for month in dirty:
+        try:
+            atomic_write_text(_cache_path(log_dir, month), json.dumps(caches[month], ensure_ascii=False))
+        except OSError:
+            pass
+    return results
+
+
+def summarize_activity(results):
+    """날짜별 결과를 기간 합계로 (전체/프로젝트별/주별(월요일 날짜), 초 단위)"""
+    summary = {"active_seconds": 0, "sessions": 0, "projects": {}, "weeks": {}}
+    for date_str, result in sorted(results.items()):
+        summary['active_seconds'] += result['active_seconds']
+        summary['sessions'] += result['sessions']
+        week = summary['weeks'].setdefault(week_start(date_str), {"active_seconds": 0, "projects": {}})
+        week['active_seconds'] += result['active_seconds']
+        for name, stats in result['projects'].items():
+            total = summary['projects'].setdefault(name, {"active_seconds": 0, "sessions": 0})
+            total['active_seconds'] += stats['active_seconds']
+            total['sessions'] += stats['sessions']
+            week['projects'][name] = week['projects'].get(name, 0) + stats['active_seconds']
+    return summary
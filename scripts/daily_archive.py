@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 지난달 로그 압축 보관
+끝난 달의 날짜별 파일(YYYY-MM-DD.md/.jsonl 또는 YYYY/MM/DD.*)을 {log_path}/archive/YYYY-MM.gz 하나로 묶고
+날짜별 위치를 YYYY-MM.index.json에 기록 (파일마다 gzip 멤버 하나라서 해당 날짜만 바로 읽음)
+읽는 쪽(iter_day_records, list_log_dates, load_day_projects)은 보관된 날짜도 그대로 읽음
+config.json의 "retention": {"archive_after_days": 45, "delete_after_days": 0}으로 보관/삭제 시점 지정
+"""
+import gzip
+import hashlib
+import io
+import json
+import os
+import zlib
+from datetime import date, datetime, timedelta
+
+from daily_store import (CACHE_DIRNAME, atomic_write_text, is_sharded, iter_journal_lines, iter_markdown_records,
+                         list_day_files, remove_month_dir)
+
+ARCHIVE_DIRNAME = 'archive'
+INDEX_VERSION = 1
+
+# 보관 파일에 넣는 원본 종류 (읽는 순서: 기존 마크다운 → 저널)
+KINDS = ('md', 'jsonl')
+
+ARCHIVE_AFTER_DAYS = 45
+DELETE_AFTER_DAYS = 0
+
+# 월별 인덱스 (인덱스 파일 mtime이 같으면 재사용)
+_indexes = {}
+
+
+def get_archive_dir(log_dir):
+    """보관 디렉토리 경로"""
+    return os.path.join(log_dir, ARCHIVE_DIRNAME)
+
+
+def archive_path(log_dir, month):
+    """월별 보관 파일 경로"""
+    return os.path.join(get_archive_dir(log_dir), f'{month}.gz')
+
+
+def index_path(log_dir, month):
+    """월별 인덱스 경로"""
+    return os.path.join(get_archive_dir(log_dir), f'{month}.index.json')
+
+
+def load_index(log_dir, month):
+    """월별 인덱스 {"days": {날짜: {"md": [[offset, length, sha1], ...], "jsonl": [...]}}} (없으면 빈 인덱스)"""
+    path = index_path(log_dir, month)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return {"version": INDEX_VERSION, "days": {}}
+
+    cached = _indexes.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != INDEX_VERSION:
+            raise ValueError(path)
+    except ValueError:
+        index = {"version": INDEX_VERSION, "days": {}}
+    _indexes[path] = (mtime, index)
+    return index
+
+
+def list_archived_months(log_dir):
+    """보관된 달 목록"""
+    try:
+        names = os.listdir(get_archive_dir(log_dir))
+    except FileNotFoundError:
+        return []
+    return sorted(name[:-len('.index.json')] for name in names if name.endswith('.index.json'))
+
+
+def list_archived_dates(log_dir):
+    """보관된 날짜 집합"""
+    dates = set()
+    for month in list_archived_months(log_dir):
+        dates.update(load_index(log_dir, month)['days'])
+    return dates
+
+
+def read_archived(log_dir, date_str, kind):
+    """보관된 날짜의 원본 내용 (해당 멤버 위치로 바로 이동해서 압축 해제, 없으면 None)"""
+    month = date_str[:7]
+    members = load_index(log_dir, month)['days'].get(date_str, {}).get(kind)
+    if not members:
+        return None
+
+    chunks = []
+    with open(archive_path(log_dir, month), 'rb') as f:
+        for offset, length, _ in members:
+            f.seek(offset)
+            chunks.append(zlib.decompress(f.read(length), 16 + zlib.MAX_WBITS))
+    return b''.join(chunks).decode('utf-8')
+
+
+def iter_archived_records(log_dir, date_str):
+    """보관된 날짜의 기록을 하나씩 반환 (보관되지 않았으면 없음)"""
+    if not os.path.exists(index_path(log_dir, date_str[:7])):
+        return
+
+    text = read_archived(log_dir, date_str, 'md')
+    if text:
+        yield from iter_markdown_records(io.StringIO(text))
+    text = read_archived(log_dir, date_str, 'jsonl')
+    if text:
+        yield from iter_journal_lines(io.StringIO(text))
+
+
+def get_policy(config=None):
+    """보관/삭제 기준 일수 (달이 끝난 뒤 지난 일수, 0이면 하지 않음)"""
+    retention = (config or {}).get('retention', {})
+    return {
+        "archive_after_days": int(retention.get('archive_after_days', ARCHIVE_AFTER_DAYS)),
+        "delete_after_days": int(retention.get('delete_after_days', DELETE_AFTER_DAYS))
+    }
+
+
+def _month_end(month):
+    """달의 마지막 날"""
+    year, mon = map(int, month.split('-'))
+    first_next = date(year + mon // 12, mon % 12 + 1, 1)
+    return first_next - timedelta(days=1)
+
+
+def _remove_day_cache(log_dir, date_str):
+    """파싱 캐시 삭제 (보관/삭제된 날짜는 원본 파일 기준 캐시가 필요 없음)"""
+    try:
+        os.remove(os.path.join(log_dir, CACHE_DIRNAME, f'{date_str}.json'))
+    except FileNotFoundError:
+        pass
+
+
+def archive_month(log_dir, month, days):
+    """달 하나의 원본 파일을 보관 파일 끝에 멤버로 추가하고 인덱스 갱신 후 원본 삭제. 결과 반환
+    인덱스를 쓰기 전에 중단되면 보관 파일 끝의 멤버는 무시되고 원본이 남아 다음에 다시 보관됨
+    인덱스를 쓴 뒤 원본 삭제 전에 중단되면 다음 실행에서 같은 내용(sha1)을 확인하고 원본만 삭제"""
+    os.makedirs(get_archive_dir(log_dir), exist_ok=True)
+    index = load_index(log_dir, month)
+    index = {"version": INDEX_VERSION, "days": {d: {k: list(v) for k, v in e.items()} for d, e in index['days'].items()}}
+    path = archive_path(log_dir, month)
+    stored_bytes = 0
+    source_bytes = 0
+    done = []
+
+    with open(path, 'ab') as f:
+        offset = f.tell()
+        for date_str in sorted(days):
+            entry = index['days'].setdefault(date_str, {})
+            for kind in KINDS:
+                source = days[date_str].get(kind)
+                if not source:
+                    continue
+                with open(source, 'rb') as src:
+                    data = src.read()
+                digest = hashlib.sha1(data).hexdigest()
+                source_bytes += len(data)
+                done.append(source)
+                if any(member[2] == digest for member in entry.get(kind, [])):
+                    continue
+                member = gzip.compress(data, compresslevel=9, mtime=0)
+                f.write(member)
+                entry.setdefault(kind, []).append([offset, len(member), digest])
+                offset += len(member)
+                stored_bytes += len(member)
+        f.flush()
+        os.fsync(f.fileno())
+
+    atomic_write_text(index_path(log_dir, month), json.dumps(index, ensure_ascii=False))
+    for source in done:
+        os.remove(source)
+    for date_str in days:
+        _remove_day_cache(log_dir, date_str)
+    if is_sharded(log_dir):
+        remove_month_dir(log_dir, month)
+
+    return {"days": len(days), "files": len(done), "source_bytes": source_bytes, "stored_bytes": stored_bytes}
+
+
+def prune_month(log_dir, month, days):
+    """달 하나의 보관 파일과 원본 파일 삭제. 삭제한 날짜 수 반환"""
+    removed = set(load_index(log_dir, month)['days'])
+    for path in (archive_path(log_dir, month), index_path(log_dir, month)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    for date_str, files in days.items():
+        for source in files.values():
+            os.remove(source)
+        removed.add(date_str)
+    for date_str in removed:
+        _remove_day_cache(log_dir, date_str)
+    if is_sharded(log_dir):
+        remove_month_dir(log_dir, month)
+    return len(removed)
+
+
+def compact(log_dir, config=None, today=None, dry_run=False, archive_all=False):
+    """보관 기준에 따라 끝난 달은 압축 보관, 삭제 기준이 지난 달은 삭제 (archive_all이면 끝난 달은 모두 보관)"""
+    policy = get_policy(config)
+    today = today or datetime.now().date()
+    result = {"success": True, "policy": policy, "archived": {}, "pruned": {}, "dry_run": dry_run}
+    if not os.path.isdir(log_dir):
+        return result
+
+    day_files = list_day_files(log_dir)
+    months = sorted(set(day_files) | set(list_archived_months(log_dir)))
+
+    for month in months:
+        # 이번 달은 아직 기록이 추가되므로 대상 아님
+        age = (today - _month_end(month)).days
+        if age <= 0:
+            continue
+        days = day_files.get(month, {})
+
+        if policy['delete_after_days'] and age > policy['delete_after_days']:
+            result['pruned'][month] = len(set(days) | set(load_index(log_dir, month)['days']))
+            if not dry_run:
+                prune_month(log_dir, month, days)
+        elif days and (archive_all or policy['archive_after_days'] and age > policy['archive_after_days']):
+            if dry_run:
+                result['archived'][month] = {"days": len(days)}
+            else:
+                result['archived'][month] = archive_month(log_dir, month, days)
+
+    return result
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 작업 분류기
+카테고리별 키워드를 정규식 하나로 묶어 작업 내용을 한 번만 훑어서 분류 (대소문자 무시)
+config.json의 "settings": {"categories": [{"name": ..., "keywords": [...]}, ...]}로 바꿀 수 있고
+앞에 있는 카테고리가 우선
+"""
+import re
+
+DEFAULT_CATEGORIES = [
+    {"name": "설정", "keywords": ["설정", "설치", "setup", "config", "install"]},
+    {"name": "Notion 연동", "keywords": ["노션", "notion", "mcp", "api", "연동", "동기화", "sync"]},
+    {"name": "테스트", "keywords": ["테스트", "test", "확인", "검증"]},
+    {"name": "문서 작성", "keywords": ["문서", "readme", "docs", "매뉴얼", "manual"]},
+    {"name": "수정/개선", "keywords": ["수정", "변경", "개선", "fix", "update", "버그"]},
+    {"name": "기능 추가", "keywords": ["추가", "생성", "만들", "add", "create", "new"]},
+    {"name": "삭제", "keywords": ["삭제", "제거", "delete", "remove"]}
+]
+
+# 분류 기준별 컴파일 결과
+_compiled = {}
+
+
+def compile_classifier(categories=None):
+    """카테고리 목록을 분류기로 컴파일 (키워드 → 우선순위, 전체 키워드 정규식)"""
+    categories = categories or DEFAULT_CATEGORIES
+    names = []
+    priority = {}
+
+    for category in categories:
+        index = len(names)
+        names.append(category['name'])
+        for keyword in category.get('keywords', []):
+            keyword = keyword.lower()
+            if keyword and keyword not in priority:
+                priority[keyword] = index
+
+    # 다른 키워드를 포함하는 키워드가 찾아지면 포함된 키워드도 있는 것이므로 더 높은 우선순위를 물려받음
+    for keyword in priority:
+        priority[keyword] = min(p for k, p in priority.items() if k in keyword)
+
+    if not priority:
+        return {"names": names, "priority": priority, "pattern": None}
+
+    # 긴 키워드 먼저 (같은 위치에서 시작하면 긴 쪽이 잡힘)
+    alternation = '|'.join(re.escape(k) for k in sorted(priority, key=len, reverse=True))
+    return {"names": names, "priority": priority, "pattern": re.compile(alternation)}
+
+
+def load_classifier(config=None):
+    """설정의 분류 기준으로 분류기 반환 (형식이 잘못됐으면 기본 분류)"""
+    categories = (config or {}).get('settings', {}).get('categories') or DEFAULT_CATEGORIES
+    try:
+        key = tuple((c['name'], tuple(c.get('keywords', []))) for c in categories)
+    except (KeyError, TypeError, AttributeError):
+        categories = DEFAULT_CATEGORIES
+        key = tuple((c['name'], tuple(c['keywords'])) for c in categories)
+
+    if key not in _compiled:
+        _compiled[key] = compile_classifier(categories)
+    return _compiled[key]
+
+
+def classify(content, classifier=None):
+    """작업 내용의 카테고리 (해당 없으면 None)"""
+    classifier = classifier or load_classifier()
+    if classifier['pattern'] is None:
+        return None
+
+    text = content.lower()
+    search = classifier['pattern'].search
+    priority = classifier['priority']
+    best = None
+
+    # 매칭 다음 글자부터 다시 찾아 서로 겹친 키워드도 놓치지 않음
+    match = search(text)
+    while match:
+        rank = priority[match.group()]
+        if best is None or rank < best:
+            best = rank
+            if best == 0:
+                break
+        match = search(text, match.start() + 1)
+
+    return None if best is None else classifier['names'][best]
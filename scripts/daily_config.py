@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 설정 파일 공용 로더 (모든 스크립트 공용)
+~/.claude/daily-work-tracker/config.json을 파일이 바뀌었을 때만 다시 읽고(mtime 확인),
+예전 키(paths.log, paths.summary, notion)를 현재 형식(storage.*, notion_mcp)으로 맞춰서 반환
+저장은 임시 파일에 쓴 뒤 rename으로 교체해 Hook이 반쯤 쓰인 파일을 읽지 않음
+"""
+import copy
+import json
+import os
+
+from daily_store import atomic_write_text
+
+CONFIG_PATH = '~/.claude/daily-work-tracker/config.json'
+DEFAULT_LOG_PATH = '~/.claude/daily-work'
+DEFAULT_SUMMARY_PATH = '~/.claude/daily-summaries'
+
+# 마지막으로 읽은 설정 (파일 경로, mtime, 크기, inode가 같으면 재사용)
+_cache = {"key": None, "raw": None, "config": None}
+
+
+def get_config_path():
+    """설정 파일 경로 반환"""
+    return os.path.expanduser(CONFIG_PATH)
+
+
+def canonicalize(raw):
+    """저장할 때도 유지되는 형식 변환 (paths.* → storage.*)"""
+    config = copy.deepcopy(raw)
+    paths = config.pop('paths', None)
+    if isinstance(paths, dict):
+        storage = config.setdefault('storage', {})
+        if 'log' in paths:
+            storage.setdefault('log_path', paths['log'])
+        if 'summary' in paths:
+            storage.setdefault('summary_path', paths['summary'])
+    return config
+
+
+def normalize(raw):
+    """읽는 쪽에서 쓰는 형식으로 변환 (기본값 채움, notion_mcp/notion 서로 보완)"""
+    config = canonicalize(raw)
+
+    storage = config.setdefault('storage', {})
+    storage.setdefault('log_path', DEFAULT_LOG_PATH)
+    storage.setdefault('summary_path', DEFAULT_SUMMARY_PATH)
+    storage.setdefault('backend', 'files')
+
+    # 예전 설정은 MCP 설정도 notion 키에 있었음
+    legacy = config.get('notion', {})
+    mcp = config.setdefault('notion_mcp', {
+        "enabled": legacy.get('enabled', False),
+        "page_id": legacy.get('page_id', ''),
+        "mcp_server_name": legacy.get('mcp_server_name', 'notion')
+    })
+
+    # API 동기화(sync-notion.py)는 notion.enabled로 따로 켜야 하고, 페이지만 지정하지 않으면 MCP와 같은 페이지 사용
+    notion = config.setdefault('notion', {})
+    notion.setdefault('page_id', mcp.get('page_id', ''))
+    return config
+
+
+def _read():
+    """설정 파일을 바뀌었을 때만 다시 읽음 (없으면 None, 깨졌으면 ValueError)"""
+    path = get_config_path()
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        _cache.update(key=None, raw=None, config=None)
+        return None
+
+    key = (path, stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    if _cache['key'] != key:
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+        if not isinstance(raw, dict):
+            raise ValueError('설정 파일 형식이 잘못되었습니다.')
+        _cache.update(key=key, raw=raw, config=normalize(raw))
+    return _cache
+
+
+def load_config():
+    """정규화된 설정 (없거나 읽을 수 없으면 None)
+    섹션 단위로 복사해서 반환하므로 호출한 쪽에서 키를 바꿔도 캐시에는 영향 없음"""
+    try:
+        cached = _read()
+    except (OSError, ValueError):
+        return None
+    if not cached:
+        return None
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in cached['config'].items()}
+
+
+def load_raw_config():
+    """저장된 그대로의 설정 (수정 후 save_config용, 없으면 None, 깨졌으면 ValueError)"""
+    cached = _read()
+    return canonicalize(cached['raw']) if cached else None
+
+
+def save_config(config):
+    """설정 파일을 원자적으로 교체 (예전 키는 현재 형식으로 바꿔서 저장)"""
+    atomic_write_text(get_config_path(), json.dumps(canonicalize(config), indent=2, ensure_ascii=False))
+
+
+def get_log_dir(config=None):
+    """로그 저장 경로 (~ 확장)"""
+    config = config if config is not None else (load_config() or normalize({}))
+    return os.path.expanduser(config.get('storage', {}).get('log_path', DEFAULT_LOG_PATH))
+
+
+def get_summary_dir(config=None):
+    """요약 저장 경로 (~ 확장)"""
+    config = config if config is not None else (load_config() or normalize({}))
+    return os.path.expanduser(config.get('storage', {}).get('summary_path', DEFAULT_SUMMARY_PATH))
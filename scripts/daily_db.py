@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - SQLite 저장소 (선택)
+config.json의 "storage": {"backend": "sqlite"}일 때 사용
+프롬프트/프로젝트/경로/시간(밀리초 단위 ISO 시각 ts, session_id 포함)과 동기화 상태를 {log_path}/daily-work.db에 저장하고
+날짜/프로젝트 인덱스로 기간 조회 (마크다운은 읽을 때 렌더링)
+"""
+import os
+import sqlite3
+from collections import Counter
+from datetime import datetime
+
+DB_FILENAME = 'daily-work.db'
+
+# Hook이 오래 기다리지 않도록 잠금 대기 시간 제한 (ms)
+BUSY_TIMEOUT_MS = 500
+
+# PRAGMA user_version에 기록하는 스키마 버전 (1: 처음 스키마, 2: ts/session 컬럼)
+SCHEMA_VERSION = 2
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS prompts (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    project_id INTEGER NOT NULL REFERENCES projects(id),
+    path TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    ts TEXT,
+    session TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_prompts_date ON prompts(date);
+CREATE INDEX IF NOT EXISTS idx_prompts_project_date ON prompts(project_id, date);
+CREATE TABLE IF NOT EXISTS synced_dates (
+    date TEXT PRIMARY KEY,
+    synced_at TEXT NOT NULL
+);
+'''
+
+
+def is_enabled(config):
+    """SQLite 저장소 사용 여부"""
+    return (config or {}).get('storage', {}).get('backend') == 'sqlite'
+
+
+def get_db_path(log_dir):
+    """DB 파일 경로 반환"""
+    return os.path.join(log_dir, DB_FILENAME)
+
+
+def connect(log_dir):
+    """DB 연결 (스키마 생성/변경은 user_version이 낮을 때만 해서 Hook마다 반복하지 않음)"""
+    os.makedirs(log_dir, exist_ok=True)
+    conn = sqlite3.connect(get_db_path(log_dir), timeout=BUSY_TIMEOUT_MS / 1000)
+    conn.execute('PRAGMA synchronous = NORMAL')
+    if conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+        _initialize(conn)
+    return conn
+
+
+def _initialize(conn):
+    """스키마 생성과 예전 DB 변경 후 버전 기록 (WAL 모드는 DB 파일에 남으므로 여기서 한 번만)"""
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.executescript(SCHEMA)
+    _migrate(conn)
+    conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+
+def _migrate(conn):
+    """예전 DB에 없는 컬럼 추가 (ts: 밀리초 단위 ISO 시각, session: Hook의 session_id)"""
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(prompts)')}
+    for column in ('ts', 'session'):
+        if column not in columns:
+            try:
+                conn.execute(f'ALTER TABLE prompts ADD COLUMN {column} TEXT')
+            except sqlite3.OperationalError:
+                # 다른 프로세스가 먼저 추가함
+                pass
+
+
+def _project_id(conn, name):
+    """프로젝트 ID 조회 (없으면 생성)"""
+    conn.execute('INSERT OR IGNORE INTO projects (name) VALUES (?)', (name,))
+    return conn.execute('SELECT id FROM projects WHERE name = ?', (name,)).fetchone()[0]
+
+
+def _insert(conn, date_str, record):
+    """기록 한 건 INSERT"""
+    conn.execute(
+        'INSERT INTO prompts (date, time, project_id, path, prompt, ts, session) VALUES (?, ?, ?, ?, ?, ?, ?)',
+        (date_str, record['time'], _project_id(conn, record['project']), record.get('path', ''), record['prompt'],
+         record.get('ts'), record.get('session'))
+    )
+
+
+def insert_record(log_dir, date_str, record):
+    """프롬프트 기록 한 건 추가"""
+    conn = connect(log_dir)
+    try:
+        with conn:
+            _insert(conn, date_str, record)
+    finally:
+        conn.close()
+
+
+def iter_records(log_dir, start_date, end_date=None):
+    """기간(start_date ~ end_date, 포함) 기록을 날짜/입력 순서로 반환"""
+    if not os.path.exists(get_db_path(log_dir)):
+        return
+    conn = connect(log_dir)
+    try:
+        rows = conn.execute(
+            'SELECT p.date, p.time, j.name, p.path, p.prompt, p.ts, p.session FROM prompts p '
+            'JOIN projects j ON j.id = p.project_id '
+            'WHERE p.date BETWEEN ? AND ? ORDER BY p.date, p.id',
+            (start_date, end_date or start_date)
+        )
+        for date_str, time_str, project, path, prompt, ts, session in rows:
+            record = {'date': date_str, 'time': time_str, 'project': project, 'path': path, 'prompt': prompt}
+            if ts:
+                record['ts'] = ts
+            if session:
+                record['session'] = session
+            yield record
+    finally:
+        conn.close()
+
+
+def day_fingerprint(log_dir, date_str):
+    """날짜별 기록이 바뀌었는지 확인할 값 [행 수, 마지막 ID] (기록이 없으면 빈 목록)"""
+    if not os.path.exists(get_db_path(log_dir)):
+        return []
+    conn = connect(log_dir)
+    try:
+        count, last_id = conn.execute('SELECT COUNT(*), MAX(id) FROM prompts WHERE date = ?', (date_str,)).fetchone()
+        return [count, last_id] if count else []
+    finally:
+        conn.close()
+
+
+def list_dates(log_dir):
+    """기록이 있는 날짜 목록"""
+    if not os.path.exists(get_db_path(log_dir)):
+        return []
+    conn = connect(log_dir)
+    try:
+        return [row[0] for row in conn.execute('SELECT DISTINCT date FROM prompts ORDER BY date')]
+    finally:
+        conn.close()
+
+
+def mark_synced(log_dir, date_str):
+    """동기화 완료 기록"""
+    conn = connect(log_dir)
+    try:
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO synced_dates (date, synced_at) VALUES (?, ?)',
+                (date_str, datetime.now().isoformat(timespec='seconds'))
+            )
+    finally:
+        conn.close()
+
+
+def get_synced_dates(log_dir):
+    """동기화된 날짜 목록"""
+    if not os.path.exists(get_db_path(log_dir)):
+        return []
+    conn = connect(log_dir)
+    try:
+        return [row[0] for row in conn.execute('SELECT date FROM synced_dates ORDER BY date')]
+    finally:
+        conn.close()
+
+
+def get_unsynced_dates(log_dir):
+    """기록은 있지만 동기화되지 않은 날짜 목록"""
+    if not os.path.exists(get_db_path(log_dir)):
+        return []
+    conn = connect(log_dir)
+    try:
+        return [row[0] for row in conn.execute(
+            'SELECT DISTINCT date FROM prompts WHERE date NOT IN (SELECT date FROM synced_dates) ORDER BY date'
+        )]
+    finally:
+        conn.close()
+
+
+def record_key(record):
+    """저장소를 옮길 때 같은 기록인지 비교하는 값"""
+    return (record.get('time'), record.get('project'), record.get('prompt'), record.get('ts'))
+
+
+def missing_records(records, existing):
+    """records 중 existing에 없는 것만 (같은 기록이 여러 번이면 개수만큼 비교)"""
+    remaining = Counter(record_key(record) for record in existing)
+    for record in records:
+        key = record_key(record)
+        if remaining[key]:
+            remaining[key] -= 1
+        else:
+            yield record
+
+
+def import_records(log_dir, date_str, records, synced=False):
+    """다른 저장소의 하루치 기록 가져오기 (DB에 이미 있는 기록은 건너뜀)"""
+    existing = list(iter_records(log_dir, date_str))
+    conn = connect(log_dir)
+    try:
+        with conn:
+            count = 0
+            for record in missing_records(records, existing):
+                _insert(conn, date_str, record)
+                count += 1
+            if synced:
+                conn.execute(
+                    'INSERT OR IGNORE INTO synced_dates (date, synced_at) VALUES (?, ?)',
+                    (date_str, datetime.now().isoformat(timespec='seconds'))
+                )
+            return count
+    finally:
+        conn.close()
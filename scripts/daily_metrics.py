@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - Hook 성능 지표 (선택)
+config.json의 "metrics": {"enabled": true}일 때 Hook 단계별 소요 시간과 에러를 기록
+최근 7일치 날짜별 히스토그램만 유지해 파일 크기가 일정
+"""
+import json
+import os
+from datetime import datetime, timedelta
+
+from daily_store import atomic_write_text, file_lock
+
+METRICS_PATH = '~/.claude/daily-work-tracker/metrics.json'
+
+# 히스토그램 구간 상한 (ms), 마지막 구간은 그 이상 전부
+BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+PHASES = ['total', 'config', 'project', 'format', 'write', 'rollup']
+
+RETENTION_DAYS = 7
+
+# 실패율 계산에 쓰는 최근 실행 수
+RECENT_LIMIT = 200
+
+
+def get_metrics_path():
+    """지표 파일 경로 반환"""
+    return os.path.expanduser(METRICS_PATH)
+
+
+def is_enabled(config):
+    """지표 수집 활성화 여부"""
+    return bool(config.get('metrics', {}).get('enabled', False))
+
+
+def load_metrics():
+    """지표 파일 로드 (없거나 깨졌으면 빈 구조)"""
+    path = get_metrics_path()
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {"days": {}, "recent": ""}
+
+
+def bucket_index(value_ms):
+    """값이 들어갈 히스토그램 구간 번호"""
+    for i, bound in enumerate(BUCKETS_MS):
+        if value_ms <= bound:
+            return i
+    return len(BUCKETS_MS)
+
+
+def record_invocation(timings_ms, error=None, config=None):
+    """Hook 실행 한 번의 단계별 시간(ms)과 에러를 기록"""
+    path = get_metrics_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        with file_lock(fd) as locked:
+            if not locked:
+                # 지표 때문에 Hook을 기다리게 하지 않음
+                return
+            metrics = load_metrics()
+            today = datetime.now().strftime('%Y-%m-%d')
+            day = metrics['days'].setdefault(today, {"phases": {}, "errors": {}, "invocations": 0})
+
+            day['invocations'] += 1
+            for phase, value in timings_ms.items():
+                hist = day['phases'].setdefault(phase, {"buckets": [0] * (len(BUCKETS_MS) + 1), "sum_ms": 0.0})
+                hist['buckets'][bucket_index(value)] += 1
+                hist['sum_ms'] = round(hist['sum_ms'] + value, 3)
+
+            if error:
+                day['errors'][error] = day['errors'].get(error, 0) + 1
+
+            metrics['recent'] = (metrics.get('recent', '') + ('0' if error else '1'))[-RECENT_LIMIT:]
+
+            # 오래된 날짜 정리
+            cutoff = (datetime.now() - timedelta(days=RETENTION_DAYS - 1)).strftime('%Y-%m-%d')
+            metrics['days'] = {d: v for d, v in metrics['days'].items() if d >= cutoff}
+
+            atomic_write_text(path, json.dumps(metrics, ensure_ascii=False))
+
+            textfile = (config or {}).get('metrics', {}).get('textfile')
+            if textfile:
+                atomic_write_text(os.path.expanduser(textfile), export_prometheus(metrics))
+    finally:
+        os.close(fd)
+
+
+def merge_days(metrics):
+    """보관 중인 날짜별 히스토그램 합치기"""
+    phases = {}
+    errors = {}
+    invocations = 0
+
+    for day in metrics.get('days', {}).values():
+        invocations += day.get('invocations', 0)
+        for phase, hist in day.get('phases', {}).items():
+            merged = phases.setdefault(phase, {"buckets": [0] * (len(BUCKETS_MS) + 1), "sum_ms": 0.0})
+            merged['buckets'] = [a + b for a, b in zip(merged['buckets'], hist['buckets'])]
+            merged['sum_ms'] += hist['sum_ms']
+        for name, count in day.get('errors', {}).items():
+            errors[name] = errors.get(name, 0) + count
+
+    return phases, errors, invocations
+
+
+def histogram_percentile(buckets, pct):
+    """히스토그램에서 백분위 값 (구간 상한, ms)"""
+    total = sum(buckets)
+    if not total:
+        return None
+    rank = pct / 100 * total
+    seen = 0
+    for i, count in enumerate(buckets):
+        seen += count
+        if seen >= rank:
+            return BUCKETS_MS[i] if i < len(BUCKETS_MS) else f'>{BUCKETS_MS[-1]}'
+    return f'>{BUCKETS_MS[-1]}'
+
+
+def summarize_metrics():
+    """--status에 표시할 지표 요약 (기록이 없으면 None)"""
+    metrics = load_metrics()
+    phases, errors, invocations = merge_days(metrics)
+    if not invocations:
+        return None
+
+    recent = metrics.get('recent', '')
+    latency = {}
+    for phase in PHASES:
+        hist = phases.get(phase)
+        if not hist:
+            continue
+        latency[phase] = {
+            "p50_ms": histogram_percentile(hist['buckets'], 50),
+            "p95_ms": histogram_percentile(hist['buckets'], 95),
+            "p99_ms": histogram_percentile(hist['buckets'], 99)
+        }
+
+    return {
+        "window_days": RETENTION_DAYS,
+        "invocations": invocations,
+        "errors": errors,
+        "recent_failure_rate": round(recent.count('0') / len(recent), 4) if recent else 0.0,
+        "latency": latency
+    }
+
+
+def export_prometheus(metrics=None):
+    """Prometheus textfile collector 형식으로 변환"""
+    if metrics is None:
+        metrics = load_metrics()
+    phases, errors, invocations = merge_days(metrics)
+
+    lines = [
+        '# HELP daily_work_hook_duration_seconds Hook phase duration over the last 7 days.',
+        '# TYPE daily_work_hook_duration_seconds histogram'
+    ]
+    for phase in PHASES:
+        hist = phases.get(phase)
+        if not hist:
+            continue
+        cumulative = 0
+        for i, count in enumerate(hist['buckets']):
+            cumulative += count
+            le = f'{BUCKETS_MS[i] / 1000:g}' if i < len(BUCKETS_MS) else '+Inf'
+            lines.append(f'daily_work_hook_duration_seconds_bucket{{phase="{phase}",le="{le}"}} {cumulative}')
+        lines.append(f'daily_work_hook_duration_seconds_sum{{phase="{phase}"}} {hist["sum_ms"] / 1000:g}')
+        lines.append(f'daily_work_hook_duration_seconds_count{{phase="{phase}"}} {cumulative}')
+
+    lines.append('# HELP daily_work_hook_invocations_total Hook invocations.')
+    lines.append('# TYPE daily_work_hook_invocations_total counter')
+    lines.append(f'daily_work_hook_invocations_total {invocations}')
+
+    lines.append('# HELP daily_work_hook_errors_total Hook failures by exception type.')
+    lines.append('# TYPE daily_work_hook_errors_total counter')
+    for name, count in sorted(errors.items()):
+        lines.append(f'daily_work_hook_errors_total{{type="{name}"}} {count}')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - Notion API 업로드
+블록 목록을 Notion 요청 제한에 맞게 나눠서 순서대로 추가
+- 요청당 children 100개 (하위 블록 포함 1000개), 본문 500KB 이하
+- rich_text 하나당 2000자 이하 (긴 텍스트는 같은 서식으로 나눔), 블록당 rich_text 100개 이하 (넘치면 같은 종류의 블록으로 이어서)
+- 블록마다 한 번만 JSON 인코딩하고 요청 본문은 조각째 전송 (전체 문자열을 만들지 않음)
+NotionClient는 연결 하나를 계속 재사용하고 초당 요청 수를 제한하며
+429와 보내기 전에 끊긴 요청은 Retry-After(없으면 지수 백오프 + 지터)만큼 기다렸다가 다시 시도
+(블록 추가 PATCH는 두 번 반영되면 중복되므로 보낸 뒤의 실패/5xx는 재시도하지 않고 에러로 반환)
+"""
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from daily_store import atomic_write_text
+
+API_BASE = 'https://api.notion.com/v1'
+NOTION_VERSION = '2022-06-28'
+
+# Notion 요청 제한 (평균 초당 3회)
+RATE_PER_SEC = 3
+BURST = 3
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# 다시 보내도 결과가 같은 메서드 (이 외에는 429나 보내기 전 실패만 재시도)
+IDEMPOTENT_METHODS = {'GET', 'HEAD'}
+
+LATENCY_LOG_PATH = '~/.claude/daily-work-tracker/notion-requests.jsonl'
+LATENCY_LOG_MAX_BYTES = 256 * 1024
+
+MAX_CHILDREN = 100
+MAX_BLOCKS_PER_REQUEST = 1000
+MAX_TEXT_LENGTH = 2000
+MAX_RICH_TEXT = 100
+MAX_PAYLOAD_BYTES = 500 * 1000
+
+PAYLOAD_HEAD = b'{"children":['
+PAYLOAD_TAIL = b']}'
+
+# "after" 파라미터 등 꼬리 부분에 남겨두는 여유
+PAYLOAD_RESERVE = 128
+
+# 본문 조각을 이 크기까지 모아서 전송 (작은 write를 줄임)
+SEND_BUFFER_BYTES = 64 * 1024
+
+
+def text_length(text):
+    """Notion 기준 글자 수 (UTF-16 코드 단위, 이모지 등은 2)"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def split_text(text, limit=MAX_TEXT_LENGTH):
+    """limit 이하 조각으로 나누기 (가능하면 줄바꿈/공백에서 자름)"""
+    if len(text) * 2 <= limit or text_length(text) <= limit:
+        return [text]
+
+    parts = []
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + limit)
+        excess = text_length(text[start:end]) - limit
+        while excess > 0:
+            end -= excess
+            excess = text_length(text[start:end]) - limit
+
+        if end < len(text):
+            # 끝부분 10% 안에 줄바꿈/공백이 있으면 거기서 자름
+            boundary = max(text.rfind('\n', start, end), text.rfind(' ', start, end))
+            if boundary > start + (end - start) * 9 // 10:
+                end = boundary + 1
+
+        parts.append(text[start:end])
+        start = end
+    return parts
+
+
+def split_rich_text(rich_text):
+    """긴 text 항목을 같은 서식의 여러 항목으로 나누기 (개수 제한은 split_block에서 처리)"""
+    result = []
+    for item in rich_text:
+        content = item.get('text', {}).get('content') if item.get('type') == 'text' else None
+        if content is None:
+            result.append(item)
+            continue
+        for part in split_text(content):
+            piece = dict(item)
+            piece['text'] = dict(item['text'], content=part)
+            result.append(piece)
+    return result
+
+
+def split_block(block):
+    """rich_text를 나눈 뒤 MAX_RICH_TEXT개를 넘으면 같은 종류의 블록 여러 개로 이어서 나누기
+    (하위 블록은 마지막 블록 아래에 둠)"""
+    body = block.get(block.get('type'))
+    if not isinstance(body, dict) or 'rich_text' not in body:
+        return [block]
+
+    rich_text = split_rich_text(body['rich_text'])
+    pieces = [rich_text[i:i + MAX_RICH_TEXT] for i in range(0, len(rich_text), MAX_RICH_TEXT)] or [[]]
+    blocks = []
+    for i, piece in enumerate(pieces):
+        piece_body = dict(body, rich_text=piece)
+        if i < len(pieces) - 1:
+            piece_body.pop('children', None)
+        blocks.append(dict(block, **{block['type']: piece_body}))
+    return blocks
+
+
+def prepare_block(block):
+    """요청에 넣을 수 있게 하위 블록 정리 (split_block으로 나눈 블록). (블록, 나중에 추가할 하위 블록) 반환"""
+    body = block.get(block.get('type'))
+    if not isinstance(body, dict):
+        return block, []
+
+    prepared = dict(body)
+    overflow = []
+    children = prepared.get('children')
+    if children:
+        children = [piece for child in children for piece in split_block(child)]
+        # 하위 블록도 요청당 개수 제한을 받으므로 넘치는 부분은 블록 생성 후 따로 추가
+        prepared['children'] = [prepare_block(child)[0] for child in children[:MAX_CHILDREN]]
+        overflow = children[MAX_CHILDREN:]
+
+    return dict(block, **{block['type']: prepared}), overflow
+
+
+def plan_batches(blocks):
+    """블록을 요청 단위로 나누기. [[(인코딩된 블록, 넘친 하위 블록, 원래 블록의 마지막 조각인지), ...], ...] 반환"""
+    budget = MAX_PAYLOAD_BYTES - len(PAYLOAD_HEAD) - PAYLOAD_RESERVE
+    batches = []
+    batch = []
+    size = 0
+    count = 0
+
+    for block in blocks:
+        pieces = split_block(block)
+        for index, piece in enumerate(pieces):
+            prepared, overflow = prepare_block(piece)
+            encoded = json.dumps(prepared, ensure_ascii=False).encode('utf-8')
+            cost = len(encoded) + (1 if batch else 0)
+            elements = 1 + len(prepared.get(prepared.get('type'), {}).get('children') or [])
+            if batch and (len(batch) >= MAX_CHILDREN or size + cost > budget or count + elements > MAX_BLOCKS_PER_REQUEST):
+                batches.append(batch)
+                batch = []
+                size = 0
+                count = 0
+                cost = len(encoded)
+            batch.append((encoded, overflow, index == len(pieces) - 1))
+            size += cost
+            count += elements
+
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def iter_payload(encoded_blocks, after=None):
+    """{"children": [...], "after": ...} 본문을 조각으로 반환"""
+    yield PAYLOAD_HEAD
+    for i, encoded in enumerate(encoded_blocks):
+        if i:
+            yield b','
+        yield encoded
+    if after:
+        yield b'],"after":' + json.dumps(after).encode('utf-8') + b'}'
+    else:
+        yield PAYLOAD_TAIL
+
+
+class NotionError(Exception):
+    """재시도해도 실패한 Notion API 응답"""
+
+    def __init__(self, status, body):
+        super().__init__(f"HTTP {status}: {body}" if status else f"연결 실패: {body}")
+        self.status = status
+        self.body = body
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷 (여러 클라이언트/스레드가 공유 가능, rate가 0이면 제한 없음)"""
+
+    def __init__(self, rate=RATE_PER_SEC, burst=BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 쓸 수 있을 때까지 대기"""
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class NotionClient:
+    """keep-alive 연결 하나를 재사용하는 Notion API 클라이언트 (스레드마다 하나씩 사용)"""
+
+    def __init__(self, api_key, api_base=API_BASE, bucket=None, max_retries=MAX_RETRIES, log_path=None):
+        self.api_key = api_key
+        parts = urlsplit(api_base)
+        self.scheme = parts.scheme
+        self.host = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.bucket = bucket or TokenBucket()
+        self.max_retries = max_retries
+        self.log_path = log_path
+        self.conn = None
+        self.log = []
+        self.retries = 0
+
+    def _connection(self):
+        """열려 있는 연결 반환 (없으면 새로 연결)"""
+        if self.conn is None:
+            if self.scheme == 'https':
+                self.conn = http.client.HTTPSConnection(self.host, timeout=30)
+            else:
+                self.conn = http.client.HTTPConnection(self.host, timeout=30)
+        return self.conn
+
+    def _reset(self):
+        """연결 닫기 (다음 요청에서 다시 연결)"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def _delay(self, attempt, retry_after=None):
+        """다시 시도하기 전 대기 시간 (Retry-After 우선, 없으면 지수 백오프 + 지터)"""
+        if retry_after:
+            try:
+                return min(BACKOFF_MAX, float(retry_after))
+            except ValueError:
+                pass
+        backoff = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    def request(self, method, path, body=None):
+        """API 요청 (body는 bytes 또는 bytes 조각 리스트). 응답 JSON 반환, 실패하면 NotionError"""
+        chunks = [body] if isinstance(body, bytes) else (body or [])
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Notion-Version": NOTION_VERSION
+        }
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+            headers["Content-Length"] = str(sum(len(c) for c in chunks))
+
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            started = time.perf_counter()
+            status = None
+            retry_after = None
+            sent = False
+            try:
+                conn = self._connection()
+                # 연결 실패나 본문을 다 보내기 전에 끊긴 요청은 서버가 처리할 수 없으므로 다시 보내도 안전
+                conn.request(method, self.prefix + path, body=iter_send_buffers(chunks) if body is not None else None, headers=headers)
+                sent = True
+                response = conn.getresponse()
+                data = response.read()
+                status = response.status
+                retry_after = response.getheader('Retry-After')
+                if response.getheader('Connection', '').lower() == 'close':
+                    self._reset()
+            except (http.client.HTTPException, OSError) as e:
+                # 끊긴 keep-alive 연결 등은 다시 연결 (보낸 뒤 응답을 못 받았으면 반영됐을 수 있음)
+                self._reset()
+                data = str(e).encode('utf-8')
+
+            self.log.append({
+                "method": method,
+                "path": path,
+                "status": status,
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+                "attempt": attempt
+            })
+
+            if status is not None and status < 400:
+                return json.loads(data or b'{}')
+
+            if method in IDEMPOTENT_METHODS:
+                retry = status is None or status in RETRY_STATUS
+            else:
+                retry = status == 429 or (status is None and not sent)
+            if retry and attempt < self.max_retries:
+                time.sleep(self._delay(attempt, retry_after))
+                attempt += 1
+                self.retries += 1
+                continue
+
+            raise NotionError(status, data.decode('utf-8', 'replace'))
+
+    def stats(self):
+        """요청 수/재시도 수/지연 시간 요약"""
+        latencies = sorted(entry['ms'] for entry in self.log)
+        return {
+            "requests": len(self.log),
+            "retries": self.retries,
+            "p50_ms": latencies[len(latencies) // 2] if latencies else 0,
+            "max_ms": latencies[-1] if latencies else 0
+        }
+
+    def close(self):
+        """연결을 닫고 요청별 지연 시간을 로그 파일에 추가"""
+        self._reset()
+        if not self.log_path or not self.log:
+            return
+        path = os.path.expanduser(self.log_path)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            now = time.strftime('%Y-%m-%dT%H:%M:%S')
+            with open(path, 'a', encoding='utf-8') as f:
+                for entry in self.log:
+                    f.write(json.dumps({"at": now, **entry}, ensure_ascii=False) + '\n')
+            if os.path.getsize(path) > LATENCY_LOG_MAX_BYTES:
+                # 최근 절반만 남김
+                with open(path, 'r', encoding='utf-8') as f:
+                    lines = f.readlines()
+                atomic_write_text(path, ''.join(lines[len(lines) // 2:]))
+        except OSError:
+            pass
+        self.log = []
+
+
+def iter_send_buffers(chunks):
+    """작은 본문 조각을 SEND_BUFFER_BYTES 단위로 모아서 반환"""
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= SEND_BUFFER_BYTES:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def append_children(client, parent_id, encoded_blocks, after=None):
+    """인코딩된 블록을 한 번의 요청으로 추가하고 응답 JSON 반환 (after: 이 블록 바로 뒤에 추가)"""
+    return client.request('PATCH', f'/blocks/{parent_id}/children', list(iter_payload(encoded_blocks, after)))
+
+
+def append_blocks(client, parent_id, blocks, after=None):
+    """블록 목록을 순서대로 나눠서 추가 (after가 있으면 그 블록 뒤에 이어서)
+    만들어진 최상위 블록 ID는 block_ids로 반환 (중간에 실패하면 그때까지의 ID와 에러)
+    rich_text가 많아 여러 블록으로 나눈 블록은 마지막 조각의 ID가 해당 블록의 ID"""
+    stats = {"batches": 0, "blocks_sent": 0, "continuation_blocks": 0}
+    block_ids = []
+
+    def upload(target_id, target_blocks, anchor=None):
+        for batch in plan_batches(target_blocks):
+            response = append_children(client, target_id, [encoded for encoded, _, _ in batch], anchor)
+            stats['batches'] += 1
+            stats['blocks_sent'] += len(batch)
+            stats['continuation_blocks'] += sum(1 for _, _, last in batch if not last)
+
+            created = [result['id'] for result in response.get('results', [])[-len(batch):]]
+            if target_id == parent_id:
+                block_ids.extend(block_id for block_id, (_, _, last) in zip(created, batch) if last)
+            # 다음 묶음은 방금 추가한 마지막 블록 뒤에
+            if anchor and created:
+                anchor = created[-1]
+
+            # 넘친 하위 블록은 방금 만든 블록 아래에 이어서 추가
+            for i, (_, overflow, _) in enumerate(batch):
+                if overflow and i < len(created):
+                    upload(created[i], overflow)
+
+    try:
+        upload(parent_id, blocks, after)
+    except Exception as e:
+        return {"error": str(e), **stats, **client.stats(), "block_ids": block_ids}
+
+    return {"success": True, **stats, **client.stats(), "block_ids": block_ids}
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - Notion 동기화 대기열 (outbox)
+네트워크가 끊겼거나 API 키가 없어서 동기화에 실패한 날짜를
+~/.claude/daily-work-tracker/outbox/에 남겨두고 나중에 sync-notion.py --drain으로 다시 보냄
+같은 날짜/페이지는 항목 하나(멱등 키)로 합쳐지고, 날짜별 동기화 위치 덕분에 다시 보내도 중복되지 않음
+Hook은 대기 중인 항목이 있으면 백그라운드 drain 프로세스만 띄우고 바로 끝남
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+
+from daily_store import atomic_write_text, file_lock
+
+OUTBOX_DIR = '~/.claude/daily-work-tracker/outbox'
+DRAIN_LOCK = '.drain.lock'
+# mtime이 "이 시각 전에는 drain을 띄우지 않음"을 나타내는 파일 (Hook이 항목을 읽지 않고 판단)
+DRAIN_STAMP = '.next-drain'
+
+# 실패한 항목은 1분부터 두 배씩, 최대 6시간 뒤 다시 시도
+RETRY_BASE_SEC = 60
+RETRY_MAX_SEC = 6 * 3600
+
+# Hook에서 drain 프로세스를 띄우는 최소 간격과 drain 한 번의 시간 제한
+SPAWN_INTERVAL_SEC = 60
+DRAIN_BUDGET_SEC = 20
+
+
+def get_outbox_dir():
+    """대기열 디렉토리 경로"""
+    return os.path.expanduser(OUTBOX_DIR)
+
+
+def idempotency_key(date_str, page_id):
+    """날짜 + 페이지로 정해지는 항목 키 (같은 날을 여러 번 넣어도 하나)"""
+    return hashlib.sha1(f'{page_id}:{date_str}'.encode('utf-8')).hexdigest()[:16]
+
+
+def _entry_path(key):
+    """항목 파일 경로"""
+    return os.path.join(get_outbox_dir(), f'{key}.json')
+
+
+def _load_entry(path):
+    """항목 로드 (깨졌으면 None)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _set_next_drain(timestamp):
+    """Hook이 다음 drain을 띄울 수 있는 시각 기록"""
+    stamp = os.path.join(get_outbox_dir(), DRAIN_STAMP)
+    with open(stamp, 'a'):
+        pass
+    os.utime(stamp, (timestamp, timestamp))
+
+
+def enqueue(date_str, page_id, error=None):
+    """동기화할 날짜를 대기열에 추가 (이미 있으면 에러만 갱신). 항목 반환"""
+    key = idempotency_key(date_str, page_id)
+    path = _entry_path(key)
+    entry = _load_entry(path) or {
+        "key": key,
+        "date": date_str,
+        "page_id": page_id,
+        "queued_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "attempts": 0,
+        "next_attempt": 0
+    }
+    entry['last_error'] = error
+    os.makedirs(get_outbox_dir(), exist_ok=True)
+    atomic_write_text(path, json.dumps(entry, ensure_ascii=False, indent=2))
+    return entry
+
+
+def list_entries(due_only=False):
+    """대기 중인 항목 (날짜순, due_only면 다시 시도할 때가 된 것만)"""
+    try:
+        names = [n for n in os.listdir(get_outbox_dir()) if n.endswith('.json')]
+    except FileNotFoundError:
+        return []
+
+    now = time.time()
+    entries = []
+    for name in names:
+        entry = _load_entry(os.path.join(get_outbox_dir(), name))
+        if entry and (not due_only or entry.get('next_attempt', 0) <= now):
+            entries.append(entry)
+    return sorted(entries, key=lambda e: e['date'])
+
+
+def complete(entry):
+    """동기화 성공한 항목 삭제"""
+    try:
+        os.remove(_entry_path(entry['key']))
+    except FileNotFoundError:
+        pass
+
+
+def discard(date_str, page_id):
+    """다른 경로로 동기화에 성공한 날짜를 대기열에서 제거"""
+    complete({"key": idempotency_key(date_str, page_id)})
+
+
+def defer(entry, error):
+    """실패한 항목의 다음 시도 시각을 늦춤"""
+    entry['attempts'] = entry.get('attempts', 0) + 1
+    entry['last_error'] = error
+    entry['next_attempt'] = time.time() + min(RETRY_MAX_SEC, RETRY_BASE_SEC * 2 ** (entry['attempts'] - 1))
+    atomic_write_text(_entry_path(entry['key']), json.dumps(entry, ensure_ascii=False, indent=2))
+
+
+def drain(sync_entry, budget_sec=DRAIN_BUDGET_SEC):
+    """다시 시도할 때가 된 항목을 시간 제한 안에서 순서대로 처리 (다른 drain이 실행 중이면 건너뜀)
+    sync_entry(entry)는 성공 여부와 에러를 (bool, str) 로 반환"""
+    os.makedirs(get_outbox_dir(), exist_ok=True)
+    fd = os.open(os.path.join(get_outbox_dir(), DRAIN_LOCK), os.O_RDWR | os.O_CREAT, 0o644)
+    result = {"success": True, "synced": [], "deferred": {}, "remaining": 0}
+    try:
+        with file_lock(fd, timeout=0) as locked:
+            if not locked:
+                return {"success": True, "skipped": "다른 drain이 실행 중입니다."}
+
+            deadline = time.monotonic() + budget_sec
+            for entry in list_entries(due_only=True):
+                if time.monotonic() >= deadline:
+                    break
+                ok, error = sync_entry(entry)
+                if ok:
+                    complete(entry)
+                    result['synced'].append(entry['date'])
+                else:
+                    defer(entry, error)
+                    result['deferred'][entry['date']] = error
+    finally:
+        os.close(fd)
+
+    remaining = list_entries()
+    if remaining:
+        _set_next_drain(max(time.time() + SPAWN_INTERVAL_SEC, min(e.get('next_attempt', 0) for e in remaining)))
+    result['remaining'] = len(remaining)
+    result['success'] = not result['deferred']
+    return result
+
+
+def maybe_spawn_drain(script_path):
+    """대기 중인 항목이 있고 최근에 drain을 띄운 적 없으면 백그라운드로 실행 (Hook용, 기다리지 않음)"""
+    outbox = get_outbox_dir()
+    try:
+        if not any(n.endswith('.json') for n in os.listdir(outbox)):
+            return False
+    except FileNotFoundError:
+        return False
+
+    try:
+        if time.time() < os.stat(os.path.join(outbox, DRAIN_STAMP)).st_mtime:
+            return False
+    except FileNotFoundError:
+        pass
+
+    # Hook 경로에서는 실제로 띄울 때만 import
+    import subprocess
+
+    _set_next_drain(time.time() + SPAWN_INTERVAL_SEC)
+    subprocess.Popen(
+        [sys.executable, script_path, '--drain', '--budget', str(DRAIN_BUDGET_SEC)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True, close_fds=True
+    )
+    return True
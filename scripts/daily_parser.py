@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 작업 기록 파서 (generate-summary.py, sync-notion.py 공용)
+파싱 결과를 {log_path}/.cache/ 아래 사이드카 파일에 저장해서
+바뀌지 않은 날짜는 다시 파싱하지 않고, 뒤에 추가만 된 저널은 추가된 부분만 파싱
+압축 보관된 날짜(daily_archive)는 바뀌지 않으므로 캐시 없이 해당 멤버만 읽어서 파싱
+"""
+import hashlib
+import io
+import json
+import os
+
+import daily_archive
+import daily_db
+from daily_store import (CACHE_DIRNAME, atomic_write_text, group_projects, iter_markdown_records, journal_path,
+                         markdown_path)
+
+CACHE_VERSION = 2
+
+# 파일이 앞부분 그대로 뒤에만 추가됐는지 확인할 때 비교하는 길이
+FINGERPRINT_BYTES = 4096
+
+
+def parse_daily_log(content):
+    """마크다운 로그 문자열을 구조화된 데이터로 파싱 (파일은 load_day_projects 사용)"""
+    if not content:
+        return []
+    return group_projects(iter_markdown_records(io.StringIO(content)))
+
+
+def merge_projects(projects, more):
+    """같은 이름의 프로젝트는 작업을 이어 붙여 합치기"""
+    by_name = {project['name']: project for project in projects}
+    for project in more:
+        if project['name'] in by_name:
+            by_name[project['name']]['tasks'].extend(project['tasks'])
+        else:
+            copied = {'name': project['name'], 'path': project['path'], 'tasks': list(project['tasks'])}
+            projects.append(copied)
+            by_name[project['name']] = copied
+    return projects
+
+
+def _cache_path(log_dir, date_str):
+    """사이드카 캐시 경로"""
+    return os.path.join(log_dir, CACHE_DIRNAME, f'{date_str}.json')
+
+
+def _load_cache(log_dir, date_str):
+    """사이드카 캐시 로드 (없거나 버전이 다르면 빈 캐시)"""
+    path = _cache_path(log_dir, date_str)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') == CACHE_VERSION:
+                return cache
+        except Exception:
+            pass
+    return {'version': CACHE_VERSION, 'sources': {}}
+
+
+def _fingerprint(f, offset):
+    """offset 직전 FINGERPRINT_BYTES의 해시 (앞부분이 바뀌지 않았는지 확인용)"""
+    start = max(0, offset - FINGERPRINT_BYTES)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+def _content_hash(path):
+    """파일 전체의 해시 (크기/수정 시각이 같아도 내용이 바뀌었는지 확인용)"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parse_markdown_source(path):
+    """(기존 형식) 마크다운 파일을 한 줄씩 읽으며 파싱 (지문은 파일 전체 해시)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        projects = group_projects(iter_markdown_records(f))
+    return projects, os.path.getsize(path), _content_hash(path)
+
+
+def _iter_journal_from(f, position):
+    """현재 위치부터 완성된 줄의 기록을 하나씩 반환 (읽은 위치는 position[0]에 누적)"""
+    for line in f:
+        if not line.endswith(b'\n'):
+            # 쓰는 도중인 마지막 줄은 다음에 파싱
+            break
+        position[0] += len(line)
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and record.get('project'):
+            yield record
+
+
+def _parse_journal_source(path, projects, offset):
+    """저널을 offset부터 한 줄씩 읽으며 파싱해 projects에 합침"""
+    position = [offset]
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        merge_projects(projects, group_projects(_iter_journal_from(f, position)))
+        fingerprint = _fingerprint(f, position[0])
+    return projects, position[0], fingerprint
+
+
+def _load_source(cache, key, path, kind):
+    """파일 하나의 파싱 결과 (캐시 재사용 / 추가분만 파싱 / 전체 파싱). 캐시가 바뀌면 True"""
+    entry = cache['sources'].get(key)
+    stat = os.stat(path)
+
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        # 마크다운은 작고 중간이 고쳐질 수 있어서 (touch -r, 수정 시각 단위가 거친 파일시스템) 전체 해시까지 비교
+        if kind == 'journal' or _content_hash(path) == entry['fingerprint']:
+            return entry['projects'], False
+
+    if entry and kind == 'journal' and stat.st_size >= entry['offset']:
+        with open(path, 'rb') as f:
+            unchanged_prefix = _fingerprint(f, entry['offset']) == entry['fingerprint']
+        if unchanged_prefix:
+            # 뒤에 추가된 부분만 파싱
+            projects, offset, fingerprint = _parse_journal_source(path, entry['projects'], entry['offset'])
+            cache['sources'][key] = {
+                'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                'offset': offset, 'fingerprint': fingerprint, 'projects': projects
+            }
+            return projects, True
+
+    if kind == 'journal':
+        projects, offset, fingerprint = _parse_journal_source(path, [], 0)
+    else:
+        projects, offset, fingerprint = _parse_markdown_source(path)
+
+    cache['sources'][key] = {
+        'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+        'offset': offset, 'fingerprint': fingerprint, 'projects': projects
+    }
+    return projects, True
+
+
+def load_day_projects(log_dir, date_str, backend='files'):
+    """해당 날짜의 프로젝트 목록 (압축 보관분 + 기존 마크다운 + 저널, 또는 SQLite)"""
+    if backend == 'sqlite':
+        return group_projects(daily_db.iter_records(log_dir, date_str))
+
+    projects = group_projects(daily_archive.iter_archived_records(log_dir, date_str))
+    cache = _load_cache(log_dir, date_str)
+    changed = False
+    sources = {
+        'md': (markdown_path(log_dir, date_str), 'markdown'),
+        'jsonl': (journal_path(log_dir, date_str), 'journal')
+    }
+
+    for key, (path, kind) in sources.items():
+        if not os.path.exists(path):
+            changed = cache['sources'].pop(key, None) is not None or changed
+            continue
+        source_projects, source_changed = _load_source(cache, key, path, kind)
+        changed = changed or source_changed
+        # 캐시 항목을 직접 바꾸지 않도록 복사해서 합침
+        merge_projects(projects, source_projects)
+
+    if changed:
+        try:
+            atomic_write_text(_cache_path(log_dir, date_str), json.dumps(cache, ensure_ascii=False))
+        except OSError:
+            pass
+
+    return projects
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 일/주/월 집계 (롤업)
+Hook이 기록을 남길 때마다 오늘 집계(rollups/current.json)에 한 건씩 더하고, 날짜가 바뀌면
+전날 항목을 {log_path}/rollups/YYYY-MM.json의 날짜/주/달 집계로 옮겨 둠
+주간/월간 보고서(rollup-report.py)는 원본 로그 대신 이 파일 한두 개만 읽음 (기록이 쌓여도 비용 일정)
+집계 항목: 프로젝트별 대화 수, 활동 시간대(대화가 있었던 시각 수), 카테고리별 대화 수
+rollups 디렉토리가 없으면 Hook은 건너뛰고, 보고서를 처음 만들 때 원본 로그로 전체를 다시 계산
+"""
+import json
+import os
+from datetime import date, datetime, timedelta
+
+from daily_store import atomic_write_text, file_lock, iter_day_records, list_log_dates, week_start
+
+ROLLUP_DIRNAME = 'rollups'
+ROLLUP_VERSION = 1
+ROLLUP_LOCK = '.rollup.lock'
+CURRENT_FILE = 'current.json'
+
+# 보고서에 표시하는 상위 카테고리 수
+TOP_CATEGORIES = 3
+
+# 다시 계산할 때 원본에서 읽은 오늘 기록 중 이 시간(초) 안의 ts는 current.json에 남겨,
+# 저널에는 썼지만 아직 집계 잠금을 기다리던 Hook이 같은 기록을 두 번 더하지 않게 함
+REPLAY_WINDOW = 60
+
+# 다시 계산을 마무리할 때 Hook이 잡고 있는 잠금을 기다리는 시간 (초)
+REBUILD_LOCK_TIMEOUT = 10
+
+
+def get_rollup_dir(log_dir):
+    """집계 디렉토리 경로"""
+    return os.path.join(log_dir, ROLLUP_DIRNAME)
+
+
+def rollup_path(log_dir, month):
+    """월별 집계 파일 경로"""
+    return os.path.join(get_rollup_dir(log_dir), f'{month}.json')
+
+
+def empty_rollup():
+    """빈 월별 집계 (days: 날짜별, weeks: 월요일 날짜별로 이 달에 속한 부분, month: 달 전체)"""
+    return {"version": ROLLUP_VERSION, "days": {}, "weeks": {}, "month": {}}
+
+
+def _read_json(path):
+    """집계 파일 로드 (없거나 깨졌거나 버전이 다르면 None)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == ROLLUP_VERSION:
+            return data
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def _write_json(path, data):
+    """집계 파일 저장 (Hook이 매번 쓰므로 공백 없이)"""
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+
+
+def _record_hour(record):
+    """기록 시각(HH:MM)의 시 (알 수 없으면 None)"""
+    try:
+        hour = int(str(record.get('time', ''))[:2])
+    except ValueError:
+        return None
+    return hour if 0 <= hour < 24 else None
+
+
+def _add_categories(target, categories):
+    """카테고리별 횟수 더하기"""
+    for name, count in categories.items():
+        target[name] = target.get(name, 0) + count
+
+
+def apply_record(day, record, category=None):
+    """기록 한 건을 날짜 항목에 반영 (시각은 24비트 hours에 표시해서 같은 시각은 한 번만 셈)"""
+    project = record.get('project') or 'unknown'
+    hour = _record_hour(record)
+    bit = 1 << hour if hour is not None else 0
+
+    stats = day.setdefault('projects', {}).setdefault(project, {"prompts": 0, "hours": 0})
+    for entry in (day, stats):
+        entry['prompts'] = entry.get('prompts', 0) + 1
+        entry['hours'] = entry.get('hours', 0) | bit
+        if category:
+            _add_categories(entry.setdefault('categories', {}), {category: 1})
+
+
+def _add_period(period, old_day, day):
+    """날짜 항목 day를 기존 old_day에 합칠 때 주/달 집계가 늘어나는 만큼 더함 (활동 시간대는 새 시각만)"""
+    period['prompts'] = period.get('prompts', 0) + day.get('prompts', 0)
+    period['active_hours'] = period.get('active_hours', 0) + _new_hours(old_day, day)
+    _add_categories(period.setdefault('categories', {}), day.get('categories', {}))
+    old_projects = old_day.get('projects', {})
+    for project, stats in day.get('projects', {}).items():
+        target = period.setdefault('projects', {}).setdefault(project, {"prompts": 0, "active_hours": 0})
+        target['prompts'] += stats.get('prompts', 0)
+        target['active_hours'] += _new_hours(old_projects.get(project, {}), stats)
+        _add_categories(target.setdefault('categories', {}), stats.get('categories', {}))
+
+
+def _new_hours(old, new):
+    """old에 없던 시각 수"""
+    return bin(new.get('hours', 0) & ~old.get('hours', 0)).count('1')
+
+
+def fold_day(rollup, date_str, day):
+    """날짜 항목 하나를 월별 집계의 날짜/주/달에 합침"""
+    old_day = rollup['days'].get(date_str, {})
+    _add_period(rollup['weeks'].setdefault(week_start(date_str), {}), old_day, day)
+    _add_period(rollup['month'], old_day, day)
+
+    merged = rollup['days'].setdefault(date_str, {"prompts": 0, "hours": 0})
+    for target, stats in [(merged, day)] + [
+        (merged.setdefault('projects', {}).setdefault(name, {"prompts": 0, "hours": 0}), project)
+        for name, project in day.get('projects', {}).items()
+    ]:
+        target['prompts'] = target.get('prompts', 0) + stats.get('prompts', 0)
+        target['hours'] = target.get('hours', 0) | stats.get('hours', 0)
+        _add_categories(target.setdefault('categories', {}), stats.get('categories', {}))
+
+
+def _lock_rollups(log_dir):
+    """집계 디렉토리 잠금 파일 열기"""
+    return os.open(os.path.join(get_rollup_dir(log_dir), ROLLUP_LOCK), os.O_RDWR | os.O_CREAT, 0o644)
+
+
+def _fold_current(log_dir, current):
+    """지난 날짜의 오늘 집계를 해당 달 파일로 옮김 (잠금 안에서 호출)"""
+    month = current['date'][:7]
+    rollup = _read_json(rollup_path(log_dir, month)) or empty_rollup()
+    fold_day(rollup, current['date'], current['day'])
+    _write_json(rollup_path(log_dir, month), rollup)
+
+
+def record_prompt(log_dir, date_str, record, category=None):
+    """Hook에서 기록 한 건을 집계에 추가 (rollups 디렉토리가 없으면 아직 만들지 않은 것이므로 건너뜀)
+    매번 쓰는 건 오늘 항목만 담은 current.json이고, 날짜가 바뀐 뒤 첫 기록에서 전날 항목을 달 파일로 옮김"""
+    if not os.path.isdir(get_rollup_dir(log_dir)):
+        return False
+
+    fd = _lock_rollups(log_dir)
+    try:
+        with file_lock(fd) as locked:
+            if not locked:
+                # 잠금 없이 고쳐 쓰면 다른 Hook의 집계를 덮어쓸 수 있으므로 건너뜀 (--rebuild로 복구)
+                return False
+            path = os.path.join(get_rollup_dir(log_dir), CURRENT_FILE)
+            current = _read_json(path)
+            if current and current.get('date') != date_str:
+                _fold_current(log_dir, current)
+                current = None
+            current = current or {"version": ROLLUP_VERSION, "date": date_str, "day": {}}
+            if record.get('ts') and record['ts'] in current.get('replayed', ()):
+                # 다시 계산할 때 원본에서 이미 읽은 기록
+                return True
+            apply_record(current['day'], record, category)
+            _write_json(path, current)
+    finally:
+        os.close(fd)
+    return True
+
+
+def load_rollup(log_dir, month):
+    """월별 집계 (아직 옮기지 않은 오늘 항목까지 합침, 없으면 빈 집계)"""
+    rollup = _read_json(rollup_path(log_dir, month)) or empty_rollup()
+    current = _read_json(os.path.join(get_rollup_dir(log_dir), CURRENT_FILE))
+    if current and current.get('date', '')[:7] == month:
+        fold_day(rollup, current['date'], current['day'])
+    return rollup
+
+
+def _rebuild_day(log_dir, date_str, backend, classifier):
+    """원본 로그로 날짜 항목 하나 계산. (항목, ts 목록) 반환"""
+    from daily_classifier import classify
+
+    day = {}
+    stamps = []
+    for record in iter_day_records(log_dir, date_str, backend):
+        apply_record(day, record, classify(record.get('prompt', ''), classifier))
+        if record.get('ts'):
+            stamps.append(record['ts'])
+    return day, stamps
+
+
+def _recent_stamps(stamps, now):
+    """REPLAY_WINDOW 안의 ts만"""
+    recent = []
+    for ts in stamps:
+        try:
+            if now - datetime.fromisoformat(ts).timestamp() <= REPLAY_WINDOW:
+                recent.append(ts)
+        except (TypeError, ValueError):
+            continue
+    return recent
+
+
+def rebuild(log_dir, backend='files', classifier=None, months=None):
+    """원본 로그(보관분 포함)를 다시 읽어 월별 집계 재작성 (months로 일부 달만). {달: 날짜 수} 반환
+    months를 지정하지 않으면 원본이 없는 달(삭제 기준으로 지운 달)의 집계는 그대로 둠
+    원본은 잠금 없이 읽어 그동안 Hook이 기다리지 않게 하고, 마지막에 잠금 안에서 오늘 항목만 다시 읽어
+    current.json으로 바꿔 넣음 (그 사이 Hook이 남긴 기록도 빠지지 않음)"""
+    os.makedirs(get_rollup_dir(log_dir), exist_ok=True)
+    # 지정한 달은 기록이 모두 지워졌더라도 빈 집계로 다시 씀
+    by_month = {month: [] for month in months or ()}
+    for date_str in list_log_dates(log_dir, backend):
+        if months is None or date_str[:7] in months:
+            by_month.setdefault(date_str[:7], []).append(date_str)
+
+    days = {date_str: _rebuild_day(log_dir, date_str, backend, classifier)[0]
+            for dates in by_month.values() for date_str in dates}
+
+    result = {}
+    fd = _lock_rollups(log_dir)
+    try:
+        with file_lock(fd, timeout=REBUILD_LOCK_TIMEOUT) as locked:
+            if not locked:
+                raise TimeoutError('집계 잠금을 얻지 못했습니다. 잠시 후 다시 실행하세요.')
+
+            today = datetime.now().strftime('%Y-%m-%d')
+            current_path = os.path.join(get_rollup_dir(log_dir), CURRENT_FILE)
+            current = _read_json(current_path)
+            if today[:7] in by_month or current and current.get('date', '')[:7] in by_month:
+                if current and current['date'] != today and current['date'][:7] not in by_month:
+                    # 다시 계산하지 않는 달의 지난 항목은 바꿔 넣기 전에 달 파일로 옮김
+                    _fold_current(log_dir, current)
+                # 오늘 기록은 잠금 안에서 다시 읽어 current.json으로 (이후 Hook은 여기에 이어서 더함)
+                day, stamps = _rebuild_day(log_dir, today, backend, classifier) if today[:7] in by_month else ({}, [])
+                if day:
+                    _write_json(current_path, {"version": ROLLUP_VERSION, "date": today, "day": day,
+                                               "replayed": _recent_stamps(stamps, datetime.now().timestamp())})
+                elif current:
+                    os.remove(current_path)
+
+            for month, dates in sorted(by_month.items()):
+                rollup = empty_rollup()
+                for date_str in dates:
+                    if date_str != today:
+                        fold_day(rollup, date_str, days[date_str])
+                _write_json(rollup_path(log_dir, month), rollup)
+                result[month] = len(dates)
+    finally:
+        os.close(fd)
+    return result
+
+
+def ensure_rollups(log_dir, backend='files', classifier=None):
+    """집계가 아직 없으면 원본 로그로 전체를 한 번 만듦 (만들었으면 결과, 이미 있으면 None)"""
+    if os.path.isdir(get_rollup_dir(log_dir)):
+        return None
+    return rebuild(log_dir, backend, classifier)
+
+
+def _day_totals(day):
+    """날짜 항목을 주/달과 같은 형식으로 (시각 비트 → 활동 시간대 수)"""
+    period = {}
+    _add_period(period, {}, day)
+    return period
+
+
+def merge_entries(entries):
+    """여러 집계 항목(일/주/달)을 하나로 합침"""
+    merged = {"prompts": 0, "active_hours": 0, "projects": {}, "categories": {}}
+    for entry in entries:
+        merged['prompts'] += entry.get('prompts', 0)
+        merged['active_hours'] += entry.get('active_hours', 0)
+        for name, count in entry.get('categories', {}).items():
+            merged['categories'][name] = merged['categories'].get(name, 0) + count
+        for project, stats in entry.get('projects', {}).items():
+            target = merged['projects'].setdefault(project, {"prompts": 0, "active_hours": 0, "categories": {}})
+            target['prompts'] += stats.get('prompts', 0)
+            target['active_hours'] += stats.get('active_hours', 0)
+            for name, count in stats.get('categories', {}).items():
+                target['categories'][name] = target['categories'].get(name, 0) + count
+    return merged
+
+
+def top_categories(categories, limit=TOP_CATEGORIES):
+    """많은 순 카테고리 [(이름, 횟수)]"""
+    return sorted(categories.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+def _summarize(entry, days=None):
+    """보고서용 형식 (프로젝트는 대화 수 순, 카테고리는 상위 몇 개만)"""
+    entry = merge_entries([entry])
+    summary = {
+        "prompts": entry['prompts'],
+        "active_hours": entry['active_hours'],
+        "top_categories": [{"name": n, "count": c} for n, c in top_categories(entry['categories'])],
+        "projects": [
+            {
+                "name": name,
+                "prompts": stats['prompts'],
+                "active_hours": stats['active_hours'],
+                "top_categories": [{"name": n, "count": c} for n, c in top_categories(stats['categories'])]
+            }
+            for name, stats in sorted(entry['projects'].items(), key=lambda item: (-item[1]['prompts'], item[0]))
+        ]
+    }
+    if days is not None:
+        summary['active_days'] = days
+    return summary
+
+
+def week_view(log_dir, date_str):
+    """date_str이 속한 주(월~일)의 날짜별/전체 집계 (달이 걸친 주는 두 달 파일을 합침)"""
+    monday = date.fromisoformat(week_start(date_str))
+    dates = [(monday + timedelta(days=i)).isoformat() for i in range(7)]
+    rollups = {month: load_rollup(log_dir, month) for month in sorted({d[:7] for d in dates})}
+
+    days = []
+    for day in dates:
+        entry = rollups[day[:7]]['days'].get(day)
+        if entry:
+            days.append(dict(_summarize(_day_totals(entry)), date=day))
+
+    total = merge_entries(r['weeks'].get(dates[0], {}) for r in rollups.values())
+    return {"start": dates[0], "end": dates[-1], "days": days, "total": _summarize(total, len(days))}
+
+
+def month_view(log_dir, month):
+    """달 하나의 주별/전체 집계 (주별은 이 달에 속한 날짜만)"""
+    rollup = load_rollup(log_dir, month)
+    weeks = []
+    for monday in sorted(rollup['weeks']):
+        dates = [(date.fromisoformat(monday) + timedelta(days=i)).isoformat() for i in range(7)]
+        active = [d for d in dates if d in rollup['days']]
+        if not active:
+            continue
+        in_month = [d for d in dates if d[:7] == month]
+        weeks.append(dict(_summarize(rollup['weeks'][monday], len(active)), start=in_month[0], end=in_month[-1]))
+
+    return {"month": month, "weeks": weeks, "total": _summarize(rollup['month'], len(rollup['days']))}
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 작업 기록 저장소
+Hook은 날짜별 저널(YYYY-MM-DD.jsonl)에 한 줄씩 추가만 하고,
+프로젝트별로 묶인 마크다운은 읽는 쪽에서 필요할 때 렌더링
+{log_path}/layout.json이 있으면 YYYY/MM/DD.jsonl로 나눠 저장하고
+달마다 manifest.json(날짜별 작업 수, 크기, 수정 시각)으로 날짜 목록을 조회
+"""
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# 파싱/요약 캐시 디렉토리 ({log_path}/.cache)
+CACHE_DIRNAME = '.cache'
+
+# 마크다운 로그 패턴 (미리 컴파일)
+PROJECT_PREFIX = '## 🔹 '
+PATH_PATTERN = re.compile(r'> `(.+)`')
+TASK_PATTERN = re.compile(r'- \*\*\[(\d+:\d+)\]\*\* (.+)')
+
+# Hook이 프롬프트 제출을 오래 막지 않도록 잠금 대기 시간 제한 (초)
+LOCK_TIMEOUT = 0.5
+
+# 연/월 디렉토리 구조 표시 파일과 월별 날짜 목록
+LAYOUT_FILE = 'layout.json'
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_LOCK = '.manifest.lock'
+MANIFEST_VERSION = 1
+
+# 잠금을 못 잡아 목록 갱신을 건너뛴 달 표시 (목록을 다시 만들 때까지 날짜 조회 시 디렉토리도 확인)
+MANIFEST_STALE = '.manifest.stale'
+
+# 목록을 다시 만들 때 Hook이 잡고 있는 잠금을 기다리는 시간 (초)
+REBUILD_LOCK_TIMEOUT = 10
+
+# 날짜별 원본 파일 종류 (읽는 순서: 기존 마크다운 → 저널)
+DAY_EXTENSIONS = ('md', 'jsonl')
+
+
+def is_sharded(log_dir):
+    """YYYY/MM/DD 구조인지 (마이그레이션 중에도 바로 반영되도록 매번 확인)"""
+    return os.path.exists(os.path.join(log_dir, LAYOUT_FILE))
+
+
+def month_dir(log_dir, month):
+    """YYYY/MM 디렉토리 경로"""
+    return os.path.join(log_dir, month[:4], month[5:7])
+
+
+def flat_day_path(log_dir, date_str, ext):
+    """YYYY-MM-DD.ext 경로"""
+    return os.path.join(log_dir, f'{date_str}.{ext}')
+
+
+def sharded_day_path(log_dir, date_str, ext):
+    """YYYY/MM/DD.ext 경로"""
+    return os.path.join(log_dir, date_str[:4], date_str[5:7], f'{date_str[8:]}.{ext}')
+
+
+def day_path(log_dir, date_str, ext):
+    """현재 구조의 날짜별 파일 경로"""
+    if is_sharded(log_dir):
+        return sharded_day_path(log_dir, date_str, ext)
+    return flat_day_path(log_dir, date_str, ext)
+
+
+def journal_path(log_dir, date_str):
+    """저널 파일 경로 반환"""
+    return day_path(log_dir, date_str, 'jsonl')
+
+
+def markdown_path(log_dir, date_str):
+    """(기존 형식) 마크다운 로그 파일 경로 반환"""
+    return day_path(log_dir, date_str, 'md')
+
+
+def week_start(date_str):
+    """날짜가 속한 주의 월요일 (YYYY-MM-DD)"""
+    day = date.fromisoformat(date_str)
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+@contextmanager
+def file_lock(fd, timeout=LOCK_TIMEOUT):
+    """advisory 잠금 (timeout 안에 못 잡으면 False를 넘기고 잠금 없이 진행)"""
+    if not HAS_FCNTL:
+        yield False
+        return
+
+    deadline = time.monotonic() + timeout
+    delay = 0.001
+    while True:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            break
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                yield False
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, 0.02)
+
+    try:
+        yield True
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def append_record(log_dir, date_str, record):
+    """저널에 기록 한 줄 추가 (파일 크기와 무관하게 일정한 비용, 연/월 구조면 월별 목록도 갱신)"""
+    sharded = is_sharded(log_dir)
+    path = sharded_day_path(log_dir, date_str, 'jsonl') if sharded else flat_day_path(log_dir, date_str, 'jsonl')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+    fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        with file_lock(fd):
+            # 이전 기록이 쓰는 도중 중단됐으면 줄바꿈부터 넣어 새 기록이 섞이지 않게 함
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b'\n':
+                data = b'\n' + data
+            # 한 번의 write로 기록 전체를 추가
+            while data:
+                written = os.write(fd, data)
+                data = data[written:]
+    finally:
+        os.close(fd)
+
+    if sharded:
+        update_manifest(log_dir, date_str, added_tasks=1)
+
+
+def atomic_write_text(path, text):
+    """임시 파일에 쓴 뒤 rename으로 교체 (읽는 쪽이 반쯤 쓰인 파일을 보지 않음)"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f'.{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def iter_journal_lines(lines):
+    """저널 줄들을 기록으로 변환 (깨진 줄은 건너뜀, 파일 핸들을 그대로 넘겨도 됨)"""
+    for line in lines:
+        if not line.endswith('\n'):
+            # 쓰는 도중인 마지막 줄
+            break
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and record.get('project'):
+            yield record
+
+
+def iter_journal_records(path):
+    """저널 파일의 기록을 순서대로 반환"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter_journal_lines(f)
+
+
+def iter_markdown_records(lines):
+    """기존 마크다운 로그를 저널과 같은 기록 형태로 한 줄씩 변환 (파일 핸들을 그대로 넘겨도 됨)"""
+    project = None
+    path = ''
+    record = None
+
+    for line in lines:
+        # 첫 글자로 먼저 걸러서 대부분의 줄은 정규식 없이 처리
+        first = line[:1]
+
+        if first == '#':
+            if line.startswith(PROJECT_PREFIX):
+                if record:
+                    yield record
+                    record = None
+                project = line[len(PROJECT_PREFIX):].rstrip('\r\n')
+                path = ''
+        elif first == '>':
+            if project is not None:
+                match = PATH_PATTERN.match(line)
+                if match:
+                    path = match.group(1)
+        elif first == '-':
+            if project is not None and line.startswith('- **['):
+                if record:
+                    yield record
+                    record = None
+                match = TASK_PATTERN.match(line)
+                if match:
+                    record = {
+                        'time': match.group(1),
+                        'project': project,
+                        'path': path,
+                        'prompt': match.group(2)
+                    }
+        elif first == ' ':
+            if record and line.startswith('  '):
+                # 여러 줄 프롬프트의 들여쓰기 줄
+                record['prompt'] += '\n' + line.rstrip('\r\n')
+
+    if record:
+        yield record
+
+
+def iter_day_records(log_dir, date_str, backend='files'):
+    """해당 날짜의 기록을 하나씩 반환 (월별 압축 보관분 + 기존 마크다운 + 저널, 또는 SQLite)"""
+    if backend == 'sqlite':
+        import daily_db
+        yield from daily_db.iter_records(log_dir, date_str)
+        return
+
+    import daily_archive
+    yield from daily_archive.iter_archived_records(log_dir, date_str)
+
+    md_path = markdown_path(log_dir, date_str)
+    if os.path.exists(md_path):
+        with open(md_path, 'r', encoding='utf-8') as f:
+            yield from iter_markdown_records(f)
+
+    yield from iter_journal_records(journal_path(log_dir, date_str))
+
+
+def read_day_records(log_dir, date_str, backend='files'):
+    """해당 날짜의 모든 기록 반환"""
+    return list(iter_day_records(log_dir, date_str, backend))
+
+
+def render_markdown(records, date_str):
+    """기록을 프로젝트별로 묶어 마크다운으로 렌더링"""
+    sections = {}
+
+    for record in records:
+        name = record['project']
+        if name not in sections:
+            sections[name] = {'path': record.get('path', ''), 'entries': []}
+        sections[name]['entries'].append(f"- **[{record['time']}]** {record['prompt']}")
+
+    lines = [f'# 📅 {date_str} 작업 기록', '']
+    for i, (name, section) in enumerate(sections.items()):
+        if i > 0:
+            lines.append('')
+        lines.append(f'## 🔹 {name}')
+        lines.append(f"> `{section['path']}`")
+        lines.append('')
+        lines.extend(section['entries'])
+
+    return '\n'.join(lines) + '\n'
+
+
+def group_projects(records):
+    """기록을 프로젝트별로 묶기 (parse_daily_log와 같은 형태, 작업 내용은 첫 줄만)"""
+    projects = {}
+    for record in records:
+        name = record['project']
+        if name not in projects:
+            projects[name] = {'name': name, 'path': record.get('path', ''), 'tasks': []}
+        projects[name]['tasks'].append({
+            'time': record['time'],
+            'content': record['prompt'].split('\n', 1)[0]
+        })
+    return list(projects.values())
+
+
+def read_day_markdown(log_dir, date_str, backend='files'):
+    """해당 날짜의 마크다운 로그 반환 (기록이 없으면 None)"""
+    records = read_day_records(log_dir, date_str, backend)
+    if not records:
+        return None
+    return render_markdown(records, date_str)
+
+
+def manifest_path(log_dir, month):
+    """월별 날짜 목록 경로"""
+    return os.path.join(month_dir(log_dir, month), MANIFEST_NAME)
+
+
+def load_manifest(log_dir, month):
+    """월별 날짜 목록 {"days": {날짜: {"tasks", "bytes", "mtime_ns"}}} (없으면 None)"""
+    try:
+        with open(manifest_path(log_dir, month), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _day_file_stats(log_dir, date_str):
+    """날짜별 원본 파일의 전체 크기와 최근 수정 시각"""
+    size = mtime_ns = 0
+    for ext in DAY_EXTENSIONS:
+        try:
+            stat = os.stat(sharded_day_path(log_dir, date_str, ext))
+        except FileNotFoundError:
+            continue
+        size += stat.st_size
+        mtime_ns = max(mtime_ns, stat.st_mtime_ns)
+    return size, mtime_ns
+
+
+def _write_manifest(log_dir, month, update, timeout=LOCK_TIMEOUT):
+    """월별 잠금을 잡고 목록을 읽어 update(days)로 고친 뒤 저장 (잠금을 못 잡으면 고치지 않고 False)"""
+    directory = month_dir(log_dir, month)
+    os.makedirs(directory, exist_ok=True)
+    fd = os.open(os.path.join(directory, MANIFEST_LOCK), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        with file_lock(fd, timeout) as locked:
+            if not locked:
+                return False
+            manifest = load_manifest(log_dir, month) or {"version": MANIFEST_VERSION, "days": {}}
+            update(manifest['days'])
+            atomic_write_text(manifest_path(log_dir, month), json.dumps(manifest, sort_keys=True))
+            return True
+    finally:
+        os.close(fd)
+
+
+def is_manifest_stale(log_dir, month):
+    """목록 갱신을 건너뛴 적이 있는 달인지"""
+    return os.path.exists(os.path.join(month_dir(log_dir, month), MANIFEST_STALE))
+
+
+def update_manifest(log_dir, date_str, added_tasks=0, tasks=None):
+    """날짜 하나의 작업 수(추가분 또는 전체)와 파일 크기/수정 시각 갱신"""
+    size, mtime_ns = _day_file_stats(log_dir, date_str)
+
+    def update(days):
+        if not size:
+            days.pop(date_str, None)
+            return
+        count = tasks if tasks is not None else days.get(date_str, {}).get('tasks', 0) + added_tasks
+        days[date_str] = {"tasks": count, "bytes": size, "mtime_ns": mtime_ns}
+
+    if not _write_manifest(log_dir, date_str[:7], update):
+        # 잠금 없이 고쳐 쓰면 동시에 기록한 날짜/작업 수를 덮어쓸 수 있으므로 표시만 남기고,
+        # list_log_dates가 디렉토리를 확인하게 함 (shard-logs.py --rebuild로 목록 복구)
+        with open(os.path.join(month_dir(log_dir, date_str[:7]), MANIFEST_STALE), 'a'):
+            pass
+
+
+def rebuild_manifest(log_dir, month):
+    """달 디렉토리의 파일을 다시 읽어 목록 재작성. 날짜 수 반환"""
+    # 읽기 전에 표시를 지우므로, 읽는 동안 갱신을 건너뛴 Hook은 표시를 다시 남김
+    try:
+        os.remove(os.path.join(month_dir(log_dir, month), MANIFEST_STALE))
+    except FileNotFoundError:
+        pass
+    days = list_day_files(log_dir, sharded=True, month=month).get(month, {})
+    entries = {}
+    for date_str, files in days.items():
+        count = 0
+        if 'md' in files:
+            with open(files['md'], 'r', encoding='utf-8') as f:
+                count += sum(1 for _ in iter_markdown_records(f))
+        if 'jsonl' in files:
+            count += sum(1 for _ in iter_journal_records(files['jsonl']))
+        size, mtime_ns = _day_file_stats(log_dir, date_str)
+        entries[date_str] = {"tasks": count, "bytes": size, "mtime_ns": mtime_ns}
+
+    def update(current):
+        current.clear()
+        current.update(entries)
+
+    if not _write_manifest(log_dir, month, update, timeout=REBUILD_LOCK_TIMEOUT):
+        raise TimeoutError(f'{month} 목록 잠금을 얻지 못했습니다. 잠시 후 다시 실행하세요.')
+    return len(entries)
+
+
+def remove_month_dir(log_dir, month):
+    """(보관/삭제 후) 달 디렉토리의 목록/잠금 파일을 지우고 비었으면 디렉토리도 삭제"""
+    directory = month_dir(log_dir, month)
+    for name in (MANIFEST_NAME, MANIFEST_LOCK, MANIFEST_STALE):
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+    for path in (directory, os.path.dirname(directory)):
+        try:
+            os.rmdir(path)
+        except OSError:
+            break
+
+
+def _list_sharded_months(log_dir, start=None, end=None):
+    """YYYY/MM 디렉토리 목록 (start~end 날짜 범위 밖의 달은 제외)"""
+    months = []
+    for year in os.listdir(log_dir):
+        if len(year) != 4 or not year.isdigit():
+            continue
+        if start and year < start[:4] or end and year > end[:4]:
+            continue
+        for mon in os.listdir(os.path.join(log_dir, year)):
+            month = f'{year}-{mon}'
+            if len(mon) != 2 or not mon.isdigit():
+                continue
+            if start and month < start[:7] or end and month > end[:7]:
+                continue
+            months.append(month)
+    return sorted(months)
+
+
+def list_day_files(log_dir, sharded=None, month=None):
+    """실제 날짜별 파일 {달: {날짜: {종류: 경로}}} (sharded가 None이면 현재 구조, month로 한 달만)"""
+    if sharded is None:
+        sharded = is_sharded(log_dir)
+    months = {}
+    if not os.path.isdir(log_dir):
+        return months
+
+    if not sharded:
+        for name in os.listdir(log_dir):
+            stem, ext = os.path.splitext(name)
+            if ext[1:] in DAY_EXTENSIONS and DATE_PATTERN.match(stem):
+                months.setdefault(stem[:7], {}).setdefault(stem, {})[ext[1:]] = os.path.join(log_dir, name)
+        return months
+
+    for month in [month] if month else _list_sharded_months(log_dir):
+        directory = month_dir(log_dir, month)
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            continue
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            if ext[1:] in DAY_EXTENSIONS and len(stem) == 2 and stem.isdigit():
+                months.setdefault(month, {}).setdefault(f'{month}-{stem}', {})[ext[1:]] = os.path.join(directory, name)
+    return months
+
+
+def list_log_dates(log_dir, backend='files', start=None, end=None):
+    """기록이 있는 날짜 목록 반환 (start~end로 범위 제한, 연/월 구조면 범위 안의 달 목록만 읽음)"""
+    if backend == 'sqlite':
+        import daily_db
+        dates = daily_db.list_dates(log_dir)
+    elif not os.path.exists(log_dir):
+        return []
+    else:
+        import daily_archive
+        dates = daily_archive.list_archived_dates(log_dir)
+        if is_sharded(log_dir):
+            current = time.strftime('%Y-%m')
+            for month in _list_sharded_months(log_dir, start, end):
+                manifest = load_manifest(log_dir, month)
+                if manifest is None or month == current or is_manifest_stale(log_dir, month):
+                    # 이번 달(Hook이 목록 갱신에 실패했을 수도 있음), 갱신을 건너뛴 달, 목록이 없는 달은 디렉토리도 확인
+                    dates.update(list_day_files(log_dir, sharded=True, month=month).get(month, {}))
+                if manifest:
+                    dates.update(manifest['days'])
+        else:
+            for name in os.listdir(log_dir):
+                stem, ext = os.path.splitext(name)
+                if ext[1:] in DAY_EXTENSIONS and DATE_PATTERN.match(stem):
+                    dates.add(stem)
+
+    return sorted(d for d in dates if (not start or d >= start) and (not end or d <= end))
+
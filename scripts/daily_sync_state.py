@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 동기화 기록 저장소
+날짜별 동기화 여부를 연도마다 366비트(46바이트) 비트맵으로
+~/.claude/daily-work-tracker/sync-state.json에 저장 (기록 추가/조회는 비트 하나)
+예전 config.json의 sync_history 목록은 처음 기록할 때 옮기고 설정에서 제거 (조회만 할 때는 메모리에서 합침)
+"""
+import base64
+import json
+import os
+import threading
+from datetime import date, timedelta
+
+from daily_config import load_raw_config, save_config
+from daily_store import atomic_write_text, file_lock
+
+STATE_PATH = '~/.claude/daily-work-tracker/sync-state.json'
+STATE_VERSION = 1
+
+YEAR_BYTES = 46
+
+# 여러 스레드/프로세스가 동시에 기록해도 비트가 사라지지 않도록 잠금 (파일 잠금 대기 시간, 초)
+STATE_LOCK_TIMEOUT = 5
+STATE_LOCK_RETRIES = 3
+_state_lock = threading.Lock()
+
+
+def get_state_path():
+    """동기화 기록 파일 경로"""
+    return os.path.expanduser(STATE_PATH)
+
+
+def _position(date_str):
+    """날짜 → (연도 키, 바이트 위치, 비트 마스크)"""
+    day = date.fromisoformat(date_str)
+    index = day.toordinal() - date(day.year, 1, 1).toordinal()
+    return date_str[:4], index >> 3, 1 << (index & 7)
+
+
+def _read_state():
+    """동기화 기록 파일 로드 (없거나 깨졌으면 빈 기록)"""
+    try:
+        with open(get_state_path(), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == STATE_VERSION:
+            return {year: bytearray(base64.b64decode(bits)) for year, bits in data['years'].items()}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return {}
+
+
+def _write_state(state):
+    """동기화 기록 파일 저장 (비어 있는 연도는 제외)"""
+    years = {year: base64.b64encode(bytes(bits)).decode('ascii') for year, bits in sorted(state.items()) if any(bits)}
+    atomic_write_text(get_state_path(), json.dumps({"version": STATE_VERSION, "years": years}))
+
+
+def _set(state, date_str):
+    """날짜 비트 켜기 (이미 켜져 있으면 False)"""
+    year, offset, mask = _position(date_str)
+    bits = state.get(year)
+    if bits is None:
+        bits = state[year] = bytearray(YEAR_BYTES)
+    if bits[offset] & mask:
+        return False
+    bits[offset] |= mask
+    return True
+
+
+def _update(dates):
+    """잠금을 잡고 최신 기록에 날짜들을 추가해 저장. 갱신된 기록 반환
+    잠금 없이 고쳐 쓰면 다른 프로세스가 켠 비트가 사라지므로, 끝내 잠금을 못 잡으면 TimeoutError"""
+    dates = list(dates)
+    os.makedirs(os.path.dirname(get_state_path()), exist_ok=True)
+    with _state_lock:
+        fd = os.open(get_state_path() + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            for _ in range(STATE_LOCK_RETRIES):
+                with file_lock(fd, timeout=STATE_LOCK_TIMEOUT) as locked:
+                    if not locked:
+                        continue
+                    state = _read_state()
+                    changed = False
+                    for date_str in dates:
+                        changed = _set(state, date_str) or changed
+                    if changed:
+                        _write_state(state)
+                    return state
+        finally:
+            os.close(fd)
+    raise TimeoutError('동기화 기록 잠금을 얻지 못했습니다.')
+
+
+def _migrate(config):
+    """config.json의 sync_history를 비트맵으로 옮기고 설정 파일에서 제거"""
+    history = config.pop('sync_history', None)
+    if history is None:
+        return None
+
+    state = _update(d for d in history if isinstance(d, str))
+
+    # 설정 파일은 다시 읽어서 해당 키만 지움 (다른 변경을 덮어쓰지 않도록)
+    try:
+        latest = load_raw_config()
+        if latest and latest.pop('sync_history', None) is not None:
+            save_config(latest)
+    except (OSError, ValueError):
+        pass
+    return state
+
+
+def load_state(config=None):
+    """동기화 기록 로드 (설정에 예전 sync_history가 남아 있으면 파일은 그대로 두고 메모리에서만 합침)"""
+    state = _read_state()
+    for date_str in (config or {}).get('sync_history') or []:
+        if isinstance(date_str, str):
+            _set(state, date_str)
+    return state
+
+
+def migrate_state(config):
+    """예전 sync_history를 비트맵으로 옮기고 동기화 기록 반환 (설정을 저장하는 쓰기 경로에서 사용)"""
+    migrated = _migrate(config)
+    return migrated if migrated is not None else _read_state()
+
+
+def mark_synced(date_str, config=None):
+    """동기화 완료 기록"""
+    return mark_synced_dates([date_str], config)
+
+
+def mark_synced_dates(dates, config=None):
+    """여러 날짜 동기화 완료 기록 (저장소를 옮길 때 한 번에)"""
+    if config is not None:
+        _migrate(config)
+    return _update(dates)
+
+
+def is_synced(state, date_str):
+    """동기화된 날짜인지"""
+    year, offset, mask = _position(date_str)
+    bits = state.get(year)
+    return bool(bits and bits[offset] & mask)
+
+
+def unsynced_dates(dates, state, start=None, end=None):
+    """날짜 목록 중 start~end 범위의 동기화 안 된 날짜"""
+    return [
+        d for d in dates
+        if (start is None or d >= start) and (end is None or d <= end) and not is_synced(state, d)
+    ]
+
+
+def iter_synced_dates(state):
+    """동기화된 날짜를 순서대로 반환"""
+    for year in sorted(state):
+        first = date(int(year), 1, 1)
+        for offset, byte in enumerate(state[year]):
+            while byte:
+                bit = byte & -byte
+                yield (first + timedelta(days=offset * 8 + bit.bit_length() - 1)).isoformat()
+                byte ^= bit
+
+
+def summarize_state(state):
+    """동기화된 날짜 수와 마지막 날짜"""
+    count = sum(bin(byte).count('1') for bits in state.values() for byte in bits)
+    last = None
+    for year in sorted(state, reverse=True):
+        bits = state[year]
+        for offset in range(len(bits) - 1, -1, -1):
+            if bits[offset]:
+                index = offset * 8 + bits[offset].bit_length() - 1
+                last = (date(int(year), 1, 1) + timedelta(days=index)).isoformat()
+                break
+        if last:
+            break
+    return {"count": count, "last": last}
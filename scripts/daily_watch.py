@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 파일 변경 감시 (generate-summary.py --watch)
+Linux에서는 ctypes로 inotify를 써서 디렉토리 이벤트를 기다리고(추가 설치 없음),
+inotify를 쓸 수 없으면 stat으로 크기/수정 시각을 주기적으로 확인
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+# inotify 이벤트 종류 (sys/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# struct inotify_event { int wd; uint32_t mask, cookie, len; char name[]; }
+EVENT_HEADER = struct.Struct('iIII')
+
+POLL_INTERVAL = 1.0
+
+
+class InotifyWatcher:
+    """파일이 있는 디렉토리를 inotify로 감시하고 해당 파일 이벤트만 골라냄"""
+
+    kind = 'inotify'
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError('inotify를 지원하지 않습니다.')
+        self.name = os.fsencode(os.path.basename(path))
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 실패')
+        directory = os.fsencode(os.path.dirname(path) or '.')
+        if libc.inotify_add_watch(self.fd, directory, WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, 'inotify_add_watch 실패')
+
+    def wait(self, timeout):
+        """timeout(초) 안에 대상 파일이 바뀌면 True"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return False
+
+        changed = False
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+            offset += EVENT_HEADER.size + length
+            # 큐가 넘쳤으면 어떤 이벤트를 놓쳤는지 모르므로 바뀐 것으로 처리
+            if mask & IN_Q_OVERFLOW or name == self.name:
+                changed = True
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """stat으로 크기/수정 시각/inode를 주기적으로 비교 (inotify가 없는 환경)"""
+
+    kind = 'polling'
+
+    def __init__(self, path, interval=POLL_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.last = self._stat()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def wait(self, timeout):
+        """timeout(초) 안에 파일이 바뀌면 True"""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._stat()
+            if current != self.last:
+                self.last = current
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+def open_watcher(path, interval=POLL_INTERVAL, polling=False):
+    """파일 감시 시작 (inotify를 쓸 수 없거나 polling이면 주기적 확인). 디렉토리가 없으면 만듦"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if not polling:
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(path, interval)
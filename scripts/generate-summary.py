@@ -8,95 +8,62 @@ Daily Work Tracker - 일일 요약 생성 스크립트
     python3 generate-summary.py --date 2026-01-05  # 특정 날짜
     python3 generate-summary.py --format notion    # Notion 블록 형식
     python3 generate-summary.py --format markdown  # Markdown 형식 (기본)
+    python3 generate-summary.py --week             # 최근 7일 요약
+    python3 generate-summary.py --month 2026-01    # 월간 요약 (인자 없으면 이번 달)
+    python3 generate-summary.py --from 2026-01-01 --to 2026-03-31 --format json
+    python3 generate-summary.py --watch            # 기록이 추가될 때마다 저장된 요약 갱신 (Ctrl+C로 종료)
+    python3 generate-summary.py --format all       # 한 번 읽고 요약 저장 + Notion 블록 + JSON + Notion 동기화
+    python3 generate-summary.py --format markdown,sync   # 필요한 것만 쉼표로 (단계별 소요 시간 포함 JSON 출력)
 """
+import hashlib
+import importlib.util
 import json
 import os
 import sys
 import re
-from datetime import datetime
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
 
+import daily_activity
+import daily_archive
+from daily_activity import format_duration, load_activity, summarize_activity
+from daily_classifier import classify, load_classifier
+from daily_config import get_log_dir, get_summary_dir, load_config, normalize
+from daily_parser import CACHE_DIRNAME, load_day_projects
+from daily_store import atomic_write_text, iter_journal_lines, iter_markdown_records, journal_path, list_log_dates, markdown_path
+from daily_watch import POLL_INTERVAL, open_watcher
 
-def get_config():
-    """설정 파일 로드"""
-    config_path = os.path.expanduser('~/.claude/daily-work-tracker/config.json')
-    if not os.path.exists(config_path):
-        return {}
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-
-def get_log_path():
-    """로그 저장 경로 반환"""
-    config = get_config()
-    paths = config.get('paths', {})
-    return os.path.expanduser(paths.get('log', '~/.claude/daily-work'))
-
-
-def get_summary_path():
-    """요약 저장 경로 반환"""
-    config = get_config()
-    paths = config.get('paths', {})
-    return os.path.expanduser(paths.get('summary', '~/.claude/daily-summaries'))
+# 이 날짜 수 이상일 때만 프로세스 풀로 병렬 파싱 (적으면 풀 생성 비용이 더 큼)
+PARALLEL_MIN_DAYS = 14
 
+WEEKDAYS = ['월', '화', '수', '목', '금', '토', '일']
 
-def get_daily_log(date_str=None):
-    """일일 로그 파일 읽기"""
-    if date_str is None:
-        date_str = datetime.now().strftime('%Y-%m-%d')
+# 요약 추출 패턴 (미리 컴파일)
+TRAILING_PAREN = re.compile(r'\s*\([^)]*\)\s*$')
+SENSITIVE_PATTERN = re.compile(r'(ntn_|secret_|sk-|api[_-]?key)', re.I)
+COMMAND_PATTERN = re.compile(r'(.+?)\s*(?:해줘|해봐|추가해|만들어|수정해|삭제해|설정해|확인해)\.?$')
 
-    log_dir = get_log_path()
-    log_path = os.path.join(log_dir, f'{date_str}.md')
+# 설정에서 읽은 작업 분류기 (처음 쓸 때 로드)
+_classifier = None
 
-    if not os.path.exists(log_path):
-        return None, date_str
+# 요약 규칙이 바뀌면 올려서 기존 요약 캐시를 무효화
+SUMMARY_CACHE_VERSION = 1
 
-    with open(log_path, 'r', encoding='utf-8') as f:
-        return f.read(), date_str
+# --format에 쉼표로 여러 개 또는 all (sync: sync-notion.py와 같은 Notion API 동기화)
+OUTPUT_FORMATS = ['markdown', 'notion', 'json', 'sync']
 
+# --watch: 마지막 기록 후 이 시간(ms) 동안 조용하면 요약 저장
+WATCH_DEBOUNCE_MS = 500
+# --watch: 기록이 계속 들어와도 debounce의 이 배수만큼 지나면 저장
+WATCH_MAX_DELAY_FACTOR = 10
 
-def parse_daily_log(content):
-    """마크다운 로그를 구조화된 데이터로 파싱"""
-    if not content:
-        return []
 
-    projects = []
-    current_project = None
-
-    lines = content.split('\n')
-
-    for line in lines:
-        # 프로젝트 섹션 시작
-        if line.startswith('## '):
-            project_match = re.match(r'## 🔹 (.+)', line)
-            if project_match:
-                if current_project:
-                    projects.append(current_project)
-                current_project = {
-                    'name': project_match.group(1),
-                    'path': '',
-                    'tasks': []
-                }
-
-        # 프로젝트 경로
-        elif line.startswith('> `') and current_project:
-            path_match = re.match(r'> `(.+)`', line)
-            if path_match:
-                current_project['path'] = path_match.group(1)
-
-        # 작업 항목
-        elif line.startswith('- **[') and current_project:
-            task_match = re.match(r'- \*\*\[(\d+:\d+)\]\*\* (.+)', line)
-            if task_match:
-                current_project['tasks'].append({
-                    'time': task_match.group(1),
-                    'content': task_match.group(2)
-                })
-
-    if current_project:
-        projects.append(current_project)
-
-    return projects
+def get_config():
+    """정규화된 설정 (없으면 기본값)"""
+    return load_config() or normalize({})
 
 
 def extract_task_summary(content, max_len=30):
@@ -106,7 +73,7 @@ def extract_task_summary(content, max_len=30):
         summary_part = content.split('→')[-1].strip()
         if summary_part:
             # 괄호 제거
-            clean = re.sub(r'\s*\([^)]*\)\s*$', '', summary_part).strip()
+            clean = TRAILING_PAREN.sub('', summary_part).strip()
             if len(clean) > max_len:
                 return clean[:max_len-3] + '...'
             return clean
@@ -116,92 +83,148 @@ def extract_task_summary(content, max_len=30):
         return None
 
     # 명령형 패턴 확인 ("XXX 해봐", "XXX 추가해", "XXX 만들어")
-    command_patterns = [
-        r'(.+?)\s*(?:해줘|해봐|추가해|만들어|수정해|삭제해|설정해|확인해)\.?$',
-    ]
-    for pattern in command_patterns:
-        match = re.search(pattern, content)
-        if match:
-            extracted = match.group(1).strip()
-            if len(extracted) > 5:
-                if len(extracted) > max_len:
-                    return extracted[:max_len-3] + '...'
-                return extracted
+    match = COMMAND_PATTERN.search(content)
+    if match:
+        extracted = match.group(1).strip()
+        if len(extracted) > 5:
+            if len(extracted) > max_len:
+                return extracted[:max_len-3] + '...'
+            return extracted
 
     # 명령형이 아니면 None
     return None
 
 
+def get_classifier():
+    """설정의 분류 기준으로 만든 작업 분류기 (한 번만 로드)"""
+    global _classifier
+    if _classifier is None:
+        _classifier = load_classifier(get_config())
+    return _classifier
+
+
 def categorize_task(content):
-    """작업 내용을 카테고리로 분류"""
-    content_lower = content.lower()
-
-    if any(k in content for k in ['설정', '설치', 'setup', 'config', 'install']):
-        return '설정'
-    if any(k in content for k in ['노션', 'notion', 'mcp', 'api', '연동', '동기화', 'sync']):
-        return 'Notion 연동'
-    if any(k in content for k in ['테스트', 'test', '확인', '검증']):
-        return '테스트'
-    if any(k in content for k in ['문서', 'readme', 'docs', '매뉴얼', 'manual']):
-        return '문서 작성'
-    if any(k in content for k in ['수정', '변경', '개선', 'fix', 'update', '버그']):
-        return '수정/개선'
-    if any(k in content for k in ['추가', '생성', '만들', 'add', 'create', 'new']):
-        return '기능 추가'
-    if any(k in content for k in ['삭제', '제거', 'delete', 'remove']):
-        return '삭제'
-    return None
+    """작업 내용을 카테고리로 분류 (settings.categories, 없으면 기본 분류)"""
+    return classify(content, get_classifier())
 
 
-def generate_project_summary(project):
-    """프로젝트별 요약 생성 - 구체적인 작업 내용 포함"""
-    task_count = len(project['tasks'])
+def new_project_state():
+    """프로젝트 요약 누적 상태 (작업을 하나씩 더하면서 요약을 갱신할 때 사용)"""
+    return {'task_count': 0, 'arrow_summaries': [], 'seen': set(), 'categories': set()}
 
-    # "→" 있는 항목만 구체적으로 표시 (Claude 요약)
-    arrow_summaries = []
-    categories = set()
-    seen = set()
 
-    for task in project['tasks']:
-        content = task['content']
-
-        if '→' in content:
-            # "→" 뒤의 요약 추출
-            summary_part = content.split('→')[-1].strip()
-            if summary_part and len(summary_part) > 3:
-                # 괄호 안 내용 제거
-                clean_summary = re.sub(r'\s*\([^)]*\)\s*$', '', summary_part).strip()
-                # 민감정보 필터링 (API 키, 토큰 등)
-                if re.search(r'(ntn_|secret_|sk-|api[_-]?key)', clean_summary, re.I):
-                    continue
-                if clean_summary and clean_summary not in seen:
-                    seen.add(clean_summary)
-                    if len(clean_summary) > 28:
-                        clean_summary = clean_summary[:25] + '...'
-                    arrow_summaries.append(clean_summary)
-        else:
-            # "→" 없으면 카테고리만 수집
-            cat = categorize_task(content)
-            if cat:
-                categories.add(cat)
+def add_task_to_state(state, content):
+    """작업 하나를 요약 상태에 반영"""
+    state['task_count'] += 1
 
+    if '→' in content:
+        # "→" 뒤의 요약 추출
+        summary_part = content.split('→')[-1].strip()
+        if summary_part and len(summary_part) > 3:
+            # 괄호 안 내용 제거
+            clean_summary = TRAILING_PAREN.sub('', summary_part).strip()
+            # 민감정보 필터링 (API 키, 토큰 등)
+            if SENSITIVE_PATTERN.search(clean_summary):
+                return
+            # 앞의 3개만 쓰이므로 더 모으지 않음
+            if clean_summary and clean_summary not in state['seen'] and len(state['arrow_summaries']) < 3:
+                state['seen'].add(clean_summary)
+                if len(clean_summary) > 28:
+                    clean_summary = clean_summary[:25] + '...'
+                state['arrow_summaries'].append(clean_summary)
+    else:
+        # "→" 없으면 카테고리만 수집
+        cat = categorize_task(content)
+        if cat:
+            state['categories'].add(cat)
+
+
+def finish_project_summary(state):
+    """요약 상태 → {'task_count', 'keywords'}"""
     # 결과: "→" 요약 우선, 부족하면 카테고리 추가
-    summaries = arrow_summaries[:3]
-    if len(summaries) < 2 and categories:
+    summaries = list(state['arrow_summaries'][:3])
+    if len(summaries) < 2 and state['categories']:
         remaining = 3 - len(summaries)
-        summaries.extend(list(categories)[:remaining])
+        summaries.extend(list(state['categories'])[:remaining])
 
     if not summaries:
         summaries = ['질의응답']
 
     return {
-        'task_count': task_count,
+        'task_count': state['task_count'],
         'keywords': summaries[:3]
     }
 
 
-def generate_markdown_summary(projects, date_str):
-    """Markdown 형식 요약 생성"""
+def generate_project_summary(project):
+    """프로젝트별 요약 생성 - 구체적인 작업 내용 포함"""
+    state = new_project_state()
+    for task in project['tasks']:
+        add_task_to_state(state, task['content'])
+    return finish_project_summary(state)
+
+
+def combine_summaries(project_summaries):
+    """프로젝트별 요약과 전체 주요 작업을 summarize_projects 형식으로"""
+    all_keywords = []
+    for summary in project_summaries:
+        all_keywords.extend(summary['keywords'])
+    return {
+        'projects': project_summaries,
+        'keywords': list(dict.fromkeys(all_keywords))[:5]
+    }
+
+
+def summarize_projects(projects):
+    """프로젝트별 요약과 전체 주요 작업을 한 번에 계산 (모든 렌더러가 재사용)"""
+    return combine_summaries([generate_project_summary(project) for project in projects])
+
+
+def summary_hash(projects):
+    """파싱된 하루치 기록 + 분류 기준의 해시 (요약 캐시 키)"""
+    classifier = get_classifier()
+    data = json.dumps(
+        [SUMMARY_CACHE_VERSION, classifier['names'], classifier['priority'], projects],
+        ensure_ascii=False, sort_keys=True
+    )
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def _summary_cache_path(log_dir, date_str):
+    """요약 캐시 경로 (파싱 캐시와 같은 디렉토리)"""
+    return os.path.join(log_dir, CACHE_DIRNAME, f'{date_str}.summary.json')
+
+
+def save_summary_cache(log_dir, date_str, cache):
+    """요약 캐시 저장 (실패해도 무시)"""
+    try:
+        atomic_write_text(_summary_cache_path(log_dir, date_str), json.dumps(cache, ensure_ascii=False))
+    except OSError:
+        pass
+
+
+def load_day_summary(log_dir, date_str, projects):
+    """하루치 요약 (기록이 그대로면 캐시 재사용). (요약, 캐시) 반환"""
+    key = summary_hash(projects)
+    path = _summary_cache_path(log_dir, date_str)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('hash') == key:
+                return cache['summary'], cache
+        except Exception:
+            pass
+
+    cache = {'hash': key, 'summary': summarize_projects(projects)}
+    save_summary_cache(log_dir, date_str, cache)
+    return cache['summary'], cache
+
+
+def generate_markdown_summary(projects, date_str, summary=None, activity=None):
+    """Markdown 형식 요약 생성 (summary: summarize_projects 결과, 없으면 계산, activity: 활동 시간 결과)"""
+    summary = summary or summarize_projects(projects)
+    active = (activity or {}).get('projects', {})
     lines = []
     lines.append(f"# 📅 {date_str} 일일 작업 요약\n")
     lines.append(f"생성 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
@@ -209,7 +232,7 @@ def generate_markdown_summary(projects, date_str):
 
     total_tasks = 0
 
-    for project in projects:
+    for project, project_summary in zip(projects, summary['projects']):
         lines.append(f"## 🔹 {project['name']}")
         if project['path']:
             lines.append(f"> `{project['path']}`\n")
@@ -219,8 +242,10 @@ def generate_markdown_summary(projects, date_str):
             total_tasks += 1
 
         # 프로젝트별 요약
-        summary = generate_project_summary(project)
-        lines.append(f"\n> 📊 **요약**: {summary['task_count']}개 대화 | 주요 작업: {', '.join(summary['keywords'])}")
+        line = f"\n> 📊 **요약**: {project_summary['task_count']}개 대화 | 주요 작업: {', '.join(project_summary['keywords'])}"
+        if project['name'] in active:
+            line += f" | 활동: {format_duration(active[project['name']]['active_seconds'])}"
+        lines.append(line)
         lines.append("")
 
     # 전체 요약
@@ -230,31 +255,29 @@ def generate_markdown_summary(projects, date_str):
     lines.append(f"- **총 대화**: {total_tasks}개")
 
     # 전체 주요 작업
-    all_keywords = []
-    for project in projects:
-        summary = generate_project_summary(project)
-        all_keywords.extend(summary['keywords'])
-    all_keywords = list(dict.fromkeys(all_keywords))[:5]
-    lines.append(f"- **주요 작업**: {', '.join(all_keywords)}")
+    lines.append(f"- **주요 작업**: {', '.join(summary['keywords'])}")
+
+    if activity and activity['prompts']:
+        lines.append(
+            f"- **활동 시간**: {format_duration(activity['active_seconds'])} "
+            f"(세션 {activity['sessions']}개, {activity['first']} ~ {activity['last']})"
+        )
 
     return '\n'.join(lines)
 
 
-def generate_notion_blocks(projects, date_str):
+def generate_notion_blocks(projects, date_str, summary=None):
     """Notion API 블록 형식 생성 (toggle 블록으로 날짜별 정리)"""
+    summary = summary or summarize_projects(projects)
 
     # 전체 통계 계산
     total_tasks = sum(len(p['tasks']) for p in projects)
-    all_keywords = []
-    for project in projects:
-        proj_summary = generate_project_summary(project)
-        all_keywords.extend(proj_summary['keywords'])
-    all_keywords = list(dict.fromkeys(all_keywords))[:5]
+    all_keywords = summary['keywords']
 
     # 내부 블록 (toggle 안에 들어갈 내용)
     children_blocks = []
 
-    for project in projects:
+    for project, project_summary in zip(projects, summary['projects']):
         # 프로젝트 제목
         children_blocks.append({
             "type": "heading_3",
@@ -285,11 +308,10 @@ def generate_notion_blocks(projects, date_str):
             })
 
         # 프로젝트별 요약
-        summary = generate_project_summary(project)
         children_blocks.append({
             "type": "callout",
             "callout": {
-                "rich_text": [{"type": "text", "text": {"content": f"📊 요약: {summary['task_count']}개 대화 | 주요 작업: {', '.join(summary['keywords'])}"}}],
+                "rich_text": [{"type": "text", "text": {"content": f"📊 요약: {project_summary['task_count']}개 대화 | 주요 작업: {', '.join(project_summary['keywords'])}"}}],
                 "icon": {"emoji": "📊"}
             }
         })
@@ -346,8 +368,9 @@ def generate_notion_blocks(projects, date_str):
     return [toggle_block]
 
 
-def generate_notion_blocks_flat(projects, date_str):
+def generate_notion_blocks_flat(projects, date_str, summary=None):
     """Notion API 블록 형식 생성 (toggle 없이 평면 구조)"""
+    summary = summary or summarize_projects(projects)
     blocks = []
 
     # 헤더
@@ -365,7 +388,7 @@ def generate_notion_blocks_flat(projects, date_str):
 
     total_tasks = 0
 
-    for project in projects:
+    for project, project_summary in zip(projects, summary['projects']):
         # 프로젝트 제목
         blocks.append({
             "type": "heading_3",
@@ -397,11 +420,10 @@ def generate_notion_blocks_flat(projects, date_str):
             total_tasks += 1
 
         # 프로젝트별 요약
-        summary = generate_project_summary(project)
         blocks.append({
             "type": "callout",
             "callout": {
-                "rich_text": [{"type": "text", "text": {"content": f"📊 요약: {summary['task_count']}개 대화 | 주요 작업: {', '.join(summary['keywords'])}"}}],
+                "rich_text": [{"type": "text", "text": {"content": f"📊 요약: {project_summary['task_count']}개 대화 | 주요 작업: {', '.join(project_summary['keywords'])}"}}],
                 "icon": {"emoji": "📊"}
             }
         })
@@ -420,11 +442,7 @@ def generate_notion_blocks_flat(projects, date_str):
     })
 
     # 전체 주요 작업
-    all_keywords = []
-    for project in projects:
-        proj_summary = generate_project_summary(project)
-        all_keywords.extend(proj_summary['keywords'])
-    all_keywords = list(dict.fromkeys(all_keywords))[:5]
+    all_keywords = summary['keywords']
 
     blocks.append({
         "type": "bulleted_list_item",
@@ -450,73 +468,643 @@ def generate_notion_blocks_flat(projects, date_str):
     return blocks
 
 
+def resolve_range(args):
+    """--from/--to, --week, --month 인자에서 (시작일, 종료일) 계산 (기간 지정이 없으면 None)"""
+    if args.month:
+        start = datetime.strptime(args.month, '%Y-%m')
+        next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return start.strftime('%Y-%m-%d'), (next_month - timedelta(days=1)).strftime('%Y-%m-%d')
+
+    if args.week:
+        end = datetime.strptime(args.date, '%Y-%m-%d') if args.date else datetime.now()
+        return (end - timedelta(days=6)).strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+    if args.from_date or args.to_date:
+        start = datetime.strptime(args.from_date or args.to_date, '%Y-%m-%d')
+        end = datetime.strptime(args.to_date, '%Y-%m-%d') if args.to_date else datetime.now()
+        return start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+    return None
+
+
+def summarize_day(task):
+    """하루치 프로젝트별 요약 (프로세스 풀 작업 단위, 작업 목록 대신 요약만 반환)"""
+    log_dir, date_str, backend = task
+    projects = load_day_projects(log_dir, date_str, backend)
+    summary, _ = load_day_summary(log_dir, date_str, projects) if projects else ({'projects': []}, None)
+    return {
+        'date': date_str,
+        'projects': [
+            {
+                'name': project['name'],
+                'path': project['path'],
+                'task_count': project_summary['task_count'],
+                'keywords': project_summary['keywords']
+            }
+            for project, project_summary in zip(projects, summary['projects'])
+        ]
+    }
+
+
+def collect_range(start, end, backend='files', workers=None):
+    """기간 안의 기록이 있는 날짜를 (많으면 병렬로) 파싱해 날짜순 요약 목록 반환"""
+    log_dir = get_log_dir()
+    dates = list_log_dates(log_dir, backend, start, end)
+    tasks = [(log_dir, d, backend) for d in dates]
+
+    if len(tasks) < PARALLEL_MIN_DAYS:
+        days = [summarize_day(task) for task in tasks]
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            days = list(executor.map(summarize_day, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    return [day for day in days if day['projects']]
+
+
+def merge_range(days):
+    """날짜별 요약을 프로젝트별로 합치기 (주요 작업은 여러 날 자주 나온 순)"""
+    merged = {}
+    for day in days:
+        for project in day['projects']:
+            entry = merged.setdefault(project['name'], {
+                'name': project['name'],
+                'path': project['path'],
+                'task_count': 0,
+                'active_days': 0,
+                'keyword_counts': {}
+            })
+            entry['task_count'] += project['task_count']
+            entry['active_days'] += 1
+            for keyword in project['keywords']:
+                entry['keyword_counts'][keyword] = entry['keyword_counts'].get(keyword, 0) + 1
+
+    projects = []
+    for entry in merged.values():
+        counts = entry.pop('keyword_counts')
+        entry['keywords'] = sorted(counts, key=lambda k: -counts[k])[:3]
+        projects.append(entry)
+
+    projects.sort(key=lambda p: -p['task_count'])
+    return projects
+
+
+def range_title(start, end):
+    """기간 보고서 제목"""
+    days = (datetime.strptime(end, '%Y-%m-%d') - datetime.strptime(start, '%Y-%m-%d')).days + 1
+    if days <= 7:
+        return f"주간 작업 요약 ({start} ~ {end})"
+    if start.endswith('-01') and start[:7] == end[:7]:
+        return f"{start[:7]} 월간 작업 요약"
+    return f"기간 작업 요약 ({start} ~ {end})"
+
+
+def _activity_suffix(item, separator=', '):
+    """활동 시간이 있으면 표시 문자열"""
+    if 'active_seconds' not in item:
+        return ''
+    return f"{separator}활동 {format_duration(item['active_seconds'])}"
+
+
+def generate_range_markdown(days, projects, start, end, activity=None):
+    """기간 보고서 Markdown 생성 (activity: summarize_activity 결과, 있으면 활동 시간 표시)"""
+    lines = [f"# 📅 {range_title(start, end)}\n"]
+
+    for day in reversed(days):
+        weekday = WEEKDAYS[datetime.strptime(day['date'], '%Y-%m-%d').weekday()]
+        lines.append(f"## {day['date']} ({weekday}){_activity_suffix(day, ' · ')}")
+        for project in day['projects']:
+            lines.append(
+                f"- **{project['name']}**: {', '.join(project['keywords'])} "
+                f"({project['task_count']}회{_activity_suffix(project)})"
+            )
+        lines.append("")
+
+    lines.append("---")
+    lines.append("## 🔹 프로젝트별")
+    for project in projects:
+        lines.append(
+            f"- **{project['name']}**: {project['task_count']}회 ({project['active_days']}일"
+            f"{_activity_suffix(project)}) | 주요 작업: {', '.join(project['keywords'])}"
+        )
+
+    if activity and len(activity['weeks']) > 1:
+        lines.append("")
+        lines.append("## ⏱️ 주별 활동 시간")
+        for monday, week in sorted(activity['weeks'].items()):
+            lines.append(f"- **{monday} 주**: {format_duration(week['active_seconds'])}")
+
+    lines.append("")
+    lines.append("📊 기간 통계")
+    lines.append(f"- 총 작업일: {len(days)}일")
+    lines.append(f"- 작업한 프로젝트: {len(projects)}개")
+    lines.append(f"- 총 대화 횟수: {sum(p['task_count'] for p in projects)}회")
+    if activity:
+        lines.append(f"- 총 활동 시간: {format_duration(activity['active_seconds'])} (세션 {activity['sessions']}개)")
+
+    return '\n'.join(lines)
+
+
+def generate_range_notion_blocks(days, projects, start, end):
+    """기간 보고서 Notion 블록 생성 (toggle 블록 하나)"""
+    children_blocks = []
+
+    for day in days:
+        weekday = WEEKDAYS[datetime.strptime(day['date'], '%Y-%m-%d').weekday()]
+        children_blocks.append({
+            "type": "heading_3",
+            "heading_3": {
+                "rich_text": [{"type": "text", "text": {"content": f"{day['date']} ({weekday})"}}]
+            }
+        })
+        for project in day['projects']:
+            children_blocks.append({
+                "type": "bulleted_list_item",
+                "bulleted_list_item": {
+                    "rich_text": [
+                        {"type": "text", "text": {"content": f"{project['name']}: "}, "annotations": {"bold": True}},
+                        {"type": "text", "text": {"content": f"{', '.join(project['keywords'])} ({project['task_count']}회)"}}
+                    ]
+                }
+            })
+
+    children_blocks.append({
+        "type": "divider",
+        "divider": {}
+    })
+
+    children_blocks.append({
+        "type": "heading_3",
+        "heading_3": {
+            "rich_text": [{"type": "text", "text": {"content": "📊 프로젝트별"}}]
+        }
+    })
+
+    for project in projects:
+        children_blocks.append({
+            "type": "bulleted_list_item",
+            "bulleted_list_item": {
+                "rich_text": [{"type": "text", "text": {"content": f"{project['name']}: {project['task_count']}회 ({project['active_days']}일) | 주요 작업: {', '.join(project['keywords'])}"}}]
+            }
+        })
+
+    total_tasks = sum(p['task_count'] for p in projects)
+    toggle_block = {
+        "type": "toggle",
+        "toggle": {
+            "rich_text": [
+                {"type": "text", "text": {"content": f"📅 {range_title(start, end)}"}, "annotations": {"bold": True}},
+                {"type": "text", "text": {"content": f" | {len(days)}일 | {len(projects)}개 프로젝트 | {total_tasks}개 대화"}}
+            ],
+            "children": children_blocks
+        }
+    }
+
+    return [toggle_block]
+
+
+def attach_activity(days, projects, results):
+    """날짜별/프로젝트별 요약에 활동 시간(초) 추가"""
+    totals = {}
+    for day in days:
+        result = results.get(day['date'])
+        if not result:
+            continue
+        day['active_seconds'] = result['active_seconds']
+        for project in day['projects']:
+            seconds = result['projects'].get(project['name'], {}).get('active_seconds', 0)
+            project['active_seconds'] = seconds
+            totals[project['name']] = totals.get(project['name'], 0) + seconds
+    for project in projects:
+        project['active_seconds'] = totals.get(project['name'], 0)
+
+
+def run_range_report(args, start, end):
+    """기간 보고서 출력"""
+    config = get_config()
+    backend = config['storage']['backend']
+    days = collect_range(start, end, backend, workers=args.workers)
+
+    if not days:
+        result = {
+            "success": False,
+            "error": f"{start} ~ {end} 기간의 작업 기록이 없습니다.",
+            "from": start,
+            "to": end
+        }
+        print(json.dumps(result, ensure_ascii=False))
+        sys.exit(1)
+
+    projects = merge_range(days)
+    total_tasks = sum(p['task_count'] for p in projects)
+
+    # 활동 시간은 전날에서 이어지는 세션 때문에 날짜 순서대로 계산 (바뀌지 않은 날짜는 캐시 사용)
+    results = load_activity(get_log_dir(config), [day['date'] for day in days], backend, config)
+    attach_activity(days, projects, results)
+    activity = summarize_activity(results)
+
+    if args.format == 'markdown':
+        summary = generate_range_markdown(days, projects, start, end, activity)
+        if args.save:
+            saved_path = save_local_summary(summary, f'{start}_{end}')
+            result = {
+                "success": True,
+                "from": start,
+                "to": end,
+                "days_count": len(days),
+                "projects_count": len(projects),
+                "saved_path": saved_path,
+                "format": "markdown"
+            }
+            print(json.dumps(result, ensure_ascii=False))
+        else:
+            print(summary)
+
+    elif args.format == 'notion':
+        result = {
+            "success": True,
+            "from": start,
+            "to": end,
+            "days_count": len(days),
+            "projects_count": len(projects),
+            "total_tasks": total_tasks,
+            "blocks": generate_range_notion_blocks(days, projects, start, end),
+            "format": "notion"
+        }
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    elif args.format == 'json':
+        result = {
+            "success": True,
+            "from": start,
+            "to": end,
+            "days_count": len(days),
+            "projects_count": len(projects),
+            "total_tasks": total_tasks,
+            "days": days,
+            "projects": projects,
+            "activity": activity,
+            "format": "json"
+        }
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+def parse_formats(value):
+    """--format 값 → 출력 목록 (all이면 전부, 쉼표로 여러 개). 알 수 없는 형식이면 ValueError"""
+    names = OUTPUT_FORMATS if value == 'all' else [name.strip() for name in value.split(',') if name.strip()]
+    if not names or any(name not in OUTPUT_FORMATS for name in names):
+        raise ValueError(value)
+    return list(dict.fromkeys(names))
+
+
+def _elapsed_ms(mark):
+    """mark 이후 경과 시간(ms)과 새 기준 시각"""
+    now = time.perf_counter()
+    return round((now - mark) * 1000, 3), now
+
+
+def load_sync_module():
+    """sync-notion.py를 모듈로 로드 (파일명에 '-'가 있어 경로로 로드)"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sync-notion.py')
+    spec = importlib.util.spec_from_file_location('sync_notion', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def get_summary_file(date_str):
+    """로컬 요약 파일 경로"""
+    return os.path.join(get_summary_dir(), f'{date_str}-summary.md')
+
+
 def save_local_summary(summary_content, date_str):
     """로컬 요약 파일 저장 (설정된 경로 사용)"""
-    summary_dir = get_summary_path()
+    summary_dir = get_summary_dir()
     os.makedirs(summary_dir, exist_ok=True)
 
-    summary_path = os.path.join(summary_dir, f'{date_str}-summary.md')
+    summary_path = get_summary_file(date_str)
 
-    with open(summary_path, 'w', encoding='utf-8') as f:
-        f.write(summary_content)
+    atomic_write_text(summary_path, summary_content)
 
     return summary_path
 
 
+def save_day_summary(log_dir, date_str, projects, day_summary, cache, activity):
+    """하루 요약을 로컬에 저장 (기록과 활동 시간이 마지막 저장 때와 같으면 건너뜀). (경로, 변경 없음 여부) 반환"""
+    saved_path = get_summary_file(date_str)
+    unchanged = (
+        cache.get('saved_path') == saved_path
+        and cache.get('saved_hash') == cache['hash']
+        and cache.get('saved_activity') == activity
+        and os.path.exists(saved_path)
+    )
+    if not unchanged:
+        save_local_summary(generate_markdown_summary(projects, date_str, day_summary, activity), date_str)
+        cache['saved_path'] = saved_path
+        cache['saved_hash'] = cache['hash']
+        cache['saved_activity'] = activity
+        save_summary_cache(log_dir, date_str, cache)
+    return saved_path, unchanged
+
+
+def run_outputs(args, formats, config, projects, date_str, timings, started):
+    """한 번 읽고 요약한 결과로 여러 출력을 만들고 단계별 소요 시간(ms)과 함께 JSON 하나로 출력
+    markdown: 요약 파일 저장, notion: 블록, json: 프로젝트/활동 시간, sync: Notion API 동기화"""
+    log_dir = get_log_dir(config)
+    mark = time.perf_counter()
+    day_summary, cache = load_day_summary(log_dir, date_str, projects)
+    timings['summary'], mark = _elapsed_ms(mark)
+    activity = load_activity(log_dir, [date_str], config['storage']['backend'], config)[date_str]
+    timings['activity'], mark = _elapsed_ms(mark)
+
+    success = True
+    outputs = {}
+    for name in formats:
+        if name == 'markdown':
+            saved_path, unchanged = save_day_summary(log_dir, date_str, projects, day_summary, cache, activity)
+            outputs['markdown'] = {"saved_path": saved_path, "unchanged": unchanged}
+        elif name == 'notion':
+            outputs['notion'] = {"blocks": generate_notion_blocks(projects, date_str, day_summary)}
+        elif name == 'json':
+            outputs['json'] = {"projects": projects, "activity": activity}
+        elif not config['notion'].get('enabled', False):
+            # all에 포함된 경우는 건너뛰고, 직접 요청했으면 실패로 표시
+            outputs['sync'] = {"skipped": True, "error": "Notion 연동이 비활성화되어 있습니다."}
+            success = success and args.format == 'all'
+        else:
+            outputs['sync'] = load_sync_module().sync_date(projects, date_str, config, dry_run=args.dry_run)
+            success = success and bool(outputs['sync'].get('success'))
+        timings[name], mark = _elapsed_ms(mark)
+
+    timings['total'], _ = _elapsed_ms(started)
+    result = {
+        "success": success,
+        "date": date_str,
+        "projects_count": len(projects),
+        "total_tasks": sum(len(p['tasks']) for p in projects),
+        "outputs": outputs,
+        "timings_ms": timings,
+        "format": formats
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if not success:
+        sys.exit(1)
+
+
+def new_watch_day(log_dir, date_str):
+    """--watch 상태: 하루치 프로젝트/작업, 프로젝트별 요약 상태, 저널 읽은 위치"""
+    day = {
+        'date': date_str,
+        'journal': journal_path(log_dir, date_str),
+        'projects': [],
+        'by_name': {},
+        'states': {},
+        'summaries': {},
+        'records': [],
+        'offset': 0,
+        'inode': None
+    }
+    # 보관분과 예전 마크다운은 더 바뀌지 않으므로 처음에 한 번만 읽음
+    add_watch_records(day, daily_archive.iter_archived_records(log_dir, date_str))
+    md_path = markdown_path(log_dir, date_str)
+    if os.path.exists(md_path):
+        with open(md_path, 'r', encoding='utf-8') as f:
+            add_watch_records(day, iter_markdown_records(f))
+    return day
+
+
+def add_watch_records(day, records):
+    """기록을 해당 프로젝트의 작업 목록과 요약 상태에 더함 (바뀐 프로젝트 요약만 다시 계산)"""
+    touched = set()
+    for record in records:
+        name = record['project']
+        if name not in day['by_name']:
+            day['by_name'][name] = {'name': name, 'path': record.get('path', ''), 'tasks': []}
+            day['projects'].append(day['by_name'][name])
+            day['states'][name] = new_project_state()
+        content = record['prompt'].split('\n', 1)[0]
+        day['by_name'][name]['tasks'].append({'time': record['time'], 'content': content})
+        add_task_to_state(day['states'][name], content)
+        day['records'].append(record)
+        touched.add(name)
+    for name in touched:
+        day['summaries'][name] = finish_project_summary(day['states'][name])
+
+
+def read_appended(day):
+    """저널에서 마지막으로 읽은 뒤 추가된 완성된 줄만 읽어서 기록 목록 반환
+    파일이 줄었거나 바뀌었으면(inode) None (처음부터 다시 읽어야 함)"""
+    try:
+        f = open(day['journal'], 'rb')
+    except FileNotFoundError:
+        return None if day['offset'] else []
+    with f:
+        stat = os.fstat(f.fileno())
+        if day['inode'] is not None and (stat.st_ino != day['inode'] or stat.st_size < day['offset']):
+            return None
+        day['inode'] = stat.st_ino
+        f.seek(day['offset'])
+        data = f.read()
+    # 쓰는 도중인 마지막 줄은 다음에 읽음
+    complete = data[:data.rfind(b'\n') + 1]
+    day['offset'] += len(complete)
+    return list(iter_journal_lines(complete.decode('utf-8', errors='replace').splitlines(keepends=True)))
+
+
+def render_watch_day(day, carry_in, params):
+    """현재 상태로 요약 Markdown 생성 (프로젝트 요약은 누적된 것 사용, 활동 시간은 메모리의 기록으로 계산)"""
+    summary = combine_summaries([day['summaries'][project['name']] for project in day['projects']])
+    activity, _ = daily_activity.compute_day(day['records'], day['date'], carry_in, params)
+    return generate_markdown_summary(day['projects'], day['date'], summary, activity)
+
+
+def _interrupt(signum, frame):
+    """SIGTERM도 Ctrl+C처럼 처리"""
+    raise KeyboardInterrupt
+
+
+def run_watch(args):
+    """기록이 추가될 때마다 저장된 요약을 갱신 (추가된 부분만 읽고, 몰려 들어오면 한 번만 저장)"""
+    config = get_config()
+    backend = config['storage']['backend']
+    if backend == 'sqlite':
+        print(json.dumps({"success": False, "error": "SQLite 저장소는 --watch를 지원하지 않습니다."}, ensure_ascii=False))
+        sys.exit(1)
+
+    log_dir = get_log_dir(config)
+    params = daily_activity.get_params(config)
+    debounce = args.debounce / 1000
+    follow_today = not args.date
+
+    # 종료 신호를 받으면 남은 변경을 저장하고 끝냄
+    signal.signal(signal.SIGTERM, _interrupt)
+
+    def emit(event, day, **extra):
+        print(json.dumps({"event": event, "date": day['date'], "tasks": len(day['records']),
+                          "projects": len(day['projects']), **extra}, ensure_ascii=False), flush=True)
+
+    def save(day, carry_in, pending):
+        started = time.perf_counter()
+        saved_path = save_local_summary(render_watch_day(day, carry_in, params), day['date'])
+        emit('saved', day, new_tasks=pending, saved_path=saved_path,
+             render_ms=round((time.perf_counter() - started) * 1000, 2))
+
+    date_str = args.date or datetime.now().strftime('%Y-%m-%d')
+    day = watcher = carry_in = None
+    pending = 0
+    dirty = False
+    try:
+        while True:
+            day = new_watch_day(log_dir, date_str)
+            add_watch_records(day, read_appended(day) or [])
+            carry_in = daily_activity.carry_into(log_dir, date_str, backend, config)
+            watcher = open_watcher(day['journal'], interval=args.interval, polling=args.poll)
+            emit('watching', day, watcher=watcher.kind, journal=day['journal'])
+            if day['records']:
+                save(day, carry_in, len(day['records']))
+
+            pending = 0
+            dirty = False
+            first_change = last_change = None
+            while True:
+                timeout = debounce if dirty else 1.0
+                if watcher.wait(timeout):
+                    records = read_appended(day)
+                    rebuilt = records is None
+                    if rebuilt:
+                        # 파일이 바뀌었으면(삭제/교체/잘림) 처음부터 다시 읽고, 남은 기록이 없어도 요약을 다시 저장
+                        day = new_watch_day(log_dir, date_str)
+                        records = read_appended(day) or []
+                    if records:
+                        add_watch_records(day, records)
+                        pending += len(records)
+                    if rebuilt or records:
+                        dirty = True
+                        now = time.monotonic()
+                        first_change = first_change or now
+                        last_change = now
+
+                now = time.monotonic()
+                if dirty and (now - last_change >= debounce
+                              or now - first_change >= debounce * WATCH_MAX_DELAY_FACTOR):
+                    save(day, carry_in, pending)
+                    pending = 0
+                    dirty = False
+                    first_change = last_change = None
+
+                if follow_today and datetime.now().strftime('%Y-%m-%d') != date_str:
+                    if dirty:
+                        save(day, carry_in, pending)
+                    break
+
+            watcher.close()
+            watcher = None
+            date_str = datetime.now().strftime('%Y-%m-%d')
+    except KeyboardInterrupt:
+        if dirty:
+            save(day, carry_in, pending)
+        if day is not None:
+            emit('stopped', day)
+
+
 def main():
     import argparse
 
     parser = argparse.ArgumentParser(description='일일 요약 생성')
     parser.add_argument('--date', type=str, help='날짜 (YYYY-MM-DD)')
-    parser.add_argument('--format', type=str, choices=['markdown', 'notion', 'json'], default='markdown')
+    parser.add_argument('--format', type=str, default='markdown',
+                        help='markdown, notion, json 중 하나, 또는 쉼표로 여러 개/all (sync 포함 가능, 단계별 소요 시간 포함 JSON 출력)')
     parser.add_argument('--save', action='store_true', help='로컬에 저장')
     parser.add_argument('--output', type=str, help='출력 파일 경로')
+    parser.add_argument('--dry-run', action='store_true', help='--format에 sync가 있을 때 실제 전송 없이 확인')
 
-    args = parser.parse_args()
+    # 기간 보고서
+    parser.add_argument('--from', dest='from_date', type=str, help='시작 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='to_date', type=str, help='종료 날짜 (YYYY-MM-DD, 기본: 오늘)')
+    parser.add_argument('--week', action='store_true', help='최근 7일 (--date가 있으면 그 날짜까지)')
+    parser.add_argument('--month', type=str, nargs='?', const=datetime.now().strftime('%Y-%m'), help='월간 (YYYY-MM, 기본: 이번 달)')
+    parser.add_argument('--workers', type=int, help='병렬 파싱 프로세스 수 (기본: CPU 수)')
 
-    # 로그 읽기
-    content, date_str = get_daily_log(args.date)
+    # 실시간 갱신
+    parser.add_argument('--watch', action='store_true', help='기록이 추가될 때마다 저장된 요약 갱신 (--date가 없으면 날짜가 바뀌면 따라감)')
+    parser.add_argument('--debounce', type=int, default=WATCH_DEBOUNCE_MS, help='--watch: 마지막 기록 후 저장까지 대기 (ms)')
+    parser.add_argument('--poll', action='store_true', help='--watch: inotify 대신 주기적으로 확인')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help='--watch --poll: 확인 간격 (초)')
 
-    if not content:
-        result = {
-            "success": False,
-            "error": f"{date_str} 날짜의 작업 기록이 없습니다.",
-            "date": date_str
-        }
-        print(json.dumps(result, ensure_ascii=False))
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        formats = parse_formats(args.format)
+    except ValueError:
+        parser.error(f"--format: 알 수 없는 형식입니다: {args.format} (사용 가능: {', '.join(OUTPUT_FORMATS)}, all)")
+    multi = len(formats) > 1 or formats == ['sync']
+    if not multi:
+        args.format = formats[0]
+
+    if args.watch:
+        run_watch(args)
+        return
+
+    try:
+        date_range = resolve_range(args)
+    except ValueError:
+        print(json.dumps({"success": False, "error": "날짜 형식이 올바르지 않습니다. (YYYY-MM-DD / YYYY-MM)"}, ensure_ascii=False))
         sys.exit(1)
 
-    # 파싱
-    projects = parse_daily_log(content)
+    if date_range:
+        if multi:
+            print(json.dumps({"success": False, "error": "기간 보고서는 markdown, notion, json 중 하나만 지원합니다."}, ensure_ascii=False))
+            sys.exit(1)
+        run_range_report(args, *date_range)
+        return
+
+    # 로그 읽기 (파싱 결과 캐시 사용)
+    timings = {}
+    mark = time.perf_counter()
+    date_str = args.date or datetime.now().strftime('%Y-%m-%d')
+    config = get_config()
+    backend = config['storage']['backend']
+    log_dir = get_log_dir(config)
+    timings['config'], mark = _elapsed_ms(mark)
+    projects = load_day_projects(log_dir, date_str, backend)
+    timings['parse'], mark = _elapsed_ms(mark)
 
     if not projects:
         result = {
             "success": False,
-            "error": "파싱된 프로젝트가 없습니다.",
+            "error": f"{date_str} 날짜의 작업 기록이 없습니다.",
             "date": date_str
         }
         print(json.dumps(result, ensure_ascii=False))
         sys.exit(1)
 
+    if multi:
+        run_outputs(args, formats, config, projects, date_str, timings, started)
+        return
+
+    # 요약은 한 번만 계산 (기록이 그대로면 캐시 재사용)
+    day_summary, cache = load_day_summary(log_dir, date_str, projects)
+    activity = load_activity(log_dir, [date_str], backend, config)[date_str]
+
     # 형식에 따라 출력
     if args.format == 'markdown':
-        summary = generate_markdown_summary(projects, date_str)
-
         if args.save:
-            saved_path = save_local_summary(summary, date_str)
+            saved_path, unchanged = save_day_summary(log_dir, date_str, projects, day_summary, cache, activity)
             result = {
                 "success": True,
                 "date": date_str,
                 "projects_count": len(projects),
                 "saved_path": saved_path,
+                "unchanged": unchanged,
                 "format": "markdown"
             }
             print(json.dumps(result, ensure_ascii=False))
         else:
-            print(summary)
+            print(generate_markdown_summary(projects, date_str, day_summary, activity))
 
     elif args.format == 'notion':
-        blocks = generate_notion_blocks(projects, date_str)
+        blocks = generate_notion_blocks(projects, date_str, day_summary)
         total_tasks = sum(len(p['tasks']) for p in projects)
         result = {
             "success": True,
@@ -536,6 +1124,7 @@ def main():
             "projects_count": len(projects),
             "total_tasks": total_tasks,
             "projects": projects,
+            "activity": activity,
             "format": "json"
         }
         print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - Hook 클라이언트 (선택, 상주 로거를 쓸 때 hooks.json에서 log-daily.py 대신 지정)
+stdin의 Hook 데이터를 log-daemon.py로 넘기고 바로 종료
+데몬이 꺼져 있으면 log-daily.py와 같은 방식으로 직접 기록
+"""
+import os
+import socket
+import sys
+
+SOCKET_PATH = '~/.claude/daily-work-tracker/logger.sock'
+
+
+def forward(payload):
+    """데몬으로 전달 (연결/전송에 실패하면 False)"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(1.0)
+    try:
+        sock.connect(os.path.expanduser(SOCKET_PATH))
+        sock.sendall(payload)
+        sock.shutdown(socket.SHUT_WR)
+    except OSError:
+        sock.close()
+        return False
+
+    # 전송 이후에는 데몬이 이미 기록했을 수 있으므로 실패해도 직접 기록하지 않음
+    try:
+        sock.recv(2)
+    except OSError:
+        pass
+    sock.close()
+    return True
+
+
+def log_in_process(payload):
+    """데몬 없이 직접 기록 (log-daily.py와 동일)"""
+    import importlib.util
+    import json
+
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    spec = importlib.util.spec_from_file_location('log_daily', os.path.join(scripts_dir, 'log-daily.py'))
+    hook = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(hook)
+    hook.handle_payload(json.loads(payload))
+
+
+def main():
+    try:
+        payload = sys.stdin.buffer.read()
+        if not forward(payload):
+            log_in_process(payload)
+    except Exception:
+        # 에러가 나도 Claude Code 동작에 영향 없도록 조용히 처리
+        pass
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
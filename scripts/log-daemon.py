@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 상주 로거 (선택)
+Unix 소켓으로 Hook 데이터를 받아 기록해서, 프롬프트마다 Python 시작/모듈 로딩 비용을 없앰
+기본 Hook은 log-daily.py이고, 이 로거를 쓰려면 hooks.json의 명령을 log-client.py로 바꿈
+(데몬이 꺼져 있으면 log-client.py가 log-daily.py와 같은 방식으로 직접 기록)
+
+사용법:
+    python3 log-daemon.py &                       # 백그라운드 실행
+    python3 log-daemon.py --socket /tmp/x.sock    # 소켓 경로 지정
+"""
+import importlib.util
+import json
+import os
+import socket
+import socketserver
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOCKET = '~/.claude/daily-work-tracker/logger.sock'
+
+# 연결 하나가 멈춰도 다른 세션의 기록을 막지 않도록 읽기 시간(초)과 크기 제한
+READ_TIMEOUT = 2.0
+MAX_PAYLOAD_BYTES = 4 * 1024 * 1024
+
+
+def load_hook():
+    """log-daily.py 모듈 로드 (파일명에 '-'가 있어 import 대신 경로로 로드)"""
+    spec = importlib.util.spec_from_file_location('log_daily', os.path.join(SCRIPTS_DIR, 'log-daily.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def is_listening(socket_path):
+    """다른 데몬이 이미 소켓을 사용 중인지 확인"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+class HookHandler(socketserver.StreamRequestHandler):
+    """연결 하나 = Hook 데이터 하나"""
+
+    def setup(self):
+        self.request.settimeout(READ_TIMEOUT)
+        super().setup()
+
+    def handle(self):
+        try:
+            payload = self.rfile.read(MAX_PAYLOAD_BYTES + 1)
+        except OSError:
+            # 제한 시간 안에 보내지 않은 연결은 버림
+            return
+        if len(payload) > MAX_PAYLOAD_BYTES:
+            return
+        try:
+            self.server.hook.handle_payload(json.loads(payload))
+        except Exception:
+            # Hook과 같이 실패해도 조용히 넘어감
+            pass
+        try:
+            self.wfile.write(b'ok')
+        except OSError:
+            pass
+
+
+class HookServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """연결마다 스레드로 처리 (기록 파일은 각자 잠금으로 보호)"""
+
+    daemon_threads = True
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Daily Work Tracker 상주 로거')
+    parser.add_argument('--socket', type=str, default=DEFAULT_SOCKET, help='Unix 소켓 경로')
+
+    args = parser.parse_args()
+    socket_path = os.path.expanduser(args.socket)
+
+    if is_listening(socket_path):
+        print(json.dumps({"error": f"이미 실행 중입니다: {socket_path}"}, ensure_ascii=False))
+        sys.exit(1)
+
+    # 이전 실행에서 남은 소켓 파일 정리
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+
+    server = HookServer(socket_path, HookHandler)
+    server.hook = load_hook()
+    os.chmod(socket_path, 0o600)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,77 +1,302 @@
 #!/usr/bin/env python3
 """
 Daily Work Tracker - 여러 프로젝트의 작업을 날짜별로 기록
-저장 위치: 설정 파일에서 지정 (기본: ~/.claude/daily-work/YYYY-MM-DD.md)
+저장 위치: 설정 파일에서 지정 (기본: ~/.claude/daily-work/YYYY-MM-DD.jsonl)
 """
 import json
 import sys
 import os
+import re
+import time
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
+import daily_metrics
+from daily_config import get_log_dir, load_config, normalize
+from daily_store import append_record, atomic_write_text
+
 
 def get_config():
-    """설정 파일 로드"""
-    config_path = os.path.expanduser('~/.claude/daily-work-tracker/config.json')
-    if os.path.exists(config_path):
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            pass
-    return {}
+    """정규화된 설정 (없거나 읽을 수 없으면 기본값, 상주 로거에서는 바뀌었을 때만 다시 읽음)"""
+    return load_config() or normalize({})
+
+
+# 저장소/워크스페이스 루트 표시 파일
+ROOT_MARKERS = ('.git', '.hg', '.svn', 'pnpm-workspace.yaml', 'go.work')
+
+# 프로젝트 이름을 읽을 매니페스트 (우선순위 순)
+MANIFESTS = ('pubspec.yaml', 'package.json', 'pyproject.toml', 'Cargo.toml', 'go.mod')
+
+PROJECT_CACHE_PATH = '~/.claude/daily-work-tracker/project-cache.json'
+PROJECT_CACHE_LIMIT = 200
+
+# 상주 로거에서는 프로세스 메모리에 유지
+_project_cache = None
+
+
+def find_project_root(cwd):
+    """cwd에서 위로 올라가며 가장 가까운 저장소/워크스페이스 루트 탐색
+
+    반환: (루트 경로, 탐색한 디렉토리 목록). 루트가 없으면 cwd를 루트로 사용
+    """
+    visited = []
+    home = os.path.expanduser('~')
+    current = os.path.abspath(cwd)
+    while True:
+        # 홈 디렉토리(dotfiles 저장소 등)는 프로젝트 루트로 보지 않음
+        if current == home and current != os.path.abspath(cwd):
+            return os.path.abspath(cwd), visited
+        visited.append(current)
+        if any(os.path.exists(os.path.join(current, marker)) for marker in ROOT_MARKERS):
+            return current, visited
+        parent = os.path.dirname(current)
+        if parent == current:
+            return os.path.abspath(cwd), visited
+        current = parent
+
+
+def read_manifest_name(path):
+    """매니페스트 파일에서 프로젝트 이름 읽기 (없으면 None)"""
+    filename = os.path.basename(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if filename == 'package.json':
+            return json.load(f).get('name')
+
+        if filename == 'pubspec.yaml':
+            for line in f:
+                if line.startswith('name:'):
+                    return line.split(':')[1].strip()
+            return None
+
+        if filename == 'go.mod':
+            for line in f:
+                if line.startswith('module '):
+                    # 모듈 경로의 마지막 부분 사용 (github.com/user/repo -> repo)
+                    return line.split()[1].strip('"').rstrip('/').split('/')[-1]
+            return None
+
+        # pyproject.toml ([project] / [tool.poetry]), Cargo.toml ([package])
+        sections = ('[project]', '[tool.poetry]', '[package]')
+        in_section = False
+        for line in f:
+            line = line.strip()
+            if line.startswith('['):
+                in_section = line in sections
+            elif in_section and line.startswith('name') and '=' in line:
+                key, value = line.split('=', 1)
+                if key.strip() == 'name':
+                    return value.strip().strip('"\'')
+        return None
+
+
+def resolve_project(cwd):
+    """프로젝트 이름을 새로 계산 (캐시 검증에 쓸 stat 목록 포함)"""
+    root, visited = find_project_root(cwd)
+
+    # 탐색한 디렉토리의 mtime이 바뀌면 (루트 표시/매니페스트 추가·삭제) 다시 계산
+    watched = list(visited)
+    name = None
+    for manifest in MANIFESTS:
+        path = os.path.join(root, manifest)
+        if os.path.exists(path):
+            watched.append(path)
+            try:
+                name = read_manifest_name(path)
+            except Exception:
+                name = None
+            if name:
+                break
+
+    return {
+        'name': name or os.path.basename(root),
+        'root': root,
+        'stamps': {path: _mtime(path) for path in watched}
+    }
+
+
+def load_project_cache():
+    """cwd -> 프로젝트 캐시 로드"""
+    global _project_cache
+    if _project_cache is None:
+        _project_cache = {}
+        cache_path = os.path.expanduser(PROJECT_CACHE_PATH)
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    _project_cache = json.load(f)
+            except Exception:
+                _project_cache = {}
+    return _project_cache
+
+
+def save_project_cache(cache):
+    """캐시 저장 (오래된 항목부터 정리)"""
+    while len(cache) > PROJECT_CACHE_LIMIT:
+        del cache[next(iter(cache))]
+    atomic_write_text(os.path.expanduser(PROJECT_CACHE_PATH), json.dumps(cache, ensure_ascii=False))
 
 
-def get_log_path():
-    """로그 저장 경로 반환"""
-    config = get_config()
-    paths = config.get('paths', {})
-    return os.path.expanduser(paths.get('log', '~/.claude/daily-work'))
+def get_project_name(cwd):
+    """프로젝트 이름 추출 (루트의 매니페스트 또는 폴더명, mtime 검증 캐시 사용)"""
+    cache = load_project_cache()
+    entry = cache.get(cwd)
+    if entry and all(_mtime(path) == stamp for path, stamp in entry['stamps'].items()):
+        return entry['name']
+
+    entry = resolve_project(cwd)
+    cache.pop(cwd, None)
+    cache[cwd] = entry
+    try:
+        save_project_cache(cache)
+    except Exception:
+        pass
+    return entry['name']
 
 
-def get_project_name(cwd):
-    """프로젝트 이름 추출 (폴더명 또는 package.json/pubspec.yaml에서)"""
-    # pubspec.yaml 확인 (Flutter)
-    pubspec = os.path.join(cwd, 'pubspec.yaml')
-    if os.path.exists(pubspec):
-        try:
-            with open(pubspec, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.startswith('name:'):
-                        return line.split(':')[1].strip()
-        except:
-            pass
-
-    # package.json 확인 (Node.js)
-    pkg = os.path.join(cwd, 'package.json')
-    if os.path.exists(pkg):
-        try:
-            with open(pkg, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('name', os.path.basename(cwd))
-        except:
-            pass
-
-    # 폴더명 사용
-    return os.path.basename(cwd)
+def _mtime(path):
+    """mtime (ns), 없으면 None"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+# 긴 프롬프트는 앞/뒤에서 각각 이 글자 수까지만 살펴봄
+PROMPT_SCAN_BUDGET = 64 * 1024
+
+PROMPT_HEAD_LINES = 10
+PROMPT_TAIL_LINES = 5
+
+PYTHON_TRACEBACK = 'Traceback (most recent call last):'
+EXCEPTION_LINE = re.compile(r'^[A-Za-z_][\w.]*(Error|Exception|Warning|Exit|Interrupt)\b')
+
+
+def scan_lines_forward(text, start, budget, max_length):
+    """start부터 budget 글자 안에서 비어있지 않은 줄을 (줄, 끝 위치)로 반환
+
+    긴 줄은 max_length 근처까지만 잘라서 반환 (전체 줄을 복사하지 않음)
+    """
+    end = min(len(text), start + budget)
+    pos = start
+    while pos < end:
+        newline = text.find('\n', pos, end)
+        line_end = end if newline == -1 else newline
+        line = text[pos:min(line_end, pos + max_length * 2)].strip()
+        pos = line_end + 1
+        if line:
+            yield line, min(pos, len(text))
+
+
+def scan_lines_backward(text, stop, budget, max_length):
+    """끝에서부터 stop까지 budget 글자 안에서 비어있지 않은 줄을 원래 순서로 반환"""
+    start = max(stop, len(text) - budget)
+    lines = []
+    pos = len(text)
+    while pos > start:
+        newline = text.rfind('\n', start, pos)
+        line_start = start if newline == -1 else newline + 1
+        line = text[line_start:min(pos, line_start + max_length * 2)].strip()
+        pos = line_start - 1
+        if line:
+            lines.append(line)
+    lines.reverse()
+    return lines
+
+
+def collapse_bulk(entries, in_fence=False):
+    """(줄, 끝 위치)에서 코드 블록/스택 트레이스를 한 줄 표시로 접어서 반환
+
+    in_fence: 앞부분이 잘려 코드 블록 중간부터 시작하는 경우
+    """
+    fence = 0 if in_fence else None    # 코드 블록 안이면 줄 수
+    trace = None                       # Python 트레이스백 안이면 줄 수
+    at_run = []                        # 연속된 'at ...' 줄 (JVM/JS 스택)
+    last_end = 0
+
+    for line, end in entries:
+        last_end = end
+
+        if fence is not None:
+            if line.startswith('```'):
+                yield f'[코드 블록 {fence}줄]', end
+                fence = None
+            else:
+                fence += 1
+            continue
+
+        if trace is not None:
+            if not EXCEPTION_LINE.match(line):
+                trace += 1
+                continue
+            yield f'[스택 트레이스 {trace}줄]', end
+            trace = None
+
+        if line.startswith('at '):
+            at_run.append((line, end))
+            continue
+        if at_run:
+            yield from _flush_at_run(at_run)
+            at_run = []
+
+        if line.startswith('```'):
+            fence = 0
+        elif line == PYTHON_TRACEBACK:
+            trace = 1
+        else:
+            yield line, end
+
+    # 끝까지 닫히지 않은 블록
+    if fence is not None:
+        yield f'[코드 블록 {fence}줄]', last_end
+    elif trace is not None:
+        yield f'[스택 트레이스 {trace}줄]', last_end
+    elif at_run:
+        yield from _flush_at_run(at_run)
+
+
+def _flush_at_run(at_run):
+    """'at ...' 줄이 2줄 이상 이어지면 스택 트레이스로 접기"""
+    if len(at_run) == 1:
+        return at_run
+    return [(f'[스택 트레이스 {len(at_run)}줄]', at_run[-1][1])]
+
+
+def summarize_lines(prompt, max_length):
+    """앞 10줄 + 뒤 5줄(또는 전체)만 골라냄 - 앞/뒤 일부만 읽어 프롬프트 크기와 무관한 비용"""
+    keep = PROMPT_HEAD_LINES + PROMPT_TAIL_LINES
+    forward = collapse_bulk(scan_lines_forward(prompt, 0, PROMPT_SCAN_BUDGET, max_length))
+    head = list(islice(forward, keep + 1))
+
+    if len(head) <= keep and len(prompt) <= PROMPT_SCAN_BUDGET:
+        return [line for line, _ in head]
+
+    # 뒤 5줄은 앞 10줄이 끝난 위치 이후에서만 찾음
+    head = head[:PROMPT_HEAD_LINES]
+    head_end = head[-1][1] if head else 0
+    # 작은 범위부터 읽고, 접은 뒤 줄이 모자랄 때만 범위를 늘림
+    # (맨 앞 줄은 범위에 잘렸을 수 있으므로 한 줄 더 확보)
+    window = 4096
+    while True:
+        window = min(window, PROMPT_SCAN_BUDGET)
+        tail_lines = scan_lines_backward(prompt, head_end, window, max_length)
+        fences = sum(1 for line in tail_lines if line.startswith('```'))
+        tail = [line for line, _ in collapse_bulk([(line, 0) for line in tail_lines], in_fence=fences % 2 == 1)]
+        if len(tail) > PROMPT_TAIL_LINES or window >= PROMPT_SCAN_BUDGET or len(prompt) - window <= head_end:
+            break
+        window *= 2
+    tail = tail[-PROMPT_TAIL_LINES:]
+
+    return [line for line, _ in head] + ['...'] + tail
 
 
 def format_prompt(prompt, max_length=150):
     """프롬프트 포맷팅 (여러 줄은 들여쓰기 형태로, 15줄 초과시 앞 10줄 + 뒤 5줄)"""
-    lines = prompt.strip().split('\n')
-
-    # 빈 줄 제거하고 각 줄 trim
-    lines = [line.strip() for line in lines if line.strip()]
+    lines = summarize_lines(prompt, max_length)
 
     if not lines:
         return ''
 
-    # 15줄 초과 시 앞 10줄 + 뒤 5줄
-    if len(lines) > 15:
-        head = lines[:10]
-        tail = lines[-5:]
-        lines = head + ['...'] + tail
-
     # 첫 줄 처리
     first_line = lines[0]
     if len(first_line) > max_length:
@@ -94,94 +319,120 @@ def format_prompt(prompt, max_length=150):
     return '\n'.join(result)
 
 
-def main():
+def _spawn_outbox_drain():
+    """Notion 동기화 대기열이 남아 있으면 백그라운드로 drain 실행 (Hook은 기다리지 않음)"""
     try:
-        # stdin에서 Hook 데이터 읽기
-        input_data = json.load(sys.stdin)
+        import daily_outbox
+        daily_outbox.maybe_spawn_drain(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sync-notion.py'))
+    except Exception:
+        pass
 
-        prompt = input_data.get('prompt', '')
-        cwd = input_data.get('cwd', os.getcwd())
 
-        if not prompt.strip():
-            sys.exit(0)
+def _update_rollup(log_dir, today, record, config):
+    """일/주/달 집계에 기록 한 건 추가 (실패해도 저널에는 이미 남았으므로 무시, rollup-report.py --rebuild로 복구)"""
+    try:
+        import daily_rollup
+        # 집계를 만든 적이 없으면 분류기 컴파일/검사 없이 바로 끝냄
+        if not os.path.isdir(daily_rollup.get_rollup_dir(log_dir)):
+            return
+        from daily_classifier import classify, load_classifier
+        daily_rollup.record_prompt(log_dir, today, record, classify(record['prompt'], load_classifier(config)))
+    except Exception:
+        pass
+
+
+def handle_payload(input_data):
+    """Hook 데이터 한 건을 저널에 기록 (log-daemon.py, log-client.py에서도 사용)"""
+    prompt = input_data.get('prompt', '')
+    cwd = input_data.get('cwd', os.getcwd())
+
+    if not prompt.strip():
+        return
+
+    # 내부 명령어는 로그 제외
+    skip_prefixes = ['/daily-', '/pr-log', '/help', '/clear']
+    for prefix in skip_prefixes:
+        if prompt.strip().startswith(prefix):
+            return
+
+    # 단계별 소요 시간 (metrics.enabled일 때만 기록)
+    timings = {}
+    started = mark = time.perf_counter()
+    config = {}
 
-        # 내부 명령어는 로그 제외
-        skip_prefixes = ['/daily-', '/pr-log', '/help', '/clear']
-        for prefix in skip_prefixes:
-            if prompt.strip().startswith(prefix):
-                sys.exit(0)
+    try:
+        config = get_config()
+        timings['config'], mark = _elapsed_ms(mark)
 
         # 프로젝트 정보
         project_name = get_project_name(cwd)
+        timings['project'], mark = _elapsed_ms(mark)
 
-        # 날짜별 로그 파일 경로 (설정에서 읽기)
-        today = datetime.now().strftime('%Y-%m-%d')
-        log_dir = get_log_path()
-        log_file = os.path.join(log_dir, f'{today}.md')
+        # 날짜별 로그 경로 (설정에서 읽기)
+        now = datetime.now().astimezone()
+        today = now.strftime('%Y-%m-%d')
+        log_dir = get_log_dir(config)
 
-        os.makedirs(log_dir, exist_ok=True)
+        # 타임스탬프 (표시용 HH:MM과 활동 시간 계산용 밀리초 단위 ts)
+        timestamp = now.strftime('%H:%M')
 
-        # 타임스탬프
-        timestamp = datetime.now().strftime('%H:%M')
+        # 프롬프트 포맷팅
+        prompt_summary = format_prompt(prompt)
+        timings['format'], mark = _elapsed_ms(mark)
+
+        # 저널에 한 줄 추가 (프로젝트별 마크다운은 읽을 때 렌더링)
+        record = {
+            'time': timestamp,
+            'project': project_name,
+            'path': cwd,
+            'prompt': prompt_summary,
+            'ts': now.isoformat(timespec='milliseconds')
+        }
+        if input_data.get('session_id'):
+            record['session'] = input_data['session_id']
+        if config.get('storage', {}).get('backend') == 'sqlite':
+            import daily_db
+            daily_db.insert_record(log_dir, today, record)
+        else:
+            append_record(log_dir, today, record)
+        timings['write'], mark = _elapsed_ms(mark)
 
-        # 파일이 새로 만들어지는지 확인
-        is_new_file = not os.path.exists(log_file)
+        _update_rollup(log_dir, today, record, config)
+        timings['rollup'], mark = _elapsed_ms(mark)
 
-        # 해당 프로젝트 섹션이 있는지 확인
-        project_section_marker = f'## 🔹 {project_name}'
-        project_exists = False
-        file_content = ''
+    except Exception as e:
+        if daily_metrics.is_enabled(config):
+            timings['total'], _ = _elapsed_ms(started)
+            _record_metrics(timings, type(e).__name__, config)
+        raise
 
-        if not is_new_file:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                file_content = f.read()
-                project_exists = project_section_marker in file_content
+    if daily_metrics.is_enabled(config):
+        timings['total'], _ = _elapsed_ms(started)
+        _record_metrics(timings, None, config)
 
-        # 프롬프트 포맷팅
-        prompt_summary = format_prompt(prompt)
+    if config.get('notion', {}).get('enabled'):
+        _spawn_outbox_drain()
 
-        # 새 항목 작성
-        new_entry = f'- **[{timestamp}]** {prompt_summary}\n'
-
-        if is_new_file:
-            # 새 파일 생성
-            with open(log_file, 'w', encoding='utf-8') as f:
-                f.write(f'# 📅 {today} 작업 기록\n\n')
-                f.write(f'{project_section_marker}\n')
-                f.write(f'> `{cwd}`\n\n')
-                f.write(new_entry)
-        elif not project_exists:
-            # 새 프로젝트 섹션 추가
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(f'\n{project_section_marker}\n')
-                f.write(f'> `{cwd}`\n\n')
-                f.write(new_entry)
-        else:
-            # 기존 프로젝트 섹션에 항목 추가
-            # 해당 프로젝트 섹션의 끝을 찾아서 추가
-            lines = file_content.split('\n')
-            new_lines = []
-            in_target_section = False
-            added = False
-
-            for i, line in enumerate(lines):
-                new_lines.append(line)
-
-                if line.startswith(project_section_marker):
-                    in_target_section = True
-                elif in_target_section and line.startswith('## '):
-                    # 다음 섹션 시작 전에 추가
-                    new_lines.insert(-1, new_entry.rstrip())
-                    in_target_section = False
-                    added = True
-
-            # 마지막 섹션인 경우 끝에 추가
-            if in_target_section and not added:
-                new_lines.append(new_entry.rstrip())
-
-            with open(log_file, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(new_lines))
 
+def _elapsed_ms(mark):
+    """mark 이후 경과 시간(ms)과 새 기준 시각"""
+    now = time.perf_counter()
+    return round((now - mark) * 1000, 3), now
+
+
+def _record_metrics(timings, error, config):
+    """지표 기록 (지표 기록 실패가 Hook 실패가 되지 않도록 처리)"""
+    try:
+        daily_metrics.record_invocation(timings, error=error, config=config)
+    except Exception:
+        pass
+
+
+def main():
+    try:
+        # stdin에서 Hook 데이터 읽기 (텍스트 디코딩 단계 없이 바이트로 바로 파싱)
+        input_data = json.loads(sys.stdin.buffer.read())
+        handle_payload(input_data)
         sys.exit(0)
 
     except Exception as e:
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 집계(롤업)로 주간/월간 보고서 생성
+Hook이 갱신해 둔 {log_path}/rollups/YYYY-MM.json만 읽으므로 기록 기간과 관계없이 바로 출력
+
+사용법:
+    python3 rollup-report.py --week [--date 2026-01-07]   # 날짜가 속한 주(월~일)
+    python3 rollup-report.py --month [2026-01]            # 달 하나 (생략하면 이번 달)
+    python3 rollup-report.py --week --format json
+    python3 rollup-report.py --rebuild [--month 2026-01]  # 원본 로그로 집계 다시 계산
+"""
+import json
+import sys
+from datetime import datetime
+
+import daily_rollup
+from daily_classifier import load_classifier
+from daily_config import get_log_dir, load_config, normalize
+
+WEEKDAYS = ['월', '화', '수', '목', '금', '토', '일']
+
+
+def format_categories(categories):
+    """상위 카테고리 표시 (없으면 '기타')"""
+    return ', '.join(c['name'] for c in categories) or '기타'
+
+
+def format_stats(lines, total, period):
+    """기간 통계 줄 추가"""
+    lines.append(f"📊 {period} 통계")
+    lines.append(f"- 총 작업일: {total['active_days']}일")
+    lines.append(f"- 작업한 프로젝트: {len(total['projects'])}개")
+    lines.append(f"- 총 대화 횟수: {total['prompts']}회")
+    lines.append(f"- 활동 시간대: {total['active_hours']}시간")
+    if total['top_categories']:
+        lines.append("- 주요 작업: " + ', '.join(f"{c['name']} {c['count']}회" for c in total['top_categories']))
+
+
+def format_projects(lines, projects):
+    """프로젝트별 줄 추가"""
+    lines.append("## 🔹 프로젝트별")
+    for project in projects:
+        lines.append(
+            f"- **{project['name']}**: {project['prompts']}회 (활동 {project['active_hours']}시간) | "
+            f"주요 작업: {format_categories(project['top_categories'])}"
+        )
+    lines.append("")
+
+
+def generate_week_markdown(view):
+    """주간 보고서 Markdown"""
+    lines = [f"# 📅 주간 작업 요약 ({view['start']} ~ {view['end']})\n"]
+    for day in reversed(view['days']):
+        weekday = WEEKDAYS[datetime.strptime(day['date'], '%Y-%m-%d').weekday()]
+        lines.append(f"## {day['date']} ({weekday})")
+        for project in day['projects']:
+            lines.append(
+                f"- **{project['name']}**: {format_categories(project['top_categories'])} ({project['prompts']}회)"
+            )
+        lines.append("")
+
+    lines.append("---")
+    format_projects(lines, view['total']['projects'])
+    format_stats(lines, view['total'], '주간')
+    return '\n'.join(lines)
+
+
+def generate_month_markdown(view):
+    """월간 보고서 Markdown"""
+    lines = [f"# 🗓️ {view['month']} 월간 작업 요약\n", "## 주별"]
+    for week in view['weeks']:
+        lines.append(
+            f"- **{week['start'][5:]} ~ {week['end'][5:]}**: {week['prompts']}회, {week['active_days']}일, "
+            f"프로젝트 {len(week['projects'])}개 | 주요 작업: {format_categories(week['top_categories'])}"
+        )
+    lines.append("")
+
+    lines.append("---")
+    format_projects(lines, view['total']['projects'])
+    format_stats(lines, view['total'], '월간')
+    return '\n'.join(lines)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='집계로 주간/월간 보고서 생성')
+    period = parser.add_mutually_exclusive_group()
+    period.add_argument('--week', action='store_true', help='날짜가 속한 주(월~일) 보고서')
+    period.add_argument('--month', nargs='?', const='', metavar='YYYY-MM', help='월간 보고서 (생략하면 이번 달)')
+    parser.add_argument('--date', help='주간 보고서 기준 날짜 (YYYY-MM-DD, 기본: 오늘)')
+    parser.add_argument('--format', choices=['markdown', 'json'], default='markdown', help='출력 형식')
+    parser.add_argument('--rebuild', action='store_true', help='원본 로그로 집계 다시 계산 (--month로 한 달만)')
+    args = parser.parse_args()
+
+    config = load_config() or normalize({})
+    log_dir = get_log_dir(config)
+    backend = config['storage']['backend']
+    classifier = load_classifier(config)
+
+    try:
+        if args.rebuild:
+            months = {args.month} if args.month else None
+            result = daily_rollup.rebuild(log_dir, backend, classifier, months)
+            print(json.dumps({"success": True, "months": len(result), "days": sum(result.values())},
+                             indent=2, ensure_ascii=False))
+            return
+
+        # 처음 쓰는 경우(업데이트 직후 등) 지난 기록으로 한 번 만들고, 이후로는 Hook이 갱신
+        daily_rollup.ensure_rollups(log_dir, backend, classifier)
+    except TimeoutError as e:
+        print(json.dumps({"success": False, "error": str(e)}, ensure_ascii=False))
+        sys.exit(1)
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    try:
+        if args.month is not None:
+            month = args.month or today[:7]
+            datetime.strptime(month, '%Y-%m')
+            view = daily_rollup.month_view(log_dir, month)
+            empty = not view['total']['prompts']
+        else:
+            view = daily_rollup.week_view(log_dir, args.date or today)
+            empty = not view['days']
+    except ValueError:
+        print(json.dumps({"success": False, "error": "날짜 형식이 올바르지 않습니다. (YYYY-MM-DD / YYYY-MM)"}, ensure_ascii=False))
+        sys.exit(1)
+
+    if empty:
+        print(json.dumps({"success": False, "error": "해당 기간에 기록된 작업이 없습니다."}, ensure_ascii=False))
+        sys.exit(0)
+
+    if args.format == 'json':
+        print(json.dumps({"success": True, **view}, indent=2, ensure_ascii=False))
+    elif args.month is not None:
+        print(generate_month_markdown(view))
+    else:
+        print(generate_week_markdown(view))
+
+
+if __name__ == '__main__':
+    main()
@@ -8,10 +8,12 @@ import os
 import sys
 from pathlib import Path
 
-
-def get_config_path():
-    """설정 파일 경로 반환"""
-    return os.path.expanduser('~/.claude/daily-work-tracker/config.json')
+import daily_archive
+import daily_db
+import daily_metrics
+import daily_sync_state
+from daily_config import load_raw_config, normalize, save_config
+from daily_store import append_record, iter_day_records, list_log_dates
 
 
 def get_plugin_root():
@@ -19,23 +21,6 @@ def get_plugin_root():
     return os.environ.get('CLAUDE_PLUGIN_ROOT', os.path.dirname(os.path.dirname(__file__)))
 
 
-def load_config():
-    """설정 파일 로드"""
-    config_path = get_config_path()
-    if os.path.exists(config_path):
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return None
-
-
-def save_config(config):
-    """설정 파일 저장"""
-    config_path = get_config_path()
-    os.makedirs(os.path.dirname(config_path), exist_ok=True)
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
-
-
 def init_config():
     """설정 파일 초기화"""
     template_path = os.path.join(get_plugin_root(), 'config', 'config.template.json')
@@ -47,7 +32,8 @@ def init_config():
         config = {
             "storage": {
                 "log_path": "~/.claude/daily-work",
-                "summary_path": "~/.claude/daily-summaries"
+                "summary_path": "~/.claude/daily-summaries",
+                "backend": "files"
             },
             "notion_mcp": {
                 "enabled": False,
@@ -62,7 +48,14 @@ def init_config():
                 "include_projects": [],
                 "exclude_projects": []
             },
-            "sync_history": []
+            "metrics": {
+                "enabled": False,
+                "textfile": ""
+            },
+            "retention": {
+                "archive_after_days": 45,
+                "delete_after_days": 0
+            }
         }
 
     save_config(config)
@@ -70,34 +63,18 @@ def init_config():
 
 
 def get_log_path(config):
-    """로그 경로 반환 (storage.log_path 또는 paths.log 지원)"""
-    # 새 형식: storage.log_path
-    storage_config = config.get('storage', {})
-    if 'log_path' in storage_config:
-        return storage_config['log_path']
-    # 기존 형식: paths.log
-    paths_config = config.get('paths', {})
-    if 'log' in paths_config:
-        return paths_config['log']
-    return '~/.claude/daily-work'
+    """로그 경로 반환 (기존 paths.log도 storage.log_path로 변환해서 읽음)"""
+    return normalize(config)['storage']['log_path']
 
 
 def get_summary_path(config):
-    """요약 경로 반환 (storage.summary_path 또는 paths.summary 지원)"""
-    # 새 형식: storage.summary_path
-    storage_config = config.get('storage', {})
-    if 'summary_path' in storage_config:
-        return storage_config['summary_path']
-    # 기존 형식: paths.summary
-    paths_config = config.get('paths', {})
-    if 'summary' in paths_config:
-        return paths_config['summary']
-    return '~/.claude/daily-summaries'
+    """요약 경로 반환 (기존 paths.summary도 storage.summary_path로 변환해서 읽음)"""
+    return normalize(config)['storage']['summary_path']
 
 
 def check_setup_status():
     """설정 상태 확인"""
-    config = load_config()
+    config = load_raw_config()
 
     if config is None:
         return {
@@ -108,11 +85,15 @@ def check_setup_status():
         }
 
     # notion_mcp 또는 기존 notion 키 지원
-    notion_config = config.get('notion_mcp', config.get('notion', {}))
+    notion_config = normalize(config)['notion_mcp']
 
-    sync_history = config.get('sync_history', [])
+    if daily_db.is_enabled(config):
+        sync_history = daily_db.get_synced_dates(os.path.expanduser(get_log_path(config)))
+        synced = {"count": len(sync_history), "last": sync_history[-1] if sync_history else None}
+    else:
+        synced = daily_sync_state.summarize_state(daily_sync_state.load_state(config))
 
-    return {
+    status = {
         "configured": True,
         "log_path": get_log_path(config),
         "summary_path": get_summary_path(config),
@@ -120,15 +101,24 @@ def check_setup_status():
         "notion_page_id": notion_config.get('page_id', ''),
         "mcp_server_name": notion_config.get('mcp_server_name', 'notion'),
         "fallback_enabled": config.get('fallback', {}).get('save_local', True),
-        "synced_dates_count": len(sync_history),
-        "last_synced": sync_history[-1] if sync_history else None,
+        "storage_backend": config.get('storage', {}).get('backend', 'files'),
+        "synced_dates_count": synced['count'],
+        "last_synced": synced['last'],
+        "metrics_enabled": daily_metrics.is_enabled(config),
         "message": "설정 완료"
     }
 
+    # Hook 지연 시간/실패율 (metrics.enabled로 수집된 경우)
+    hook_metrics = daily_metrics.summarize_metrics()
+    if hook_metrics:
+        status["hook_metrics"] = hook_metrics
+
+    return status
+
 
 def update_notion_mcp_config(page_id=None, enabled=None, mcp_server_name=None):
     """Notion MCP 설정 업데이트"""
-    config = load_config() or init_config()
+    config = load_raw_config() or init_config()
 
     # notion_mcp 키 사용
     if 'notion_mcp' not in config:
@@ -151,46 +141,34 @@ def update_notion_mcp_config(page_id=None, enabled=None, mcp_server_name=None):
 
 def add_sync_history(date_str):
     """동기화 기록 추가"""
-    config = load_config() or init_config()
-
-    if 'sync_history' not in config:
-        config['sync_history'] = []
+    config = load_raw_config() or init_config()
 
-    if date_str not in config['sync_history']:
-        config['sync_history'].append(date_str)
-        config['sync_history'].sort()
+    if daily_db.is_enabled(config):
+        # SQLite 저장소는 동기화 상태도 DB에 기록
+        daily_db.mark_synced(os.path.expanduser(get_log_path(config)), date_str)
+        return config
 
-    save_config(config)
+    daily_sync_state.mark_synced(date_str, config)
     return config
 
 
 def get_unsynced_dates():
     """동기화되지 않은 날짜 목록 반환"""
-    config = load_config()
+    config = load_raw_config()
     if not config:
         return []
 
     log_path = os.path.expanduser(get_log_path(config))
-    sync_history = config.get('sync_history', [])
+    if daily_db.is_enabled(config):
+        return daily_db.get_unsynced_dates(log_path)
 
-    if not os.path.exists(log_path):
-        return []
-
-    # 로그 파일에서 날짜 추출
-    log_dates = []
-    for f in os.listdir(log_path):
-        if f.endswith('.md') and f != 'debug.log':
-            date_str = f.replace('.md', '')
-            if date_str not in sync_history:
-                log_dates.append(date_str)
-
-    log_dates.sort()
-    return log_dates
+    # 로그 파일(저널/마크다운)에서 날짜 추출
+    return daily_sync_state.unsynced_dates(list_log_dates(log_path), daily_sync_state.load_state(config))
 
 
 def update_fallback_config(save_local=None):
     """Fallback 설정 업데이트"""
-    config = load_config() or init_config()
+    config = load_raw_config() or init_config()
 
     if 'fallback' not in config:
         config['fallback'] = {"save_local": True}
@@ -202,9 +180,85 @@ def update_fallback_config(save_local=None):
     return config
 
 
+def update_metrics_config(enabled=None, textfile=None):
+    """Hook 지표 설정 업데이트"""
+    config = load_raw_config() or init_config()
+
+    if 'metrics' not in config:
+        config['metrics'] = {"enabled": False, "textfile": ""}
+
+    if enabled is not None:
+        config['metrics']['enabled'] = enabled
+    if textfile is not None:
+        config['metrics']['textfile'] = textfile
+
+    save_config(config)
+    return config
+
+
+def update_retention_config(archive_after_days=None, delete_after_days=None):
+    """로그 보관/삭제 기준 업데이트 (달이 끝난 뒤 지난 일수, 0이면 하지 않음)"""
+    config = load_raw_config() or init_config()
+
+    if 'retention' not in config:
+        config['retention'] = {
+            "archive_after_days": daily_archive.ARCHIVE_AFTER_DAYS,
+            "delete_after_days": daily_archive.DELETE_AFTER_DAYS
+        }
+
+    if archive_after_days is not None:
+        config['retention']['archive_after_days'] = archive_after_days
+    if delete_after_days is not None:
+        config['retention']['delete_after_days'] = delete_after_days
+
+    save_config(config)
+    return config
+
+
+def export_db_records(log_path):
+    """DB에만 있는 기록을 날짜별 저널로, 동기화 기록을 sync-state.json으로 내보냄. {날짜: 기록 수} 반환"""
+    exported = {}
+    for date_str in daily_db.list_dates(log_path):
+        records = daily_db.missing_records(daily_db.iter_records(log_path, date_str), iter_day_records(log_path, date_str))
+        for record in records:
+            record.pop('date', None)
+            append_record(log_path, date_str, record)
+            exported[date_str] = exported.get(date_str, 0) + 1
+    daily_sync_state.mark_synced_dates(daily_db.get_synced_dates(log_path))
+    return exported
+
+
+def update_storage_backend(backend):
+    """저장소 변경 (sqlite로 바꾸면 기존 저널/마크다운 기록과 동기화 기록을 DB로 가져오고,
+    files로 되돌리면 DB에만 있는 기록을 저널로 내보냄)"""
+    config = load_raw_config() or init_config()
+    config.setdefault('storage', {})
+    log_path = os.path.expanduser(get_log_path(config))
+
+    imported = {}
+    if backend == 'sqlite':
+        state = daily_sync_state.migrate_state(config)
+        sync_history = list(daily_sync_state.iter_synced_dates(state))
+        for date_str in list_log_dates(log_path):
+            count = daily_db.import_records(
+                log_path, date_str, iter_day_records(log_path, date_str),
+                synced=daily_sync_state.is_synced(state, date_str)
+            )
+            if count:
+                imported[date_str] = count
+        for date_str in sync_history:
+            daily_db.mark_synced(log_path, date_str)
+    elif os.path.exists(daily_db.get_db_path(log_path)):
+        imported = export_db_records(log_path)
+
+    config['storage']['backend'] = backend
+    save_config(config)
+    return config, imported
+
+
 def update_storage_config(log_path=None, summary_path=None):
     """저장 경로 설정 업데이트"""
-    config = load_config() or init_config()
+    config = load_raw_config() or init_config()
 
     if 'storage' not in config:
         config['storage'] = {
@@ -247,6 +301,19 @@ def main():
     parser.add_argument('--log-path', type=str, help='작업 로그 저장 경로 (기본: ~/.claude/daily-work)')
     parser.add_argument('--summary-path', type=str, help='요약 파일 저장 경로 (기본: ~/.claude/daily-summaries)')
 
+    # Hook 지표
+    parser.add_argument('--metrics-enable', action='store_true', help='Hook 지연 시간/에러 기록 활성화')
+    parser.add_argument('--metrics-disable', action='store_true', help='Hook 지연 시간/에러 기록 비활성화')
+    parser.add_argument('--metrics-textfile', type=str, help='Prometheus textfile 경로 (빈 문자열이면 해제)')
+    parser.add_argument('--metrics-export', action='store_true', help='Hook 지표를 Prometheus 형식으로 출력')
+
+    # 로그 보관
+    parser.add_argument('--archive-after', type=int, help='달이 끝나고 이 일수가 지나면 압축 보관 (0이면 안 함)')
+    parser.add_argument('--delete-after', type=int, help='달이 끝나고 이 일수가 지나면 삭제 (0이면 안 함)')
+
+    # 저장소
+    parser.add_argument('--backend', type=str, choices=['files', 'sqlite'], help='저장소 (files: 날짜별 저널, sqlite: DB)')
+
     args = parser.parse_args()
 
     if args.status:
@@ -273,7 +340,11 @@ def main():
 
     # 동기화 기록
     if args.add_sync:
-        config = add_sync_history(args.add_sync)
+        try:
+            config = add_sync_history(args.add_sync)
+        except TimeoutError as e:
+            print(json.dumps({"error": str(e)}, ensure_ascii=False))
+            sys.exit(1)
         print(f"동기화 기록 추가: {args.add_sync}")
         return
 
@@ -291,6 +362,39 @@ def main():
         print(json.dumps(config.get('fallback', {}), indent=2, ensure_ascii=False))
         return
 
+    # Hook 지표
+    if args.metrics_export:
+        print(daily_metrics.export_prometheus(), end='')
+        return
+
+    if args.metrics_enable or args.metrics_disable or args.metrics_textfile is not None:
+        config = update_metrics_config(
+            enabled=True if args.metrics_enable else (False if args.metrics_disable else None),
+            textfile=args.metrics_textfile
+        )
+        print("Hook 지표 설정이 업데이트되었습니다.")
+        print(json.dumps(config.get('metrics', {}), indent=2, ensure_ascii=False))
+        return
+
+    # 로그 보관
+    if args.archive_after is not None or args.delete_after is not None:
+        config = update_retention_config(args.archive_after, args.delete_after)
+        print("로그 보관 설정이 업데이트되었습니다.")
+        print(json.dumps(config.get('retention', {}), indent=2, ensure_ascii=False))
+        return
+
+    # 저장소
+    if args.backend:
+        config, imported = update_storage_backend(args.backend)
+        print("저장소가 변경되었습니다.")
+        print(json.dumps({
+            "backend": config['storage']['backend'],
+            # sqlite로 바꾸면 DB로 가져온 기록, files로 바꾸면 저널로 내보낸 기록
+            "imported_dates": len(imported),
+            "imported_prompts": sum(imported.values())
+        }, indent=2, ensure_ascii=False))
+        return
+
     # 저장 경로 설정
     if args.log_path or args.summary_path:
         config = update_storage_config(
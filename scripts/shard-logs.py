@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Daily Work Tracker - 로그 디렉토리를 연/월 구조로 변환
+{log_path}/YYYY-MM-DD.jsonl(.md)을 {log_path}/YYYY/MM/DD.jsonl(.md)로 옮기고
+달마다 manifest.json(날짜별 작업 수, 크기, 수정 시각)을 만든 뒤 layout.json을 남김
+이후 Hook과 읽는 쪽은 layout.json을 보고 연/월 구조를 사용
+
+사용법:
+    python3 shard-logs.py              # 그 자리에서 변환
+    python3 shard-logs.py --dry-run    # 옮길 파일 수만 확인
+    python3 shard-logs.py --rebuild    # 월별 manifest.json 다시 만들기 (파일을 직접 지웠을 때)
+"""
+import json
+import os
+import sys
+
+from daily_config import get_log_dir, load_config, normalize
+from daily_store import (LAYOUT_FILE, atomic_write_text, is_sharded, list_day_files, rebuild_manifest,
+                         sharded_day_path)
+
+
+def move_day_file(source, target):
+    """파일 하나를 연/월 위치로 이동 (이미 있으면 뒤에 이어 붙이고 원본 삭제)"""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if not os.path.exists(target):
+        # rename은 크기/수정 시각을 유지하므로 파싱 캐시도 그대로 사용됨
+        os.rename(source, target)
+        return
+
+    with open(source, 'rb') as src:
+        data = src.read()
+    with open(target, 'ab+') as dst:
+        # 기존 파일이 줄 중간에서 끝났으면 줄바꿈부터 넣어 기록이 섞이지 않게 함
+        if dst.seek(0, os.SEEK_END):
+            dst.seek(-1, os.SEEK_END)
+            if dst.read(1) != b'\n':
+                data = b'\n' + data
+        dst.write(data)
+    os.remove(source)
+
+
+def move_flat_files(log_dir):
+    """남아 있는 YYYY-MM-DD.* 파일을 모두 옮김. {달: 파일 수} 반환"""
+    moved = {}
+    for month, days in list_day_files(log_dir, sharded=False).items():
+        for date_str, files in days.items():
+            for ext, source in files.items():
+                move_day_file(source, sharded_day_path(log_dir, date_str, ext))
+                moved[month] = moved.get(month, 0) + 1
+    return moved
+
+
+def migrate(log_dir, dry_run=False):
+    """평면 구조를 연/월 구조로 변환"""
+    flat = list_day_files(log_dir, sharded=False)
+    result = {
+        "success": True,
+        "log_dir": log_dir,
+        "already_sharded": is_sharded(log_dir),
+        "months": len(flat),
+        "files": sum(len(files) for days in flat.values() for files in days.values()),
+        "dry_run": dry_run
+    }
+    if dry_run or not flat and result['already_sharded']:
+        return result
+
+    moved = move_flat_files(log_dir)
+    for month in moved:
+        rebuild_manifest(log_dir, month)
+
+    if not result['already_sharded']:
+        atomic_write_text(os.path.join(log_dir, LAYOUT_FILE), json.dumps({"layout": "sharded"}))
+        # 표시 파일을 쓰기 전에 Hook이 평면 구조로 추가한 파일까지 옮김
+        for month in move_flat_files(log_dir):
+            rebuild_manifest(log_dir, month)
+
+    return result
+
+
+def rebuild_all(log_dir):
+    """모든 달의 manifest.json 다시 만들기"""
+    if not is_sharded(log_dir):
+        return {"error": "연/월 구조가 아닙니다. 먼저 shard-logs.py로 변환하세요."}
+    months = {month: rebuild_manifest(log_dir, month) for month in sorted(list_day_files(log_dir, sharded=True))}
+    return {"success": True, "months": len(months), "days": sum(months.values())}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='로그 디렉토리를 연/월 구조로 변환')
+    parser.add_argument('--dry-run', action='store_true', help='옮길 파일 수만 출력')
+    parser.add_argument('--rebuild', action='store_true', help='월별 manifest.json 다시 만들기')
+    args = parser.parse_args()
+
+    config = load_config() or normalize({})
+    if config['storage']['backend'] == 'sqlite':
+        print(json.dumps({"error": "SQLite 저장소는 디렉토리 구조를 사용하지 않습니다."}, ensure_ascii=False))
+        sys.exit(1)
+
+    log_dir = get_log_dir(config)
+    try:
+        result = rebuild_all(log_dir) if args.rebuild else migrate(log_dir, dry_run=args.dry_run)
+    except TimeoutError as e:
+        result = {"error": str(e)}
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    if result.get('error'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,166 +7,291 @@ Daily Work Tracker - Notion 동기화 스크립트
     python3 sync-notion.py                    # 오늘 기록 동기화
     python3 sync-notion.py --date 2026-01-05  # 특정 날짜 동기화
     python3 sync-notion.py --dry-run          # 실제 전송 없이 테스트
+    python3 sync-notion.py --all-unsynced     # 동기화 안 된 모든 날짜 일괄 동기화
+    python3 sync-notion.py --from 2026-01-01 --to 2026-01-31 --workers 3
+    python3 sync-notion.py --drain            # 실패해서 대기열에 남은 날짜 다시 동기화
+
+처음 동기화한 뒤에는 날짜별 동기화 위치(프로젝트별 보낸 작업 수, 마지막 블록 ID)를
+~/.claude/daily-work-tracker/notion-sync/YYYY-MM-DD.json에 저장하고
+다시 실행하면 새 작업만 해당 프로젝트 아래에 추가 (바뀐 게 없으면 요청 없음)
 """
 import json
 import os
 import sys
-import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
-try:
-    import urllib.request
-    import urllib.error
-    HAS_URLLIB = True
-except ImportError:
-    HAS_URLLIB = False
+import daily_db
+import daily_outbox
+import daily_sync_state
+from daily_config import get_log_dir, load_config
+from daily_notion import API_BASE, BURST, LATENCY_LOG_PATH, MAX_RETRIES, RATE_PER_SEC, NotionClient, TokenBucket, append_blocks, plan_batches
+from daily_parser import load_day_projects
+from daily_store import atomic_write_text, list_log_dates
 
+SYNC_STATE_DIR = '~/.claude/daily-work-tracker/notion-sync'
 
-def get_config():
-    """설정 파일 로드"""
-    config_path = os.path.expanduser('~/.claude/daily-work-tracker/config.json')
-    if not os.path.exists(config_path):
-        return None
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+# 일괄 동기화 시 동시에 올리는 날짜 수 (요청 수는 토큰 버킷이 전체로 제한)
+BACKFILL_WORKERS = 3
 
+# 이 날짜 수 이상일 때만 프로세스 풀로 병렬 파싱
+PARALLEL_PARSE_MIN_DAYS = 14
 
-def get_daily_log(date_str=None):
-    """일일 로그 파일 읽기"""
-    if date_str is None:
-        date_str = datetime.now().strftime('%Y-%m-%d')
 
-    log_path = os.path.expanduser(f'~/.claude/daily-work/{date_str}.md')
+def text_block(block_type, content):
+    """텍스트 하나짜리 블록"""
+    return {
+        "object": "block",
+        "type": block_type,
+        block_type: {
+            "rich_text": [{
+                "type": "text",
+                "text": {"content": content}
+            }]
+        }
+    }
 
-    if not os.path.exists(log_path):
-        return None, date_str
 
-    with open(log_path, 'r', encoding='utf-8') as f:
-        return f.read(), date_str
+def task_block(task):
+    """작업 한 건 블록"""
+    return {
+        "object": "block",
+        "type": "bulleted_list_item",
+        "bulleted_list_item": {
+            "rich_text": [
+                {
+                    "type": "text",
+                    "text": {"content": f"[{task['time']}] "},
+                    "annotations": {"bold": True}
+                },
+                {
+                    "type": "text",
+                    "text": {"content": task['content']}
+                }
+            ]
+        }
+    }
 
 
-def parse_daily_log(content):
-    """마크다운 로그를 구조화된 데이터로 파싱"""
-    if not content:
-        return []
+def day_heading_block(date_str):
+    """날짜 제목 블록"""
+    return text_block("heading_2", f"📅 {date_str} 작업 기록")
 
-    projects = []
-    current_project = None
 
-    lines = content.split('\n')
+def project_header_blocks(project):
+    """프로젝트 제목 + 경로 블록"""
+    # 프로젝트 제목
+    blocks = [text_block("heading_3", f"🔹 {project['name']}")]
 
-    for line in lines:
-        # 프로젝트 섹션 시작
-        if line.startswith('## '):
-            project_match = re.match(r'## 🔹 (.+)', line)
-            if project_match:
-                if current_project:
-                    projects.append(current_project)
-                current_project = {
-                    'name': project_match.group(1),
-                    'path': '',
-                    'tasks': []
-                }
+    # 프로젝트 경로
+    if project['path']:
+        blocks.append(text_block("quote", project['path']))
 
-        # 프로젝트 경로
-        elif line.startswith('> `') and current_project:
-            path_match = re.match(r'> `(.+)`', line)
-            if path_match:
-                current_project['path'] = path_match.group(1)
+    return blocks
 
-        # 작업 항목
-        elif line.startswith('- **[') and current_project:
-            task_match = re.match(r'- \*\*\[(\d+:\d+)\]\*\* (.+)', line)
-            if task_match:
-                current_project['tasks'].append({
-                    'time': task_match.group(1),
-                    'content': task_match.group(2)
-                })
 
-    if current_project:
-        projects.append(current_project)
+def project_blocks(project):
+    """프로젝트 제목 + 경로 + 작업 목록 블록"""
+    blocks = project_header_blocks(project)
 
-    return projects
+    # 작업 목록
+    for task in project['tasks']:
+        blocks.append(task_block(task))
 
+    return blocks
 
-def format_for_notion(projects, date_str):
-    """Notion 블록 형식으로 변환"""
-    blocks = []
 
+def build_day_blocks(projects, date_str):
+    """하루치 블록과 프로젝트별 위치 [(이름, 시작 index, 제목 블록 수, 작업 수)]"""
     # 헤더
-    blocks.append({
-        "object": "block",
-        "type": "heading_2",
-        "heading_2": {
-            "rich_text": [{
-                "type": "text",
-                "text": {"content": f"📅 {date_str} 작업 기록"}
-            }]
-        }
-    })
+    blocks = [day_heading_block(date_str)]
+    sections = []
 
     for project in projects:
-        # 프로젝트 제목
-        blocks.append({
-            "object": "block",
-            "type": "heading_3",
-            "heading_3": {
-                "rich_text": [{
-                    "type": "text",
-                    "text": {"content": f"🔹 {project['name']}"}
-                }]
-            }
-        })
-
-        # 프로젝트 경로
-        if project['path']:
-            blocks.append({
-                "object": "block",
-                "type": "quote",
-                "quote": {
-                    "rich_text": [{
-                        "type": "text",
-                        "text": {"content": project['path']}
-                    }]
-                }
-            })
-
-        # 작업 목록
-        for task in project['tasks']:
-            blocks.append({
-                "object": "block",
-                "type": "bulleted_list_item",
-                "bulleted_list_item": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {"content": f"[{task['time']}] "},
-                            "annotations": {"bold": True}
-                        },
-                        {
-                            "type": "text",
-                            "text": {"content": task['content']}
-                        }
-                    ]
-                }
-            })
+        section = project_blocks(project)
+        sections.append((project['name'], len(blocks), len(section) - len(project['tasks']), len(project['tasks'])))
+        blocks.extend(section)
 
     # 구분선
-    blocks.append({
+    blocks.append(divider_block())
+
+    return blocks, sections
+
+
+def divider_block():
+    """하루치 끝 구분선 블록"""
+    return {
         "object": "block",
         "type": "divider",
         "divider": {}
-    })
-
-    return blocks
-
+    }
 
-def sync_to_notion(blocks, config, dry_run=False):
-    """Notion API로 블록 추가"""
-    if not HAS_URLLIB:
-        return {"error": "urllib not available"}
 
+def format_for_notion(projects, date_str):
+    """Notion 블록 형식으로 변환"""
+    return build_day_blocks(projects, date_str)[0]
+
+
+def get_sync_state_path(date_str):
+    """날짜별 동기화 상태 파일 경로"""
+    return os.path.join(os.path.expanduser(SYNC_STATE_DIR), f'{date_str}.json')
+
+
+def load_sync_state(date_str):
+    """날짜별 동기화 상태 (없으면 빈 상태)"""
+    path = get_sync_state_path(date_str)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
+
+
+def save_sync_state(date_str, state):
+    """날짜별 동기화 상태 저장"""
+    atomic_write_text(get_sync_state_path(date_str), json.dumps(state, ensure_ascii=False, indent=2))
+
+
+def record_sections(state, sections, block_ids, tail_index):
+    """전송된 블록 ID로 프로젝트별 동기화 위치 기록 (중간에 실패했으면 만들어진 부분까지만)
+    만들어지지 않은 제목/경로 블록 수는 pending_headers, 구분선은 pending_divider로 남겨서 다음 동기화 때 추가"""
+    created = len(block_ids)
+    for name, start, header_count, task_count in sections:
+        if start >= created:
+            break
+        section_created = min(created, start + header_count + task_count) - start
+        entry = {
+            "tasks": max(0, section_created - header_count),
+            "last_block_id": block_ids[start + section_created - 1]
+        }
+        if section_created < header_count:
+            entry['pending_headers'] = header_count - section_created
+        state['projects'][name] = entry
+    if created:
+        state['tail_id'] = block_ids[min(created, tail_index) - 1]
+        if created > tail_index:
+            state.pop('pending_divider', None)
+        else:
+            state['pending_divider'] = True
+
+
+def plan_delta(projects, state):
+    """마지막 동기화 이후 보낼 블록만 골라 [(프로젝트, 블록, 그중 제목/경로 블록 수)] 반환
+    새 프로젝트는 제목부터, 처음 동기화가 중간에 끊긴 프로젝트는 빠진 제목/경로 블록부터"""
+    pending = []
+    for project in projects:
+        synced = state['projects'].get(project['name'])
+        headers = project_header_blocks(project)
+        if synced:
+            new_tasks = project['tasks'][synced['tasks']:]
+            headers = headers[len(headers) - synced.get('pending_headers', 0):]
+        else:
+            new_tasks = project['tasks']
+        if new_tasks or headers:
+            pending.append((project, headers + [task_block(task) for task in new_tasks], len(headers)))
+    return pending
+
+
+def sync_day(client, page_id, date_str, projects, state, save=None):
+    """하루치 동기화. 처음이면 전체를, 이후에는 새 작업만 해당 프로젝트 아래에 추가
+    state는 요청마다 갱신하고 save(state)로 바로 저장 (중단돼도 이어서 동기화)"""
+    save = save or (lambda _: None)
+
+    if state.get('page_id') != page_id or not state.get('tail_id'):
+        # 처음 동기화: 하루 전체를 페이지 끝에 추가
+        blocks, sections = build_day_blocks(projects, date_str)
+        result = append_blocks(client, page_id, blocks)
+        created = result.pop('block_ids')
+        if created:
+            state.clear()
+            state.update({"page_id": page_id, "heading_id": created[0], "projects": {}})
+            record_sections(state, sections, created, len(blocks) - 1)
+            save(state)
+        return result
+
+    if not state['projects'] and state['tail_id'] == state.get('heading_id'):
+        # 제목만 먼저 만들어 둔 날 (일괄 동기화): 나머지 전체를 제목 바로 뒤에
+        blocks, sections = build_day_blocks(projects, date_str)
+        result = append_blocks(client, page_id, blocks[1:], after=state['heading_id'])
+        created = result.pop('block_ids')
+        if created:
+            record_sections(state, sections, [state['heading_id']] + created, len(blocks) - 1)
+            save(state)
+        return result
+
+    pending = plan_delta(projects, state)
+    if not pending and not state.get('pending_divider'):
+        return {"success": True, "unchanged": True, **client.stats()}
+
+    totals = {"batches": 0, "blocks_sent": 0}
+    result = {"success": True}
+    for project, blocks, header_count in pending:
+        synced = state['projects'].get(project['name'])
+        # 기존 프로젝트: 마지막으로 보낸 블록 뒤에 / 새 프로젝트: 그날 마지막 프로젝트 뒤 (구분선 앞)
+        anchor = synced['last_block_id'] if synced else state['tail_id']
+
+        result = append_blocks(client, page_id, blocks, after=anchor)
+        totals['batches'] += result['batches']
+        totals['blocks_sent'] += result['blocks_sent']
+        created = result.pop('block_ids')
+        if created:
+            entry = {
+                "tasks": (synced['tasks'] if synced else 0) + max(0, len(created) - header_count),
+                "last_block_id": created[-1]
+            }
+            if len(created) < header_count:
+                entry['pending_headers'] = header_count - len(created)
+            state['projects'][project['name']] = entry
+            if anchor == state['tail_id']:
+                state['tail_id'] = created[-1]
+            save(state)
+        if not result.get('success'):
+            return {**result, **totals}
+
+    if state.get('pending_divider'):
+        # 처음 동기화가 중간에 끊겨 빠진 구분선을 그날 마지막 프로젝트 뒤에
+        result = append_blocks(client, page_id, [divider_block()], after=state['tail_id'])
+        totals['batches'] += result['batches']
+        totals['blocks_sent'] += result['blocks_sent']
+        if result.pop('block_ids'):
+            state.pop('pending_divider')
+            save(state)
+
+    return {**result, **totals}
+
+
+def get_synced_dates(config):
+    """동기화 완료로 기록된 날짜 집합"""
+    if daily_db.is_enabled(config):
+        return set(daily_db.get_synced_dates(get_log_dir()))
+    return set(daily_sync_state.iter_synced_dates(daily_sync_state.load_state(config)))
+
+
+def mark_synced(config, date_str):
+    """동기화 완료 기록"""
+    if daily_db.is_enabled(config):
+        daily_db.mark_synced(get_log_dir(), date_str)
+        return
+    daily_sync_state.mark_synced(date_str, config)
+
+
+def make_client(config, api_key, bucket=None):
+    """설정의 API 주소/재시도 횟수로 클라이언트 생성"""
+    return NotionClient(
+        api_key,
+        config['notion'].get('api_base', API_BASE),
+        bucket=bucket,
+        max_retries=config['notion'].get('max_retries', MAX_RETRIES),
+        log_path=LATENCY_LOG_PATH
+    )
+
+
+def sync_to_notion(projects, date_str, config, dry_run=False):
+    """Notion API로 하루치 기록 동기화 (요청 제한에 맞게 나눠서, 이미 보낸 작업은 제외)"""
     api_key = os.environ.get(config['notion'].get('api_key_env', 'NOTION_API_KEY'))
     page_id = config['notion'].get('page_id', '')
 
@@ -176,35 +301,185 @@ def sync_to_notion(blocks, config, dry_run=False):
     if not page_id:
         return {"error": "Notion 페이지 ID가 설정되지 않았습니다"}
 
+    state = load_sync_state(date_str)
+
     if dry_run:
+        if state.get('page_id') == page_id and state.get('tail_id'):
+            blocks = [block for _, project_delta, _ in plan_delta(projects, state) for block in project_delta]
+            if state.get('pending_divider'):
+                blocks.append(divider_block())
+        else:
+            blocks = format_for_notion(projects, date_str)
         return {
             "success": True,
             "dry_run": True,
-            "blocks_count": len(blocks),
+            "pending_blocks": len(blocks),
+            "batches": len(plan_batches(blocks)),
             "message": "Dry run - 실제 전송하지 않음"
         }
 
-    # Notion API 호출
-    url = f"https://api.notion.com/v1/blocks/{page_id}/children"
-
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
+    client = make_client(config, api_key)
+    try:
+        result = sync_day(client, page_id, date_str, projects, state, save=lambda s: save_sync_state(date_str, s))
+    finally:
+        client.close()
+
+    if result.get('success'):
+        try:
+            mark_synced(config, date_str)
+        except TimeoutError as e:
+            # 올린 내용은 날짜별 동기화 위치에 남았으므로 다시 시도하면 요청 없이 완료 기록만 함
+            result = {"error": str(e), "blocks_sent": result.get('blocks_sent', 0)}
+    return result
+
+
+def resolve_backfill_dates(config, all_unsynced, start=None, end=None):
+    """일괄 동기화할 날짜 (기록이 있는 날짜 중 미동기화 또는 이 스크립트로 동기화 중인 날짜)"""
+    backend = config.get('storage', {}).get('backend', 'files')
+    synced = get_synced_dates(config)
+    dates = []
+    for date_str in list_log_dates(get_log_dir(), backend, start, end):
+        if date_str in synced:
+            # 다른 방법(MCP)으로 동기화된 날은 다시 올리면 중복되므로 제외
+            if all_unsynced or not os.path.exists(get_sync_state_path(date_str)):
+                continue
+        dates.append(date_str)
+    return dates
+
+
+def create_day_headings(client, page_id, dates):
+    """동기화 상태가 없는 날짜의 제목을 날짜순으로 한꺼번에 만들어 상태에 기록"""
+    states = {date_str: load_sync_state(date_str) for date_str in dates}
+    new_dates = [d for d in dates if states[d].get('page_id') != page_id or not states[d].get('tail_id')]
+    if not new_dates:
+        return states, {"success": True}
+
+    result = append_blocks(client, page_id, [day_heading_block(d) for d in new_dates])
+    for date_str, heading_id in zip(new_dates, result.pop('block_ids')):
+        states[date_str] = {"page_id": page_id, "heading_id": heading_id, "tail_id": heading_id, "projects": {}}
+        save_sync_state(date_str, states[date_str])
+    return states, result
+
+
+def backfill(dates, config, workers=BACKFILL_WORKERS):
+    """여러 날짜 일괄 동기화
+    제목을 먼저 날짜순으로 만들고(그동안 기록은 병렬 파싱) 파싱이 끝난 날부터
+    스레드 풀에서 각자 제목 뒤에 이어서 올림. 요청 수는 공유 토큰 버킷으로 제한"""
+    api_key = os.environ.get(config['notion'].get('api_key_env', 'NOTION_API_KEY'))
+    page_id = config['notion'].get('page_id', '')
+    if not api_key:
+        return {"error": "NOTION_API_KEY 환경변수가 설정되지 않았습니다"}
+    if not page_id:
+        return {"error": "Notion 페이지 ID가 설정되지 않았습니다"}
+    if not dates:
+        return {"success": True, "days": 0, "synced": [], "failed": {}}
+
+    backend = config.get('storage', {}).get('backend', 'files')
+    log_dir = get_log_dir()
+    bucket = TokenBucket(config['notion'].get('rate_per_sec', RATE_PER_SEC), BURST)
+    local = threading.local()
+    clients = []
+    clients_lock = threading.Lock()
+
+    def thread_client():
+        if not hasattr(local, 'client'):
+            local.client = make_client(config, api_key, bucket)
+            with clients_lock:
+                clients.append(local.client)
+        return local.client
+
+    def upload(date_str, projects, state):
+        result = sync_day(thread_client(), page_id, date_str, projects, state,
+                          save=lambda s: save_sync_state(date_str, s))
+        if result.get('success'):
+            mark_synced(config, date_str)
+        return result
+
+    parse_pool = ProcessPoolExecutor() if len(dates) >= PARALLEL_PARSE_MIN_DAYS else ThreadPoolExecutor(max_workers=1)
+    synced = []
+    failed = {}
+    try:
+        # 파싱을 먼저 걸어두고 그동안 제목 생성
+        parsing = {parse_pool.submit(load_day_projects, log_dir, d, backend): d for d in dates}
+        heading_client = make_client(config, api_key, bucket)
+        clients.append(heading_client)
+        states, heading_result = create_day_headings(heading_client, page_id, dates)
+        if not heading_result.get('success'):
+            return {"error": heading_result['error'], "days": len(dates), "synced": [], "failed": {}}
+
+        with ThreadPoolExecutor(max_workers=workers) as upload_pool:
+            uploads = {}
+            for future in as_completed(parsing):
+                date_str = parsing[future]
+                try:
+                    projects = future.result()
+                except Exception as e:
+                    # 읽을 수 없는 날짜 하나 때문에 나머지를 멈추지 않음 (올리기 실패처럼 대기열로)
+                    failed[date_str] = f'기록을 읽지 못했습니다: {e}'
+                    continue
+                uploads[upload_pool.submit(upload, date_str, projects, states[date_str])] = date_str
+            for future in as_completed(uploads):
+                date_str = uploads[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"error": str(e)}
+                if result.get('success'):
+                    synced.append(date_str)
+                else:
+                    failed[date_str] = result.get('error')
+    finally:
+        parse_pool.shutdown()
+        for client in clients:
+            client.close()
+
+    requests = sum(client.stats()['requests'] for client in clients)
+    retries = sum(client.stats()['retries'] for client in clients)
+    return {
+        "success": not failed,
+        "days": len(dates),
+        "synced": sorted(synced),
+        "failed": failed,
+        "requests": requests,
+        "retries": retries
     }
 
-    data = json.dumps({"children": blocks}).encode('utf-8')
 
+def queue_failure(config, date_str, error):
+    """실패한 날짜를 대기열에 남김 (--drain 또는 Hook이 띄운 drain에서 다시 시도)"""
     try:
-        request = urllib.request.Request(url, data=data, headers=headers, method='PATCH')
-        with urllib.request.urlopen(request) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return {"success": True, "result": result}
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode('utf-8')
-        return {"error": f"HTTP {e.code}: {error_body}"}
-    except Exception as e:
-        return {"error": str(e)}
+        daily_outbox.enqueue(date_str, config['notion'].get('page_id', ''), error)
+        return True
+    except OSError:
+        return False
+
+
+def drain_outbox(config, budget):
+    """대기열의 날짜를 시간 제한 안에서 다시 동기화"""
+    backend = config.get('storage', {}).get('backend', 'files')
+
+    def sync_entry(entry):
+        projects = load_day_projects(get_log_dir(), entry['date'], backend)
+        if not projects:
+            # 기록이 지워진 날은 보낼 것이 없음
+            return True, None
+        result = sync_to_notion(projects, entry['date'], config)
+        return bool(result.get('success')), result.get('error')
+
+    return daily_outbox.drain(sync_entry, budget)
+
+
+def sync_date(projects, date_str, config, dry_run=False):
+    """하루치 동기화 (이전에 보낸 작업 이후만, 성공하면 대기열에서 빼고 실패하면 대기열에 남김)
+    generate-summary.py --format sync도 이미 읽어 둔 projects로 호출"""
+    result = sync_to_notion(projects, date_str, config, dry_run=dry_run)
+    if dry_run:
+        return result
+    if result.get('success'):
+        daily_outbox.discard(date_str, config['notion'].get('page_id', ''))
+    else:
+        result['queued'] = queue_failure(config, date_str, result.get('error'))
+    return result
 
 
 def main():
@@ -215,10 +490,20 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='실제 전송 없이 테스트')
     parser.add_argument('--output', type=str, help='결과를 JSON 파일로 저장')
 
+    # 일괄 동기화
+    parser.add_argument('--all-unsynced', action='store_true', help='동기화 안 된 모든 날짜')
+    parser.add_argument('--from', dest='from_date', type=str, help='시작 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='to_date', type=str, help='종료 날짜 (YYYY-MM-DD, 기본: 오늘)')
+    parser.add_argument('--workers', type=int, default=BACKFILL_WORKERS, help='동시에 올리는 날짜 수')
+
+    # 대기열
+    parser.add_argument('--drain', action='store_true', help='대기열에 남은 날짜 다시 동기화')
+    parser.add_argument('--budget', type=float, default=daily_outbox.DRAIN_BUDGET_SEC, help='drain 시간 제한 (초)')
+
     args = parser.parse_args()
 
     # 설정 확인
-    config = get_config()
+    config = load_config()
     if not config:
         print(json.dumps({"error": "설정 파일이 없습니다. /daily-setup을 실행해주세요."}))
         sys.exit(1)
@@ -227,30 +512,44 @@ def main():
         print(json.dumps({"error": "Notion 연동이 비활성화되어 있습니다."}))
         sys.exit(1)
 
-    # 로그 읽기
-    content, date_str = get_daily_log(args.date)
-    if not content:
-        print(json.dumps({"error": f"{date_str} 날짜의 작업 기록이 없습니다."}))
-        sys.exit(1)
-
-    # 파싱
-    projects = parse_daily_log(content)
+    if args.drain:
+        output = drain_outbox(config, args.budget)
+        print(json.dumps(output, indent=2, ensure_ascii=False))
+        sys.exit(0 if output.get('success') else 1)
+
+    if args.all_unsynced or args.from_date or args.to_date:
+        start = args.from_date
+        end = args.to_date or (datetime.now().strftime('%Y-%m-%d') if start else None)
+        dates = resolve_backfill_dates(config, args.all_unsynced, start, end)
+        if args.dry_run:
+            output = {"success": True, "dry_run": True, "dates": dates, "days": len(dates)}
+        else:
+            output = backfill(dates, config, workers=args.workers)
+            # 실패한 날짜는 대기열로
+            failed = output.get('failed') or ({d: output['error'] for d in dates} if output.get('error') else {})
+            for date_str, error in failed.items():
+                queue_failure(config, date_str, error)
+            output['queued'] = len(failed)
+        print(json.dumps(output, indent=2, ensure_ascii=False))
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(output, f, indent=2, ensure_ascii=False)
+        sys.exit(0 if output.get('success') else 1)
+
+    # 로그 읽기 (파싱 결과 캐시 사용)
+    date_str = args.date or datetime.now().strftime('%Y-%m-%d')
+    log_dir = get_log_dir()
+    projects = load_day_projects(log_dir, date_str, config.get('storage', {}).get('backend', 'files'))
     if not projects:
-        print(json.dumps({"error": "파싱된 프로젝트가 없습니다."}))
+        print(json.dumps({"error": f"{date_str} 날짜의 작업 기록이 없습니다."}))
         sys.exit(1)
 
-    # Notion 블록 형식으로 변환
-    blocks = format_for_notion(projects, date_str)
-
-    # 동기화
-    result = sync_to_notion(blocks, config, dry_run=args.dry_run)
-
     # 결과 출력
     output = {
         "date": date_str,
         "projects_count": len(projects),
-        "blocks_count": len(blocks),
-        **result
+        "tasks_count": sum(len(p['tasks']) for p in projects),
+        **sync_date(projects, date_str, config, dry_run=args.dry_run)
     }
 
     print(json.dumps(output, indent=2, ensure_ascii=False))